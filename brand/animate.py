@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Animation Frames
+Layer-cached frame rendering and APNG / animated WebP encoding
+
+An animation is a static base scene, a moving scene rebuilt per frame and a
+static overlay scene on top. The base and overlay are rasterized once and
+the overlay is baked onto the base; each frame copies that, and only inside
+the box the moving shapes can reach restores the bare base, draws the
+moving shapes and composites the overlay again, so a frame costs a fraction
+of a full render.
+"""
+
+import os
+
+from PIL import features
+
+from scene import rasterize
+
+# extension -> (Pillow format, save options) for animated output
+ANIMATION_FORMATS = {
+    '.png': ('PNG', {'optimize': False}),
+    '.webp': ('WEBP', {'lossless': True, 'method': 4}),
+}
+
+def available_extensions():
+    """Animated output extensions this Pillow build can write."""
+    return ['.png'] + (['.webp'] if features.check('webp') else [])
+
+def _extent(scene, size):
+    """Box the scene's shapes can touch, padded by their stroke; the canvas when unknown."""
+    box = None
+    for shape in scene.items:
+        if shape.kind not in ('line', 'rectangle', 'rounded_rectangle', 'ellipse', 'polygon', 'arc'):
+            # Glows, halos and text reach past their coordinates
+            return (0, 0) + size
+        values = [v for point in shape.xy for v in (point if isinstance(point, (tuple, list)) else (point,))]
+        xs, ys, pad = values[0::2], values[1::2], shape.width + 1
+        shape_box = (min(xs) - pad, min(ys) - pad, max(xs) + pad + 1, max(ys) + pad + 1)
+        box = shape_box if box is None else (min(box[0], shape_box[0]), min(box[1], shape_box[1]),
+                                             max(box[2], shape_box[2]), max(box[3], shape_box[3]))
+    return box
+
+def _intersect(a, b):
+    box = (max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3]))
+    return box if box[0] < box[2] and box[1] < box[3] else None
+
+def layered_frames(base, moving, overlay, count):
+    """Yield count frames: cached base, moving(i) drawn on top, cached overlay.
+
+    base, overlay and every moving(i) are Scenes of the same size; frames are
+    RGB when the base is opaque.
+    """
+    under = rasterize(base)
+    if base.background is not None and (len(base.background) == 3 or base.background[3] == 255):
+        under = under.convert('RGB')
+    over = rasterize(overlay)
+    over_box = over.getbbox()
+    baked = under.copy()
+    if over_box:
+        baked.paste(over.crop(over_box), over_box[:2], over.crop(over_box))
+    # (bare base, overlay) crops per box; moving shapes usually keep to one box
+    crops = {}
+    for i in range(count):
+        scene = moving(i)
+        frame = baked.copy()
+        extent = _extent(scene, frame.size)
+        box = over_box and extent and _intersect(over_box, extent)
+        if box:
+            if box not in crops:
+                crops[box] = (under.crop(box), over.crop(box))
+            bare, patch = crops[box]
+            frame.paste(bare, box[:2])
+        rasterize(scene, into=frame)
+        if box:
+            frame.paste(patch, box[:2], patch)
+        yield frame
+
+def save_animation(frames, path, duration=40):
+    """Write frames as a looping animation; the format follows the extension."""
+    fmt, options = ANIMATION_FORMATS[os.path.splitext(path)[1]]
+    first, *rest = frames
+    first.save(path, fmt, save_all=True, append_images=rest, duration=duration, loop=0, **options)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Sprite Atlases
+Packs an icon family into one sprite sheet at 1x and 2x with CSS and JSON maps
+
+Icons are placed with a shelf packer (tallest first, left to right, a new
+shelf when the row is full) at 1x; the 2x sheet uses the same layout
+doubled, so one set of CSS coordinates serves both through image-set().
+"""
+
+import json
+import math
+import os
+
+from PIL import Image
+
+from encoders import save_image
+
+# Transparent gap around each sprite so downsampling or zoom never bleeds
+PADDING = 2
+
+def shelf_pack(sizes, max_width=None, padding=PADDING):
+    """Positions for (width, height) boxes packed into shelves.
+
+    Returns ([(x, y), ...] in input order, (sheet width, sheet height)).
+    max_width defaults to roughly square.
+    """
+    if not sizes:
+        return [], (0, 0)
+    padded = [(w + 2 * padding, h + 2 * padding) for w, h in sizes]
+    if max_width is None:
+        area = sum(w * h for w, h in padded)
+        max_width = max(max(w for w, _ in padded), math.ceil(math.sqrt(area)))
+    order = sorted(range(len(sizes)), key=lambda i: (-padded[i][1], -padded[i][0]))
+    positions = [None] * len(sizes)
+    x = y = shelf_height = width = 0
+    for i in order:
+        w, h = padded[i]
+        if x and x + w > max_width:
+            y += shelf_height
+            x = shelf_height = 0
+        positions[i] = (x + padding, y + padding)
+        x += w
+        width = max(width, x)
+        shelf_height = max(shelf_height, h)
+    return positions, (width, y + shelf_height)
+
+def compose(images, positions, size, scale=1):
+    """Sheet of the given 1x size with each image pasted at its scaled position."""
+    sheet = Image.new('RGBA', (size[0] * scale, size[1] * scale), (0, 0, 0, 0))
+    for img, (x, y) in zip(images, positions):
+        sheet.paste(img.convert('RGBA'), (x * scale, y * scale))
+    return sheet
+
+def atlas_css(family, sprites, size, image, image_2x):
+    """Stylesheet with a family class and one background-position class per sprite."""
+    width, height = size
+    lines = [
+        f"/* Generated by brand/atlas.py: {family} sprite sheet */",
+        f".{family} {{",
+        "  display: inline-block;",
+        "  background-repeat: no-repeat;",
+        f"  background-image: url({image});",
+        f"  background-image: image-set(url({image}) 1x, url({image_2x}) 2x);",
+        f"  background-size: {width}px {height}px;",
+        "}",
+    ]
+    for name, s in sprites.items():
+        lines.append(f".{family}-{name} {{ width: {s['w']}px; height: {s['h']}px; "
+                     f"background-position: {-s['x']}px {-s['y']}px; }}")
+    return '\n'.join(lines) + '\n'
+
+def atlas_outputs(output_dir, family):
+    """Files create_atlas writes for a family."""
+    return [os.path.join(output_dir, f'{family}{suffix}')
+            for suffix in ('.png', '@2x.png', '.css', '.json')]
+
+def create_atlas(output_dir, family, members):
+    """Pack members, {sprite name: (1x path, 2x path)}, into the family's sheets and maps."""
+    names = list(members)
+    images = [Image.open(members[n][0]) for n in names]
+    images_2x = [Image.open(members[n][1]) for n in names]
+    positions, size = shelf_pack([img.size for img in images])
+
+    png, png_2x, css, manifest = atlas_outputs(output_dir, family)
+    save_image(compose(images, positions, size), png)
+    save_image(compose(images_2x, positions, size, scale=2), png_2x)
+
+    sprites = {n: {'x': x, 'y': y, 'w': img.width, 'h': img.height}
+               for n, img, (x, y) in zip(names, images, positions)}
+    image, image_2x = os.path.basename(png), os.path.basename(png_2x)
+    with open(css, 'w') as f:
+        f.write(atlas_css(family, sprites, size, image, image_2x))
+    with open(manifest, 'w') as f:
+        json.dump({'image': image, 'image_2x': image_2x, 'width': size[0], 'height': size[1],
+                   'sprites': sprites}, f, indent=2)
+        f.write('\n')
+
+    print(f"Created {family} atlas: {len(names)} sprites, {size[0]}x{size[1]}")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Brand Benchmarks
+Compares optimized rendering primitives against the loops they replaced
+"""
+
+import time
+from PIL import Image, ImageDraw
+
+import glyphs
+import halo
+import layout
+import shaping
+from fonts import get_font
+from generate_marketing import twitter_scene
+from glow import add_glow_text
+from halo import draw_halo
+from scene import rasterize
+from tiles import grid
+
+CYAN = (0, 255, 255)
+
+# Localized (title, subtitle) pairs for the Twitter card, one per script family
+LOCALE_SAMPLES = {
+    'en': ("Privacy-as-Code", "MCP Server for AI workflows"),
+    'de': ("Datenschutz als Code", "MCP-Server für KI-Workflows"),
+    'fr': ("La confidentialité en code", "Serveur MCP pour les flux IA"),
+    'ru': ("Приватность как код", "MCP-сервер для ИИ-процессов"),
+    'ar': ("الخصوصية كرمز", "خادم MCP لسير عمل الذكاء الاصطناعي"),
+    'he': ("פרטיות כקוד", "שרת MCP לתהליכי בינה מלאכותית"),
+    'hi': ("कोड के रूप में गोपनीयता", "AI वर्कफ़्लो के लिए MCP सर्वर"),
+    'th': ("ความเป็นส่วนตัวในรูปแบบโค้ด", "เซิร์ฟเวอร์ MCP สำหรับเวิร์กโฟลว์ AI"),
+    'ja': ("コードとしてのプライバシー", "AIワークフロー向けMCPサーバー"),
+    'zh': ("隐私即代码", "面向 AI 工作流的 MCP 服务器"),
+    'ko': ("코드로서의 프라이버시", "AI 워크플로를 위한 MCP 서버"),
+}
+
+def legacy_glow_text(img, text, pos, font, color, glow_color=None):
+    """Previous add_glow_text: one draw.text call per (dx, dy) offset."""
+    draw = ImageDraw.Draw(img)
+    if glow_color is None:
+        glow_color = color
+    x, y = pos
+    for offset in range(5, 0, -1):
+        alpha = int(40 - offset * 6)
+        for dx in range(-offset, offset + 1):
+            for dy in range(-offset, offset + 1):
+                draw.text((x + dx, y + dy), text, font=font, fill=(*glow_color, alpha))
+    draw.text((x, y), text, font=font, fill=color)
+
+def legacy_grid(width, height):
+    """Previous create_gradient_bg: one draw.line per grid line."""
+    img = Image.new('RGB', (width, height), (10, 10, 15))
+    draw = ImageDraw.Draw(img)
+    for x in range(0, width, 40):
+        draw.line([(x, 0), (x, height)], fill=(30, 30, 46), width=1)
+    for y in range(0, height, 40):
+        draw.line([(0, y), (width, y)], fill=(30, 30, 46), width=1)
+    return img
+
+def legacy_halo(img, center, radius, color):
+    """Previous logo glow: five stacked ellipse fills with rising alpha."""
+    draw = ImageDraw.Draw(img)
+    for i in range(5, 0, -1):
+        r = radius + i * 8
+        draw.ellipse([center - r, center - r, center + r, center + r], fill=(*color, int(50 - i * 8)))
+
+def time_call(func, repeat):
+    """Best-of-N wall time in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def bench_glow(repeat=5):
+    """Time both glow implementations on the banner and square canvases.
+
+    The blur engine is timed cold (glyph-run cache cleared, so every call
+    rasterizes and blurs) and warm (the glow served from the cache).
+    """
+    cases = [
+        ('web-banner 1920x400', (1920, 400), (100, 120), 64),
+        ('instagram 1080x1080', (1080, 1080), (260, 720), 72),
+    ]
+    results = []
+    for label, size, pos, font_size in cases:
+        font = get_font(font_size)
+        base = Image.new('RGB', size, (10, 10, 15))
+
+        def legacy():
+            legacy_glow_text(base.copy(), 'Privacy-as-Code', pos, font, CYAN)
+
+        def blurred():
+            glyphs.clear()
+            add_glow_text(base.copy(), 'Privacy-as-Code', pos, font, CYAN)
+
+        def cached():
+            add_glow_text(base.copy(), 'Privacy-as-Code', pos, font, CYAN)
+
+        old_ms = time_call(legacy, repeat)
+        cold_ms = time_call(blurred, repeat)
+        warm_ms = time_call(cached, repeat)
+        results.append((label, old_ms, cold_ms, warm_ms))
+    return results
+
+def bench_background(repeat=20):
+    """Time line-by-line grid stroking against the cached tile."""
+    results = []
+    for size in [(400, 500), (1200, 627), (1920, 400), (1080, 1080)]:
+        old_ms = time_call(lambda: legacy_grid(*size), repeat)
+        new_ms = time_call(lambda: grid(*size, 40, (30, 30, 46), (10, 10, 15)), repeat)
+        results.append((f'grid {size[0]}x{size[1]}', old_ms, new_ms))
+    return results
+
+def bench_halo(repeat=10):
+    """Time stacked ellipse fills against one distance-field pass on 4x canvases.
+
+    The field is timed cold (mask cache cleared, so every call evaluates and
+    resamples it) and warm (the mask shared by every theme is cached). Cold
+    is slower than the legacy fills: upsampling the falloff to 4x costs more
+    than drawing the fills, and only the cached mask is faster.
+    """
+    results = []
+    for label, size, radius in [('logo 512 @4x', 512, 236), ('icon 200 @4x', 200, 85)]:
+        center = size // 2
+
+        def legacy():
+            legacy_halo(Image.new('RGBA', (size * 4, size * 4)), center * 4, radius * 4, CYAN)
+
+        def cached():
+            draw_halo(Image.new('RGBA', (size * 4, size * 4)), 'circle',
+                      {'center': (center, center), 'radius': radius}, CYAN,
+                      spread=size // 2 - radius, strength=0.3, scale=4)
+
+        def field():
+            halo.clear()
+            cached()
+
+        results.append((label, time_call(legacy, repeat), time_call(field, repeat), time_call(cached, repeat)))
+    return results
+
+def bench_locales(repeat=3):
+    """Twitter cards per second per locale, each render starting without cached runs.
+
+    Returns (locale, ms per card, faces used, characters no face covers).
+    """
+    results = []
+    for locale, (title, subtitle) in LOCALE_SAMPLES.items():
+        def card():
+            glyphs.clear()
+            shaping.clear()
+            layout.text_length.cache_clear()
+            rasterize(twitter_scene(title, subtitle))
+
+        font = get_font(36)
+        faces = shaping.faces(font, title + subtitle)
+        missing = shaping.missing(font, title + subtitle)
+        results.append((locale, time_call(card, repeat), faces, missing))
+    return results
+
+def main():
+    print("Glow text benchmark (best of 5)")
+    print("=" * 50)
+    for label, old_ms, cold_ms, warm_ms in bench_glow():
+        print(f"{label:<22} legacy {old_ms:8.1f} ms   blur {cold_ms:7.1f} ms   {old_ms / cold_ms:5.1f}x"
+              f"   cached {warm_ms:6.2f} ms")
+    print()
+    print("Background grid benchmark (best of 20)")
+    print("=" * 50)
+    for label, old_ms, new_ms in bench_background():
+        print(f"{label:<22} legacy {old_ms:8.2f} ms   tile {new_ms:7.2f} ms   {old_ms / new_ms:5.1f}x")
+    print()
+    print("Halo benchmark (best of 10)")
+    print("=" * 50)
+    for label, old_ms, cold_ms, warm_ms in bench_halo():
+        print(f"{label:<22} legacy {old_ms:8.2f} ms   cold {cold_ms:6.2f} ms   {cold_ms / old_ms:4.1f}x slower"
+              f"   cached {warm_ms:6.2f} ms   {old_ms / warm_ms:4.1f}x faster")
+    print()
+    print(f"Localized card benchmark (best of 3, {'raqm' if shaping.RAQM else 'basic'} layout)")
+    print("=" * 50)
+    for locale, ms, faces, missing in bench_locales():
+        note = f"   {len(missing)} uncovered" if missing else ""
+        print(f"{locale:<4} {1000 / ms:6.1f} cards/s {ms:7.1f} ms   {', '.join(faces)}{note}")
+
+if __name__ == '__main__':
+    main()
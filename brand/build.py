@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Brand Build
+Runs every brand and marketing renderer as a task graph on a process pool
+"""
+
+import argparse
+import json
+import importlib
+import os
+import sys
+import time
+
+import buildcache
+import demand
+import encoders
+import fonts
+import manifest
+import watch
+from taskgraph import run, summarize
+from theme import DEFAULT_THEME, PALETTES
+
+BRAND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TARGETS = {
+    'assets': ('generate_assets', os.path.join(BRAND_DIR, 'assets')),
+    'marketing': ('generate_marketing', os.path.join(BRAND_DIR, 'marketing')),
+}
+
+def collect_tasks(targets, output_root=None, themes=None):
+    """Gather the task lists of the requested targets, prefixed by target name.
+
+    output_root redirects every target into output_root/<target>. themes
+    adds a copy of every task per extra theme, named <task>@<theme> and
+    writing into <target dir>/themes/<theme>; the default theme keeps the
+    plain names and directories.
+    """
+    tasks = []
+    for target in targets:
+        module_name, output_dir = TARGETS[target]
+        if output_root is not None:
+            output_dir = os.path.join(output_root, target)
+        module = importlib.import_module(module_name)
+        for theme in themes or [DEFAULT_THEME]:
+            suffix, theme_dir, kwargs = '', output_dir, {}
+            if theme != DEFAULT_THEME:
+                suffix, kwargs = f'@{theme}', {'theme': theme}
+                theme_dir = os.path.join(output_dir, 'themes', theme)
+            os.makedirs(theme_dir, exist_ok=True)
+            for t in module.build_tasks(theme_dir):
+                # Only @themed renderers take a theme; the rest (atlases) read themed files
+                tasks.append(t._replace(
+                    name=f'{target}:{t.name}{suffix}',
+                    deps=tuple(f'{target}:{d}{suffix}' for d in t.deps),
+                    kwargs={**t.kwargs, **kwargs} if getattr(t.func, 'themed', False) else t.kwargs,
+                ))
+    return tasks
+
+SIZE_REPORT_PATH = os.path.join(BRAND_DIR, '.size-report.json')
+
+def init_worker(formats, widths):
+    """Per-process setup: warm the font cache and configure the encoder stage."""
+    fonts.warm()
+    encoders.configure(formats, widths)
+
+def write_size_report(tasks, entries, path):
+    """Collect every task's encoded variants into one JSON report and print totals.
+
+    PNG entries carry the size of Pillow's optimized save as baseline_bytes;
+    their per-file savings are printed too.
+    """
+    files = [e for t in tasks for e in entries.get(t.name, {}).get('encoded', [])]
+    totals = {}
+    for e in files:
+        totals[e['format']] = totals.get(e['format'], 0) + e['bytes']
+    pngs = [e for e in files if 'baseline_bytes' in e]
+    if pngs:
+        totals['png_baseline'] = sum(e['baseline_bytes'] for e in pngs)
+    with open(path, 'w') as f:
+        json.dump({'totals': totals, 'files': files}, f, indent=2)
+        f.write('\n')
+
+    for e in sorted(pngs, key=lambda e: e['bytes'] - e['baseline_bytes']):
+        print(f"  {os.path.basename(e['path']):<34} {e['baseline_bytes']:8} -> {e['bytes']:8} B "
+              f"({e['baseline_bytes'] / e['bytes']:.1f}x)  {e['method']}")
+    print("Encoded bytes: " + ", ".join(f"{name} {size / 1024:.0f} KiB" for name, size in totals.items()))
+
+def _csv(value):
+    return [item for item in value.split(',') if item]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build Anonymize.dev brand and marketing assets.")
+    parser.add_argument('targets', nargs='*', metavar='target',
+                        help=f"one of {', '.join(sorted(TARGETS))} (default: all)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count, 1 runs inline)")
+    parser.add_argument('-f', '--force', action='store_true',
+                        help="re-render everything, ignoring the build manifest")
+    parser.add_argument('--formats', type=_csv, default=None,
+                        help=f"comma-separated encoder formats from {', '.join(encoders.available_formats())}"
+                             " (default: plain PNG)")
+    parser.add_argument('--widths', type=lambda v: [int(w) for w in _csv(v)], default=[],
+                        help="comma-separated responsive widths to derive, e.g. 600,1200")
+    parser.add_argument('--size-report', default=SIZE_REPORT_PATH,
+                        help="where to write the encoder size report")
+    parser.add_argument('-v', '--verbose', action='store_true', help="show renderer output")
+    parser.add_argument('--list', action='store_true', help="list tasks and exit")
+    parser.add_argument('--themes', type=_csv, default=None,
+                        help=f"comma-separated themes to render in one run, from {', '.join(PALETTES)}"
+                             f" (default: {DEFAULT_THEME})")
+    parser.add_argument('--demand', action='store_true',
+                        help="only run renderers whose outputs the site references (and their deps)")
+    parser.add_argument('--prune', action='store_true',
+                        help="with --demand, delete images/ files no site page references")
+    parser.add_argument('--watch', action='store_true',
+                        help="stay running: re-render affected tasks on source edits, with a live preview")
+    parser.add_argument('--port', type=int, default=8089, help="preview port for --watch (default 8089)")
+    parser.add_argument('--cache', default=buildcache.DEFAULT_DIR,
+                        help=f"content-addressed output cache (default $BRAND_CACHE_DIR or {buildcache.DEFAULT_DIR})")
+    parser.add_argument('--shared-cache', default=buildcache.SHARED_DIR,
+                        help="read-only second cache tier, e.g. one CI fills (default $BRAND_CACHE_SHARED)")
+    parser.add_argument('--cache-max-mib', type=int, default=buildcache.DEFAULT_MAX_BYTES >> 20,
+                        help=f"evict least recently used entries past this size (default {buildcache.DEFAULT_MAX_BYTES >> 20})")
+    parser.add_argument('--no-cache', action='store_true', help="neither read nor fill the output cache")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.targets) - set(TARGETS))
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)}")
+
+    if args.watch and args.demand:
+        parser.error("--watch re-renders the chosen targets; drop --demand")
+    if args.prune and not args.demand:
+        parser.error("--prune needs --demand")
+    if args.demand and args.themes:
+        parser.error("--demand builds the site's own theme; drop --themes")
+    unknown = sorted(set(args.themes or ()) - set(PALETTES))
+    if unknown:
+        parser.error(f"unknown theme(s): {', '.join(unknown)}")
+
+    tasks = collect_tasks(args.targets or sorted(TARGETS), themes=args.themes)
+    if args.demand:
+        refs = demand.referenced_assets()
+        tasks = demand.report(tasks, refs)
+        if args.prune:
+            removed = demand.prune(refs)
+            print(f"Pruned {len(removed)} orphaned image(s) from images/")
+        print()
+    if args.list:
+        for t in tasks:
+            deps = f"  (after {', '.join(t.deps)})" if t.deps else ''
+            print(f"{t.name}{deps}")
+        return 0
+
+    if args.widths and not args.formats:
+        parser.error("--widths needs --formats")
+    if args.watch:
+        return watch.watch(args.targets or sorted(TARGETS), args.themes, args.formats, args.widths,
+                           port=args.port, verbose=args.verbose)
+    encoders.configure(args.formats, args.widths)
+    entries = manifest.load()
+    context = {'encoders': encoders.config()}
+    digests = {t.name: manifest.fingerprint(t, context) for t in tasks}
+    todo = tasks if args.force else manifest.stale_tasks(tasks, entries, digests)
+    cache = None if args.no_cache else buildcache.BuildCache(args.cache, args.shared_cache,
+                                                             args.cache_max_mib << 20)
+    keys = buildcache.task_keys(tasks, digests) if cache else {}
+    restored = set()
+    if cache and not args.force:
+        for t in todo:
+            encoded = cache.restore(keys[t.name])
+            if encoded is not None:
+                manifest.record(t, entries, digests[t.name], encoded)
+                restored.add(t.name)
+        todo = [t for t in todo if t.name not in restored]
+    up_to_date = {t.name for t in tasks} - {t.name for t in todo}
+
+    print(f"Building {len(todo)} of {len(tasks)} tasks with {args.jobs} job(s) "
+          f"({len(up_to_date) - len(restored)} up to date, {len(restored)} from cache)...")
+    print("=" * 50)
+    start = time.perf_counter()
+    results = run(todo, args.jobs, args.verbose, satisfied=up_to_date,
+                  initializer=init_worker, initargs=(args.formats, args.widths),
+                  after=encoders.flush)
+
+    by_name = {t.name: t for t in tasks}
+    for r in results:
+        if r.error:
+            entries.pop(r.name, None)
+        else:
+            manifest.record(by_name[r.name], entries, digests[r.name], r.extra or ())
+            if cache:
+                cache.store(keys[r.name], entries[r.name])
+    manifest.save(entries)
+    if cache:
+        cache.evict()
+        print(cache.summary())
+    if args.formats:
+        write_size_report(tasks, entries, args.size_report)
+
+    if results:
+        summarize(results, time.perf_counter() - start, args.jobs)
+    else:
+        print("Everything up to date.")
+    return 1 if any(r.error for r in results) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Shared Build Cache
+Rendered outputs stored under the hash of everything that produced them
+
+The build manifest only remembers what this checkout last rendered. The
+cache remembers what any checkout rendered: each task's key is its
+manifest fingerprint (renderer code, constants, helper module digests,
+palette, font file digests, library versions, arguments, encoder settings)
+plus its output names and the keys of the tasks it depends on, since
+those read files their dependencies wrote. Before rendering, a stale
+task whose key is cached has its files copied into place instead.
+
+Entries live in <cache>/<key[:2]>/<key>/, written to a temporary directory
+and renamed into place, so developers and CI jobs can share one directory.
+The local tier is capped by size and evicts least recently used entries.
+An optional shared tier (a network share, a CI artifact directory) is only
+read; its hits are copied into the local tier.
+
+    python build.py --shared-cache /mnt/brand-cache          # developers
+    python build.py --cache /mnt/brand-cache --cache-max-mib 4096   # the CI job that fills it
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import manifest
+
+DEFAULT_DIR = os.environ.get('BRAND_CACHE_DIR') or os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'anonymize-brand')
+# Read-only second tier, e.g. a share CI populates
+SHARED_DIR = os.environ.get('BRAND_CACHE_SHARED') or None
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump when the entry layout changes
+CACHE_VERSION = 1
+
+ENTRY_FILE = 'entry.json'
+
+# Entries are filled in directories named .<key prefix>-<random> next to
+# their final place; younger ones may belong to a build still writing them
+TEMP_PREFIX = '.'
+TEMP_GRACE_SECONDS = 3600
+
+def task_keys(tasks, digests):
+    """{task name: cache key}, each folding in the keys of the task's deps."""
+    by_name = {t.name: t for t in tasks}
+    keys = {}
+
+    def key(name):
+        if name not in keys:
+            t = by_name[name]
+            payload = {
+                'version': CACHE_VERSION,
+                'fingerprint': digests[name],
+                'outputs': [os.path.relpath(p, manifest.BRAND_DIR) for p in t.outputs],
+                'deps': [key(d) for d in t.deps if d in by_name],
+            }
+            keys[name] = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        return keys[name]
+
+    for t in tasks:
+        key(t.name)
+    return keys
+
+def _copy_into_place(src, dst):
+    """Copy src to dst through a temporary file so readers never see half a file."""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f'{dst}.{os.getpid()}.tmp'
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+def _tree_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(path) for name in files)
+
+class BuildCache:
+    """Read-write local tier plus an optional read-only shared tier."""
+
+    def __init__(self, path=DEFAULT_DIR, shared=SHARED_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.shared = shared
+        self.max_bytes = max_bytes
+        self.hits = {'local': 0, 'shared': 0}
+        self.misses = self.stored = 0
+
+    def _entry_dir(self, root, key):
+        return os.path.join(root, key[:2], key)
+
+    def _read_entry(self, root, key):
+        try:
+            with open(os.path.join(self._entry_dir(root, key), ENTRY_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def lookup(self, key):
+        """(tier, entry directory, entry) for key, or None. Shared hits are copied locally."""
+        entry = self._read_entry(self.path, key)
+        if entry is not None:
+            entry_dir = self._entry_dir(self.path, key)
+            # mtime is the LRU clock
+            os.utime(os.path.join(entry_dir, ENTRY_FILE))
+            return 'local', entry_dir, entry
+        if self.shared:
+            entry = self._read_entry(self.shared, key)
+            if entry is not None:
+                entry_dir = self._entry_dir(self.shared, key)
+
+                def fill(tmp):
+                    shutil.copytree(entry_dir, tmp, dirs_exist_ok=True)
+                    os.utime(os.path.join(tmp, ENTRY_FILE))
+
+                try:
+                    self._publish(key, fill)
+                except OSError:
+                    pass
+                return 'shared', entry_dir, entry
+        return None
+
+    def restore(self, key):
+        """Copy a cached task's files into place; returns its encoded entries or None on a miss.
+
+        Only a complete copy counts as a hit.
+        """
+        found = self.lookup(key)
+        if found is None:
+            self.misses += 1
+            return None
+        tier, entry_dir, entry = found
+        try:
+            for i, path in enumerate(entry['outputs']):
+                _copy_into_place(os.path.join(entry_dir, str(i)), os.path.join(manifest.BRAND_DIR, path))
+        except (OSError, KeyError):
+            # A pruned or half-copied entry; render instead
+            self.misses += 1
+            return None
+        self.hits[tier] += 1
+        return entry.get('encoded', [])
+
+    def _publish(self, key, fill):
+        """Fill a temporary directory with fill(tmp) and rename it into place as key.
+
+        Returns False when the key is already published.
+        """
+        final = self._entry_dir(self.path, key)
+        if os.path.isdir(final):
+            return False
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f'{TEMP_PREFIX}{key[:8]}-', dir=os.path.dirname(final))
+        try:
+            # mkdtemp is owner-only; other users of a shared cache must read entries
+            os.chmod(tmp, 0o755)
+            fill(tmp)
+            os.rename(tmp, final)
+        except OSError:
+            # Another build published the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+        return True
+
+    def store(self, key, recorded):
+        """Copy a finished task's files into the local tier; recorded is its manifest entry."""
+        outputs = recorded['outputs']
+        paths = [os.path.join(manifest.BRAND_DIR, p) for p in outputs]
+        if not all(os.path.isfile(p) for p in paths):
+            return
+
+        def fill(tmp):
+            for i, path in enumerate(paths):
+                shutil.copyfile(path, os.path.join(tmp, str(i)))
+            with open(os.path.join(tmp, ENTRY_FILE), 'w') as f:
+                json.dump({'outputs': outputs, 'encoded': recorded.get('encoded', []),
+                           'created': time.time()}, f, indent=2)
+
+        try:
+            self.stored += self._publish(key, fill)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Drop least recently used local entries until the tier fits max_bytes; returns bytes freed.
+
+        Temporary directories count towards the size but are only removed
+        once TEMP_GRACE_SECONDS old, so a concurrent build's entry survives.
+        """
+        entries, now = [], time.time()
+        for prefix in os.listdir(self.path) if os.path.isdir(self.path) else ():
+            prefix_dir = os.path.join(self.path, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for key in os.listdir(prefix_dir):
+                entry_dir = os.path.join(prefix_dir, key)
+                try:
+                    if key.startswith(TEMP_PREFIX):
+                        # Being filled, or abandoned by a build that died
+                        used = os.path.getmtime(entry_dir)
+                        evictable = now - used > TEMP_GRACE_SECONDS
+                    else:
+                        entry_file = os.path.join(entry_dir, ENTRY_FILE)
+                        # An entry missing its record is broken; age it by the directory
+                        used = os.path.getmtime(entry_file if os.path.exists(entry_file) else entry_dir)
+                        evictable = True
+                    size = _tree_bytes(entry_dir)
+                except OSError:
+                    # Renamed or removed by another build meanwhile
+                    continue
+                entries.append((used, entry_dir, size, evictable))
+        total, freed = sum(size for _, _, size, _ in entries), 0
+        for _, entry_dir, size, evictable in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            if evictable:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                freed += size
+        return freed
+
+    def summary(self):
+        hits = sum(self.hits.values())
+        shared = f" ({self.hits['shared']} shared)" if self.shared else ''
+        return f"Cache: {hits} hit(s){shared}, {self.misses} miss(es), {self.stored} stored in {self.path}"
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Glyph Coverage
+Which code points each font file maps, read from its cmap once and kept on disk
+
+Choosing a face for a run of text is a set lookup: coverage(path) returns a
+frozenset of the code points the font's cmap maps to a real glyph. Fonts
+are parsed directly (format 4 and 12 subtables, .ttc collections), with no
+trial rendering, and the result is stored as code point ranges in
+brand/.font-coverage.json keyed by path, size and mtime, so a CJK face is
+parsed once per machine rather than once per process.
+"""
+
+import json
+import os
+import struct
+import threading
+
+BRAND_DIR = os.path.dirname(os.path.abspath(__file__))
+COVERAGE_PATH = os.path.join(BRAND_DIR, '.font-coverage.json')
+
+# Bump when the parser changes what it reports
+COVERAGE_VERSION = 1
+
+# (platform, encoding) cmap subtables holding Unicode, preferred first
+UNICODE_SUBTABLES = [(3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0)]
+
+def _table(data, offset, tag):
+    """Offset of a table in the sfnt font starting at offset, or None."""
+    count = struct.unpack_from('>H', data, offset + 4)[0]
+    for i in range(count):
+        name, _, table_offset, _ = struct.unpack_from('>4sIII', data, offset + 12 + 16 * i)
+        if name == tag:
+            return table_offset
+    return None
+
+def _format12(data, offset):
+    groups = struct.unpack_from('>I', data, offset + 12)[0]
+    return [struct.unpack_from('>II', data, offset + 16 + 12 * i) for i in range(groups)]
+
+def _format4(data, offset):
+    segments = struct.unpack_from('>H', data, offset + 6)[0] // 2
+    ends = struct.unpack_from(f'>{segments}H', data, offset + 14)
+    starts_at = offset + 16 + 2 * segments
+    starts = struct.unpack_from(f'>{segments}H', data, starts_at)
+    deltas = struct.unpack_from(f'>{segments}h', data, starts_at + 2 * segments)
+    range_offsets_at = starts_at + 4 * segments
+    range_offsets = struct.unpack_from(f'>{segments}H', data, range_offsets_at)
+    codes = []
+    for i, (start, end, delta, range_offset) in enumerate(zip(starts, ends, deltas, range_offsets)):
+        if start == 0xFFFF:
+            continue
+        if range_offset == 0:
+            codes += [c for c in range(start, end + 1) if (c + delta) & 0xFFFF]
+            continue
+        # Glyph ids live in a per-segment array addressed relative to this entry
+        base = range_offsets_at + 2 * i + range_offset
+        for c in range(start, end + 1):
+            glyph = struct.unpack_from('>H', data, base + 2 * (c - start))[0]
+            if glyph and (glyph + delta) & 0xFFFF:
+                codes.append(c)
+    return _ranges(codes)
+
+def _ranges(codes):
+    """Sorted code points collapsed to inclusive (start, end) ranges."""
+    ranges = []
+    for c in sorted(set(codes)):
+        if ranges and ranges[-1][1] == c - 1:
+            ranges[-1][1] = c
+        else:
+            ranges.append([c, c])
+    return [tuple(r) for r in ranges]
+
+def read_cmap(path, index=0):
+    """Code point ranges mapped by the font (face index in a .ttc collection)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    offset = 0
+    if data[:4] == b'ttcf':
+        offset = struct.unpack_from('>I', data, 12 + 4 * index)[0]
+    cmap = _table(data, offset, b'cmap')
+    if cmap is None:
+        return []
+    count = struct.unpack_from('>H', data, cmap + 2)[0]
+    subtables = {}
+    for i in range(count):
+        platform, encoding, sub_offset = struct.unpack_from('>HHI', data, cmap + 4 + 8 * i)
+        subtables[(platform, encoding)] = cmap + sub_offset
+    for key in UNICODE_SUBTABLES:
+        if key in subtables:
+            offset = subtables[key]
+            fmt = struct.unpack_from('>H', data, offset)[0]
+            if fmt == 12:
+                return _format12(data, offset)
+            if fmt == 4:
+                return _format4(data, offset)
+    return []
+
+class CoverageCache:
+    """frozensets of code points per font file, persisted as ranges."""
+
+    def __init__(self, path=COVERAGE_PATH):
+        self.path = path
+        self.sets = {}
+        self.stored = None
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = {}
+        return stored.get('fonts', {}) if stored.get('version') == COVERAGE_VERSION else {}
+
+    def _save(self):
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                json.dump({'version': COVERAGE_VERSION, 'fonts': self.stored}, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            # A read-only checkout still works; it just parses again next time
+            pass
+
+    def get(self, path, index=0):
+        stat = os.stat(path)
+        key = f'{os.path.abspath(path)}#{index}'
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        with self.lock:
+            cached = self.sets.get(key)
+            if cached and cached[0] == stamp:
+                return cached[1]
+            if self.stored is None:
+                self.stored = self._load()
+            entry = self.stored.get(key)
+            if not entry or entry['stamp'] != stamp:
+                entry = self.stored[key] = {'stamp': stamp, 'ranges': read_cmap(path, index)}
+                self._save()
+            codes = frozenset(c for start, end in entry['ranges'] for c in range(start, end + 1))
+            self.sets[key] = (stamp, codes)
+            return codes
+
+_cache = CoverageCache()
+
+def coverage(path, index=0):
+    """frozenset of the code points the font at path maps to a glyph."""
+    return _cache.get(path, index)
+
+def covers(path, text, index=0):
+    """True when the font maps every character of text (whitespace aside)."""
+    codes = coverage(path, index)
+    return all(ord(ch) in codes or ch.isspace() for ch in text)
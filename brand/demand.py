@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Asset Demand
+Finds the images the site actually references and the renderers needed for them
+
+The pages, stylesheets and scripts are scanned for images/<name> references.
+Each referenced name is matched to the task that declares it as an output,
+and the dependency closure of those tasks is what a demand-driven build runs.
+Published images nobody references are orphans.
+
+    python demand.py            # referenced assets, their renderers and orphans
+"""
+
+import glob
+import os
+import re
+import sys
+
+BRAND_DIR = os.path.dirname(os.path.abspath(__file__))
+SITE_DIR = os.path.dirname(BRAND_DIR)
+IMAGES_DIR = os.path.join(SITE_DIR, 'images')
+
+# Site text that can reference an image
+SCANNED = ['*.html', 'css/*.css', 'js/*.js', 'sitemap.xml', 'robots.txt', 'llms.txt',
+           '.well-known/*', 'api/*']
+
+# images/<name>, as a relative, root-relative or absolute URL
+_REFERENCE = re.compile(r'''(?:^|[\s"'(=,/])images/([\w.-]+\.\w+)''', re.M)
+
+def referenced_assets(root=SITE_DIR):
+    """{image name: [site files referencing it]} across every scanned file."""
+    refs = {}
+    for pattern in SCANNED:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            if not os.path.isfile(path):
+                continue
+            with open(path, encoding='utf-8', errors='replace') as f:
+                text = f.read()
+            rel = os.path.relpath(path, root).replace(os.sep, '/')
+            for name in set(_REFERENCE.findall(text)):
+                refs.setdefault(name, []).append(rel)
+    return refs
+
+def producers(tasks):
+    """{output file name: task} for every declared output."""
+    return {os.path.basename(path): t for t in tasks for path in t.outputs}
+
+def demanded(tasks, names):
+    """Tasks needed to produce names, with their dependencies, in task order.
+
+    Returns (tasks, unresolved) where unresolved are the names no task outputs.
+    """
+    by_output = producers(tasks)
+    by_name = {t.name: t for t in tasks}
+    needed = set()
+    stack = [by_output[n].name for n in names if n in by_output]
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack.extend(by_name[name].deps)
+    return [t for t in tasks if t.name in needed], sorted(n for n in names if n not in by_output)
+
+def orphans(names, images_dir=IMAGES_DIR):
+    """Published images no site file references."""
+    if not os.path.isdir(images_dir):
+        return []
+    return sorted(e.name for e in os.scandir(images_dir) if e.is_file() and e.name not in names)
+
+def prune(names, images_dir=IMAGES_DIR):
+    """Delete orphaned images; returns the names removed."""
+    removed = orphans(names, images_dir)
+    for name in removed:
+        os.remove(os.path.join(images_dir, name))
+    return removed
+
+def report(tasks, refs):
+    """Print referenced assets, the renderers that need to run and the orphans."""
+    needed, _ = demanded(tasks, refs)
+    by_output = producers(tasks)
+    print(f"{len(refs)} referenced image(s) need {len(needed)} of {len(tasks)} renderer(s):")
+    for name in sorted(refs):
+        if name in by_output:
+            source = by_output[name].name
+        elif os.path.exists(os.path.join(IMAGES_DIR, name)):
+            source = 'static file'
+        else:
+            source = 'MISSING'
+        print(f"  images/{name:<28} {source:<24} ({len(refs[name])} file(s))")
+    needed_names = {t.name for t in needed}
+    skipped = [t.name for t in tasks if t.name not in needed_names]
+    if skipped:
+        print(f"Not needed by the site: {', '.join(skipped)}")
+    stale = orphans(refs)
+    if stale:
+        print(f"Orphaned in images/ ({len(stale)}): {', '.join(stale)}")
+    return needed
+
+def main(argv=None):
+    from build import TARGETS, collect_tasks
+
+    targets = (sys.argv[1:] if argv is None else argv) or sorted(TARGETS)
+    report(collect_tasks(targets), referenced_assets())
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
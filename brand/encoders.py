@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Output Encoders
+Pluggable save stage: optimized PNG, WebP, AVIF and responsive width variants
+
+Renderers hand finished images to save_image(). Without configure() it is
+a plain PNG save; once configured, each image is encoded into every
+requested format and width on a background thread pool while the renderer
+carries on, and flush() collects the size report. The PNG is written by
+quantize.optimize_png: indexed against the active theme's colors when the
+image is flat enough, and the report records what Pillow's optimized save
+would have cost.
+"""
+
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, features
+
+import theme
+from quantize import optimize_png
+
+# format name -> (extension, Pillow format, save options)
+FORMATS = {
+    'png': ('.png', 'PNG', {'optimize': True}),
+    'webp': ('.webp', 'WEBP', {'lossless': True, 'method': 6}),
+    'webp-lossy': ('.lossy.webp', 'WEBP', {'quality': 82, 'method': 4}),
+    'avif': ('.avif', 'AVIF', {'quality': 60, 'speed': 8}),
+}
+
+_state = {'formats': None, 'widths': (), 'pool': None, 'pending': []}
+
+def available_formats():
+    """Formats this Pillow build can write."""
+    names = ['png']
+    if features.check('webp'):
+        names += ['webp', 'webp-lossy']
+    if features.check('avif'):
+        names.append('avif')
+    return names
+
+def configure(formats=None, widths=(), workers=4):
+    """Enable the encoder stage; formats=None restores the plain PNG save.
+
+    The optimized PNG is always written so declared outputs stay valid.
+    """
+    if formats is not None:
+        formats = ['png'] + [name for name in formats if name != 'png']
+        unknown = sorted(set(formats) - set(FORMATS))
+        if unknown:
+            raise ValueError(f"Unknown output format(s): {', '.join(unknown)}")
+        missing = sorted(set(formats) - set(available_formats()))
+        if missing:
+            raise RuntimeError(f"Pillow cannot encode: {', '.join(missing)}")
+    _state['formats'] = tuple(formats) if formats is not None else None
+    _state['widths'] = tuple(sorted(set(widths)))
+    if formats is not None and _state['pool'] is None:
+        _state['pool'] = ThreadPoolExecutor(max_workers=workers)
+
+def config():
+    """Current settings, folded into build fingerprints."""
+    return {'formats': _state['formats'], 'widths': _state['widths']}
+
+def _encode_png(img, path, seeds):
+    """Palette-optimized PNG, with Pillow's optimized size as the baseline."""
+    data, method = optimize_png(img, seeds)
+    with open(path, 'wb') as f:
+        f.write(data)
+    baseline = io.BytesIO()
+    img.save(baseline, 'PNG', **FORMATS['png'][2])
+    return {'path': path, 'format': 'png', 'width': img.width, 'bytes': len(data),
+            'baseline_bytes': baseline.tell(), 'method': method}
+
+def _encode(img, path, name, seeds=()):
+    if name == 'png':
+        return _encode_png(img, path, seeds)
+    ext, fmt, options = FORMATS[name]
+    if fmt == 'AVIF' or (fmt == 'WEBP' and not options.get('lossless')):
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA')
+    img.save(path, fmt, **options)
+    return {'path': path, 'format': name, 'width': img.width, 'bytes': os.path.getsize(path)}
+
+def _encode_all(img, path, seeds):
+    stem = os.path.splitext(path)[0]
+    entries = []
+    sources = [('', img)] + [
+        (f'-{w}w', img.resize((w, round(img.height * w / img.width)), Image.LANCZOS))
+        for w in _state['widths'] if w < img.width
+    ]
+    for suffix, source in sources:
+        for name in _state['formats']:
+            entries.append(_encode(source, stem + suffix + FORMATS[name][0], name, seeds))
+    return entries
+
+def encode_bytes(img, name='png'):
+    """Encode an image in memory with the settings of FORMATS[name]."""
+    _, fmt, options = FORMATS[name]
+    if fmt in ('AVIF', 'WEBP') and img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA')
+    buf = io.BytesIO()
+    img.save(buf, fmt, **options)
+    return buf.getvalue()
+
+def save_image(img, path):
+    """Save a rendered image; img must not be modified afterwards."""
+    if not _state['formats']:
+        img.save(path, 'PNG')
+        return
+    # Seeds are taken now: the renderer's theme is no longer active on the pool thread
+    seeds = tuple(theme.palette().rgba.values())
+    _state['pending'].append(_state['pool'].submit(_encode_all, img, path, seeds))
+
+def flush():
+    """Wait for queued encodes and return their size report entries."""
+    pending, _state['pending'] = _state['pending'], []
+    entries = []
+    for future in pending:
+        entries.extend(future.result())
+    return entries
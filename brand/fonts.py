@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Font Cache
+Resolves the bundled brand typeface once and memoizes sized FreeType fonts
+"""
+
+import os
+from functools import lru_cache
+from PIL import ImageFont
+
+from coverage import coverage
+from hashing import file_digest
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+
+# Bundled faces per role; override with BRAND_FONT_<ROLE>=/path/to/font.ttf
+FONT_FILES = {
+    'sans': 'DejaVuSans.ttf',
+}
+
+# Sizes the marketing renderers use, preloaded before worker processes start
+WARM_SIZES = (20, 24, 28, 32, 36, 40, 56, 64, 72)
+
+FONT_CACHE_SIZE = 64
+
+# Faces tried in order for characters the role's font lacks (other scripts,
+# CJK, symbols), found by file name under SYSTEM_FONT_DIRS; prepend more
+# with BRAND_FONT_FALLBACKS=/path/a.ttf:/path/b.otf
+FALLBACK_FILES = (
+    'NotoSans-Regular.ttf',
+    'NotoSansArabic-Regular.ttf',
+    'NotoNaskhArabic-Regular.ttf',
+    'NotoSansHebrew-Regular.ttf',
+    'NotoSansDevanagari-Regular.ttf',
+    'NotoSansBengali-Regular.ttf',
+    'NotoSansTamil-Regular.ttf',
+    'NotoSansThai-Regular.ttf',
+    'NotoSansCJK-Regular.ttc',
+    'NotoSansCJKsc-Regular.otf',
+    'NotoSansCJKjp-Regular.otf',
+    'NotoSansCJKkr-Regular.otf',
+    'DejaVuSans.ttf',
+    'FreeSans.ttf',
+    'ArialUnicode.ttf',
+    'Arial Unicode.ttf',
+)
+
+SYSTEM_FONT_DIRS = (
+    FONT_DIR,
+    '/usr/share/fonts',
+    '/usr/local/share/fonts',
+    os.path.expanduser('~/.local/share/fonts'),
+    os.path.expanduser('~/.fonts'),
+    '/Library/Fonts',
+    '/System/Library/Fonts',
+)
+
+@lru_cache(maxsize=None)
+def font_path(role='sans'):
+    """Absolute path of the font file for a role (env override or bundled)."""
+    path = os.environ.get(f'BRAND_FONT_{role.upper()}')
+    if not path:
+        if role not in FONT_FILES:
+            raise KeyError(f"Unknown font role: {role}")
+        path = os.path.join(FONT_DIR, FONT_FILES[role])
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Font for role '{role}' not found: {path}")
+    return path
+
+@lru_cache(maxsize=None)
+def fallback_paths():
+    """Installed fallback faces, in FALLBACK_FILES order after any env overrides."""
+    found = {}
+    for directory in SYSTEM_FONT_DIRS:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                found.setdefault(name, os.path.join(root, name))
+    paths = [p for p in os.environ.get('BRAND_FONT_FALLBACKS', '').split(os.pathsep) if os.path.isfile(p)]
+    return tuple(dict.fromkeys(paths + [found[name] for name in FALLBACK_FILES if name in found]))
+
+def font_chain(path):
+    """Font files tried for a character: path itself, then the fallbacks."""
+    return (path,) + tuple(p for p in fallback_paths() if p != path)
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path, size):
+    """FreeTypeFont for (path, size), parsed once per process."""
+    return ImageFont.truetype(path, size)
+
+def get_font(size, role='sans'):
+    """Brand font at the given pixel size."""
+    return load_font(font_path(role), size)
+
+def warm(sizes=WARM_SIZES, roles=tuple(FONT_FILES)):
+    """Preload fonts so forked workers inherit them and spawned ones load up front."""
+    for role in roles:
+        for size in sizes:
+            get_font(size, role)
+
+def resolved_fallbacks(path, text):
+    """Fallback faces font_chain(path) picks for the characters of text path lacks."""
+    primary = coverage(path)
+    lacking = {ord(ch) for ch in text if ch.isprintable() and not ch.isspace()} - primary
+    if not lacking:
+        return []
+    chain = font_chain(path)[1:]
+    faces = {next((p for p in chain if code in coverage(p)), None) for code in lacking}
+    return [p for p in chain if p in faces]
+
+def build_inputs(texts=()):
+    """Font file digests, folded into the build manifest fingerprints.
+
+    texts are the strings a renderer can draw; only the fallback faces the
+    chain resolves for them count, so Latin renderers do not depend on which
+    system fonts are installed.
+    """
+    digests = {role: file_digest(font_path(role)) for role in FONT_FILES}
+    text = ''.join(texts)
+    for role in FONT_FILES:
+        for p in resolved_fallbacks(font_path(role), text):
+            digests[f'fallback:{os.path.basename(p)}'] = file_digest(p)
+    return digests
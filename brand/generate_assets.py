@@ -4,190 +4,201 @@ Anonymize.dev Brand Asset Generator
 Neon Protocol Theme - Cyberpunk Developer Aesthetic
 """
 
-import os
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.colors import HexColor
-from PIL import Image, ImageDraw, ImageFont
 import math
-
-# Neon Protocol Color Palette
-COLORS = {
-    'void_black': '#0a0a0f',
-    'terminal_dark': '#12121a',
-    'matrix_gray': '#1e1e2e',
-    'syntax_slate': '#6b7280',
-    'electric_cyan': '#00ffff',
-    'neon_magenta': '#ff00ff',
-    'terminal_green': '#00ff41',
-    'pulse_blue': '#0080ff',
-    'hot_coral': '#ff3366',
-    'pure_white': '#ffffff',
-    'ghost_white': '#e5e5e5',
-}
-
-def hex_to_rgb(hex_color):
-    """Convert hex color to RGB tuple."""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
-def create_logo(output_dir, size=512):
-    """Create the main logo - angular 'A' with neon glow effect."""
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
-    # Background circle with glow
+import os
+from PIL import Image
+from functools import partial
+
+from animate import available_extensions, layered_frames, save_animation
+from atlas import atlas_outputs, create_atlas
+from encoders import save_image
+from raster import SUPERSAMPLE, derive_sizes, downscale
+from scene import Scene, rasterize, to_svg, write_pdf
+from taskgraph import task
+from theme import rgb, rgba, themed
+from tiles import dot_tile, tiled
+
+FAVICON_SIZES = [16, 32, 48, 64, 128, 256]
+ICO_SIZES = [16, 32, 48]
+APPLE_TOUCH_SIZE = 180
+
+ENTITIES = [
+    ('person', 'User silhouette'),
+    ('email', 'Envelope'),
+    ('phone', 'Phone'),
+    ('location', 'Pin'),
+    ('id-card', 'Card'),
+    ('credit-card', 'Payment card'),
+    ('code', 'Code brackets'),
+]
+
+FEATURES = ['shield', 'lock', 'globe', 'speed', 'terminal']
+
+PRODUCT_ICONS = [
+    ('mcp-server', 'mcp'),
+    ('desktop-app', 'desktop'),
+    ('office-addin', 'office'),
+    ('api', 'api'),
+]
+
+def logo_geometry(size):
+    """Coordinates of the logo mark, shared by the PNG, PDF and SVG outputs.
+
+    Points use a top-left origin in pixels; backends with a bottom-left
+    origin flip Y themselves.
+    """
     center = size // 2
     radius = size // 2 - 20
+    a_height = int(size * 0.45)
+    a_width = int(size * 0.35)
+    a_top = center - a_height // 2
+    a_left = center - a_width // 2
+    crossbar_y = a_top + int(a_height * 0.6)
+    return {
+        'center': center,
+        'radius': radius,
+        'border_radius': radius - 4,
+        'apex': (center, a_top),
+        'left_foot': (a_left, a_top + a_height),
+        'right_foot': (a_left + a_width, a_top + a_height),
+        'crossbar': ((a_left + int(a_width * 0.2), crossbar_y),
+                     (a_left + int(a_width * 0.8), crossbar_y)),
+        'line_width': 6,
+        # Dot at top of A (data point)
+        'dot': (center, a_top - 5),
+        'dot_radius': 8,
+    }
+
+def logo_scene(size=512):
+    """Logo mark - angular 'A' with neon glow effect."""
+    scene = Scene(size, size)
+    g = logo_geometry(size)
 
-    # Outer glow layers
-    for i in range(5, 0, -1):
-        glow_radius = radius + i * 8
-        alpha = int(50 - i * 8)
-        glow_color = (*hex_to_rgb(COLORS['electric_cyan']), alpha)
-        draw.ellipse(
-            [center - glow_radius, center - glow_radius,
-             center + glow_radius, center + glow_radius],
-            fill=glow_color
-        )
+    # Background circle with glow
+    center = g['center']
+    radius = g['radius']
+
+    # Outer glow, fading out at the canvas edge
+    scene.halo('circle', rgb('electric_cyan'), spread=size // 2 - radius,
+               strength=0.3, center=(center, center), radius=radius)
 
     # Main dark circle
-    draw.ellipse(
+    scene.ellipse(
         [center - radius, center - radius,
          center + radius, center + radius],
-        fill=hex_to_rgb(COLORS['terminal_dark'])
+        fill=rgb('terminal_dark')
     )
 
     # Inner border ring
-    border_radius = radius - 4
-    draw.ellipse(
+    border_radius = g['border_radius']
+    scene.ellipse(
         [center - border_radius, center - border_radius,
          center + border_radius, center + border_radius],
-        outline=hex_to_rgb(COLORS['electric_cyan']),
+        outline=rgb('electric_cyan'),
         width=2
     )
 
     # Angular 'A' shape
-    a_height = int(size * 0.45)
-    a_width = int(size * 0.35)
-    a_top = center - a_height // 2
-    a_left = center - a_width // 2
-
-    # Draw the 'A' with thick lines
-    line_width = 6
-    cyan = hex_to_rgb(COLORS['electric_cyan'])
-
-    # Left leg of A
-    draw.line(
-        [(center, a_top), (a_left, a_top + a_height)],
-        fill=cyan, width=line_width
-    )
-    # Right leg of A
-    draw.line(
-        [(center, a_top), (a_left + a_width, a_top + a_height)],
-        fill=cyan, width=line_width
-    )
-    # Crossbar
-    crossbar_y = a_top + int(a_height * 0.6)
-    draw.line(
-        [(a_left + int(a_width * 0.2), crossbar_y),
-         (a_left + int(a_width * 0.8), crossbar_y)],
-        fill=cyan, width=line_width
+    line_width = g['line_width']
+    cyan = rgb('electric_cyan')
+    scene.line([g['apex'], g['left_foot']], fill=cyan, width=line_width)
+    scene.line([g['apex'], g['right_foot']], fill=cyan, width=line_width)
+    scene.line(list(g['crossbar']), fill=cyan, width=line_width)
+
+    # Data point
+    dot_x, dot_y = g['dot']
+    dot_radius = g['dot_radius']
+    scene.ellipse(
+        [dot_x - dot_radius, dot_y - dot_radius,
+         dot_x + dot_radius, dot_y + dot_radius],
+        fill=rgb('terminal_green')
     )
 
-    # Dot at top of A (data point)
-    dot_radius = 8
-    draw.ellipse(
-        [center - dot_radius, a_top - dot_radius - 5,
-         center + dot_radius, a_top + dot_radius - 5],
-        fill=hex_to_rgb(COLORS['terminal_green'])
-    )
+    return scene
 
-    # Save PNG
-    img.save(os.path.join(output_dir, 'logo-anonymize-dev.png'), 'PNG')
+@themed
+def create_logo(output_dir, size=512):
+    """Create the main logo as PNG and PDF from one scene."""
+    scene = logo_scene(size)
+    img = downscale(rasterize(scene, SUPERSAMPLE), size)
+    save_image(img, os.path.join(output_dir, 'logo-anonymize-dev.png'))
+    write_pdf(scene, os.path.join(output_dir, 'logo-anonymize-dev.pdf'))
+    print(f"Created logo: {output_dir}/logo-anonymize-dev.png")
+
+def favicon_scene(size=max(FAVICON_SIZES)):
+    """Favicon mark, rasterized once at supersampled resolution.
 
-    # Create PDF version
-    pdf_path = os.path.join(output_dir, 'logo-anonymize-dev.pdf')
-    c = canvas.Canvas(pdf_path, pagesize=(size, size))
+    Strokes are proportional to the size so every derived size, down to
+    16px, keeps a visible ring and 'A'.
+    """
+    scene = Scene(size, size)
 
-    # Draw background
-    c.setFillColor(HexColor(COLORS['terminal_dark']))
-    c.circle(center, size - center, radius, fill=1, stroke=0)
+    center = size // 2
+    radius = size // 2 - 1
+    stroke = size / 16
 
-    # Draw border
-    c.setStrokeColor(HexColor(COLORS['electric_cyan']))
-    c.setLineWidth(2)
-    c.circle(center, size - center, border_radius, fill=0, stroke=1)
+    # Background
+    scene.ellipse(
+        [center - radius, center - radius,
+         center + radius, center + radius],
+        fill=rgb('terminal_dark')
+    )
 
-    # Draw A shape
-    c.setStrokeColor(HexColor(COLORS['electric_cyan']))
-    c.setLineWidth(line_width)
+    # Border
+    scene.ellipse(
+        [center - radius + 1, center - radius + 1,
+         center + radius - 1, center + radius - 1],
+        outline=rgb('electric_cyan'),
+        width=stroke
+    )
 
-    # Flip Y coordinates for PDF
-    pdf_a_top = size - a_top
-    pdf_a_bottom = size - (a_top + a_height)
-    pdf_crossbar_y = size - crossbar_y
+    # Simplified A
+    a_height = int(size * 0.4)
+    a_width = int(size * 0.3)
+    a_top = center - a_height // 2
+    a_left = center - a_width // 2
 
-    c.line(center, pdf_a_top, a_left, pdf_a_bottom)
-    c.line(center, pdf_a_top, a_left + a_width, pdf_a_bottom)
-    c.line(a_left + int(a_width * 0.2), pdf_crossbar_y,
-           a_left + int(a_width * 0.8), pdf_crossbar_y)
+    cyan = rgb('electric_cyan')
+    scene.line([(center, a_top), (a_left, a_top + a_height)], fill=cyan, width=stroke)
+    scene.line([(center, a_top), (a_left + a_width, a_top + a_height)], fill=cyan, width=stroke)
 
-    # Dot
-    c.setFillColor(HexColor(COLORS['terminal_green']))
-    c.circle(center, pdf_a_top + dot_radius + 5, dot_radius, fill=1, stroke=0)
+    crossbar_y = a_top + int(a_height * 0.6)
+    scene.line([(a_left + int(a_width * 0.15), crossbar_y),
+              (a_left + int(a_width * 0.85), crossbar_y)], fill=cyan, width=stroke)
 
-    c.save()
-    print(f"Created logo: {output_dir}/logo-anonymize-dev.png")
+    return scene
 
-def create_favicon(output_dir, sizes=[16, 32, 48, 64, 128, 256]):
-    """Create favicon at multiple sizes."""
+@themed
+def create_favicon(output_dir, sizes=FAVICON_SIZES):
+    """Create favicons: per-size PNGs, one multi-size ICO, an SVG and the Apple touch icon."""
+    # One rasterization; every PNG, ICO entry and the touch icon derive from it
+    master = rasterize(favicon_scene(), SUPERSAMPLE)
+    images = derive_sizes(master, set(sizes) | set(ICO_SIZES) | {APPLE_TOUCH_SIZE})
     for size in sizes:
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-
-        center = size // 2
-        radius = size // 2 - 1
-
-        # Background
-        draw.ellipse(
-            [center - radius, center - radius,
-             center + radius, center + radius],
-            fill=hex_to_rgb(COLORS['terminal_dark'])
-        )
-
-        # Border
-        draw.ellipse(
-            [center - radius + 1, center - radius + 1,
-             center + radius - 1, center + radius - 1],
-            outline=hex_to_rgb(COLORS['electric_cyan']),
-            width=max(1, size // 32)
-        )
-
-        # Simplified A for small sizes
-        if size >= 32:
-            a_height = int(size * 0.4)
-            a_width = int(size * 0.3)
-            a_top = center - a_height // 2
-            a_left = center - a_width // 2
-            line_width = max(1, size // 16)
-
-            cyan = hex_to_rgb(COLORS['electric_cyan'])
-            draw.line([(center, a_top), (a_left, a_top + a_height)], fill=cyan, width=line_width)
-            draw.line([(center, a_top), (a_left + a_width, a_top + a_height)], fill=cyan, width=line_width)
-
-            crossbar_y = a_top + int(a_height * 0.6)
-            draw.line([(a_left + int(a_width * 0.15), crossbar_y),
-                      (a_left + int(a_width * 0.85), crossbar_y)], fill=cyan, width=line_width)
-
-        img.save(os.path.join(output_dir, f'favicon-{size}.png'), 'PNG')
-
-    print(f"Created favicons: {sizes}")
+        img = images[size]
+        save_image(img, os.path.join(output_dir, f'favicon-{size}.png'))
+
+    # favicon.ico bundles the small sizes
+    ico_images = [images[size] for size in ICO_SIZES]
+    ico_images[-1].save(
+        os.path.join(output_dir, 'favicon.ico'), 'ICO',
+        sizes=[(size, size) for size in ICO_SIZES], append_images=ico_images[:-1]
+    )
 
-def create_product_icon(output_dir, name, icon_type, size=200):
-    """Create product icons with neon glow."""
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    with open(os.path.join(output_dir, 'favicon.svg'), 'w') as f:
+        # The favicon geometry, not the logo's: its strokes stay visible at tab size
+        f.write(to_svg(favicon_scene()))
+
+    # iOS ignores transparency, so the touch icon sits on the page background
+    touch = Image.new('RGBA', (APPLE_TOUCH_SIZE, APPLE_TOUCH_SIZE), rgba('void_black'))
+    touch.alpha_composite(images[APPLE_TOUCH_SIZE])
+    save_image(touch.convert('RGB'), os.path.join(output_dir, 'apple-touch-icon.png'))
+
+    print(f"Created favicons: {list(sizes)} + favicon.ico {ICO_SIZES}, favicon.svg, apple-touch-icon.png")
+
+def product_icon_scene(icon_type, size=200):
+    """Product icon with neon glow."""
+    scene = Scene(size, size)
 
     center = size // 2
 
@@ -195,32 +206,26 @@ def create_product_icon(output_dir, name, icon_type, size=200):
     bg_radius = size // 2 - 15
 
     # Glow effect
-    glow_color = COLORS['electric_cyan'] if icon_type != 'mcp' else COLORS['terminal_green']
-    for i in range(4, 0, -1):
-        glow_radius = bg_radius + i * 5
-        alpha = int(40 - i * 8)
-        draw.ellipse(
-            [center - glow_radius, center - glow_radius,
-             center + glow_radius, center + glow_radius],
-            fill=(*hex_to_rgb(glow_color), alpha)
-        )
+    glow_color = rgb('electric_cyan' if icon_type != 'mcp' else 'terminal_green')
+    scene.halo('circle', glow_color, spread=size // 2 - bg_radius, strength=0.25,
+               center=(center, center), radius=bg_radius)
 
     # Main background
-    draw.ellipse(
+    scene.ellipse(
         [center - bg_radius, center - bg_radius,
          center + bg_radius, center + bg_radius],
-        fill=hex_to_rgb(COLORS['terminal_dark']),
-        outline=hex_to_rgb(glow_color),
+        fill=rgb('terminal_dark'),
+        outline=glow_color,
         width=2
     )
 
-    icon_color = hex_to_rgb(glow_color)
+    icon_color = glow_color
 
     if icon_type == 'mcp':
         # MCP Server - network/proxy symbol
         # Central node
         node_r = 12
-        draw.ellipse([center - node_r, center - node_r, center + node_r, center + node_r],
+        scene.ellipse([center - node_r, center - node_r, center + node_r, center + node_r],
                     fill=icon_color)
 
         # Outer nodes
@@ -232,8 +237,8 @@ def create_product_icon(output_dir, name, icon_type, size=200):
             (center + 35, center + 25),
         ]
         for x, y in positions:
-            draw.ellipse([x - outer_r, y - outer_r, x + outer_r, y + outer_r], fill=icon_color)
-            draw.line([(x, y), (center, center)], fill=icon_color, width=2)
+            scene.ellipse([x - outer_r, y - outer_r, x + outer_r, y + outer_r], fill=icon_color)
+            scene.line([(x, y), (center, center)], fill=icon_color, width=2)
 
         # Shield outline around center
         shield_points = [
@@ -244,7 +249,7 @@ def create_product_icon(output_dir, name, icon_type, size=200):
             (center - 25, center + 10),
             (center - 25, center - 15),
         ]
-        draw.polygon(shield_points, outline=icon_color, width=2)
+        scene.polygon(shield_points, outline=icon_color, width=2)
 
     elif icon_type == 'desktop':
         # Desktop app - monitor with terminal
@@ -253,16 +258,16 @@ def create_product_icon(output_dir, name, icon_type, size=200):
         m_top = center - 30
         m_width = 80
         m_height = 50
-        draw.rectangle([m_left, m_top, m_left + m_width, m_top + m_height],
+        scene.rectangle([m_left, m_top, m_left + m_width, m_top + m_height],
                       outline=icon_color, width=2)
         # Screen content - terminal lines
         for i in range(3):
             y = m_top + 12 + i * 12
             width = 50 - i * 10
-            draw.line([(m_left + 10, y), (m_left + 10 + width, y)], fill=icon_color, width=2)
+            scene.line([(m_left + 10, y), (m_left + 10 + width, y)], fill=icon_color, width=2)
         # Stand
-        draw.line([(center, m_top + m_height), (center, m_top + m_height + 15)], fill=icon_color, width=2)
-        draw.line([(center - 20, m_top + m_height + 15), (center + 20, m_top + m_height + 15)], fill=icon_color, width=3)
+        scene.line([(center, m_top + m_height), (center, m_top + m_height + 15)], fill=icon_color, width=2)
+        scene.line([(center - 20, m_top + m_height + 15), (center + 20, m_top + m_height + 15)], fill=icon_color, width=3)
 
     elif icon_type == 'office':
         # Office add-in - document with plugin symbol
@@ -280,49 +285,57 @@ def create_product_icon(output_dir, name, icon_type, size=200):
             (doc_left + doc_width, doc_top + doc_height),
             (doc_left, doc_top + doc_height),
         ]
-        draw.polygon(points, outline=icon_color, width=2)
+        scene.polygon(points, outline=icon_color, width=2)
         # Fold line
-        draw.line([(doc_left + doc_width - fold, doc_top),
+        scene.line([(doc_left + doc_width - fold, doc_top),
                   (doc_left + doc_width - fold, doc_top + fold),
                   (doc_left + doc_width, doc_top + fold)], fill=icon_color, width=1)
         # Lines on document
         for i in range(3):
             y = doc_top + 20 + i * 12
-            draw.line([(doc_left + 8, y), (doc_left + doc_width - 15, y)], fill=icon_color, width=2)
+            scene.line([(doc_left + 8, y), (doc_left + doc_width - 15, y)], fill=icon_color, width=2)
         # Plugin symbol (plus)
         plus_x = doc_left + doc_width - 8
         plus_y = doc_top + doc_height - 15
-        draw.line([(plus_x - 8, plus_y), (plus_x + 8, plus_y)], fill=hex_to_rgb(COLORS['terminal_green']), width=3)
-        draw.line([(plus_x, plus_y - 8), (plus_x, plus_y + 8)], fill=hex_to_rgb(COLORS['terminal_green']), width=3)
+        scene.line([(plus_x - 8, plus_y), (plus_x + 8, plus_y)], fill=rgb('terminal_green'), width=3)
+        scene.line([(plus_x, plus_y - 8), (plus_x, plus_y + 8)], fill=rgb('terminal_green'), width=3)
 
     elif icon_type == 'api':
         # API - brackets with connection
         # Left bracket
-        draw.line([(center - 35, center - 25), (center - 45, center - 25)], fill=icon_color, width=3)
-        draw.line([(center - 45, center - 25), (center - 45, center + 25)], fill=icon_color, width=3)
-        draw.line([(center - 35, center + 25), (center - 45, center + 25)], fill=icon_color, width=3)
+        scene.line([(center - 35, center - 25), (center - 45, center - 25)], fill=icon_color, width=3)
+        scene.line([(center - 45, center - 25), (center - 45, center + 25)], fill=icon_color, width=3)
+        scene.line([(center - 35, center + 25), (center - 45, center + 25)], fill=icon_color, width=3)
         # Right bracket
-        draw.line([(center + 35, center - 25), (center + 45, center - 25)], fill=icon_color, width=3)
-        draw.line([(center + 45, center - 25), (center + 45, center + 25)], fill=icon_color, width=3)
-        draw.line([(center + 35, center + 25), (center + 45, center + 25)], fill=icon_color, width=3)
+        scene.line([(center + 35, center - 25), (center + 45, center - 25)], fill=icon_color, width=3)
+        scene.line([(center + 45, center - 25), (center + 45, center + 25)], fill=icon_color, width=3)
+        scene.line([(center + 35, center + 25), (center + 45, center + 25)], fill=icon_color, width=3)
         # Connection dots
         for x in [-15, 0, 15]:
-            draw.ellipse([center + x - 5, center - 5, center + x + 5, center + 5], fill=icon_color)
+            scene.ellipse([center + x - 5, center - 5, center + x + 5, center + 5], fill=icon_color)
 
-    img.save(os.path.join(output_dir, f'icon-{name}.png'), 'PNG')
+    return scene
+
+@themed
+def create_product_icon(output_dir, name, icon_type, size=200):
+    """Create product icons with neon glow."""
+    img = downscale(rasterize(product_icon_scene(icon_type, size), SUPERSAMPLE), size)
+    save_image(img, os.path.join(output_dir, f'icon-{name}.png'))
     print(f"Created icon: icon-{name}.png")
 
-def create_hero_graphic(output_dir, width=1200, height=600):
-    """Create hero graphic with data flow visualization."""
-    img = Image.new('RGBA', (width, height), hex_to_rgb(COLORS['void_black']) + (255,))
-    draw = ImageDraw.Draw(img)
+# Dash period of the hero flow lines: a 10px dash and a 10px gap
+HERO_DASH_PERIOD = 20
 
+def _hero_rows(height):
+    """y of each of the four hero data rows."""
+    return [height // 2 - 90 + i * 60 for i in range(4)]
+
+def hero_base_scene(width=1200, height=600):
+    """Hero layers below the flow lines: grid, data blocks and the MCP shield."""
     # Grid pattern (subtle)
-    grid_color = (*hex_to_rgb(COLORS['matrix_gray']), 100)
-    for x in range(0, width, 40):
-        draw.line([(x, 0), (x, height)], fill=grid_color, width=1)
-    for y in range(0, height, 40):
-        draw.line([(0, y), (width, y)], fill=grid_color, width=1)
+    grid_color = rgba('matrix_gray', 100)
+    scene = Scene(width, height, background=rgba('void_black'),
+                  grid=(40, grid_color))
 
     # Data flow visualization
     # Left side - "sensitive data"
@@ -330,10 +343,9 @@ def create_hero_graphic(output_dir, width=1200, height=600):
     center_y = height // 2
 
     # Data blocks on left (representing sensitive data)
-    block_color = hex_to_rgb(COLORS['hot_coral'])
-    for i in range(4):
-        y = center_y - 90 + i * 60
-        draw.rectangle([left_x - 60, y - 15, left_x + 60, y + 15],
+    block_color = rgb('hot_coral')
+    for y in _hero_rows(height):
+        scene.rectangle([left_x - 60, y - 15, left_x + 60, y + 15],
                       fill=(*block_color, 180), outline=block_color, width=2)
 
     # MCP Server in center (shield shape)
@@ -347,220 +359,295 @@ def create_hero_graphic(output_dir, width=1200, height=600):
         (mcp_x - 80, center_y - 60),
     ]
 
-    # Shield glow
-    green = hex_to_rgb(COLORS['terminal_green'])
-    for i in range(5, 0, -1):
-        alpha = int(30 - i * 5)
-        draw.polygon([(p[0], p[1]) for p in shield_points],
-                    fill=(*green, alpha))
+    # Shield glow with a faint tint inside
+    green = rgb('terminal_green')
+    scene.halo('polygon', green, spread=24, strength=0.2, inner=0.1, points=shield_points)
 
     # Shield border
-    draw.polygon(shield_points, outline=green, width=3)
+    scene.polygon(shield_points, outline=green, width=3)
 
     # "MCP" text placeholder (center of shield)
     mcp_text_y = center_y - 10
-    draw.rectangle([mcp_x - 35, mcp_text_y - 12, mcp_x + 35, mcp_text_y + 12],
-                  fill=hex_to_rgb(COLORS['terminal_dark']), outline=green, width=1)
+    scene.rectangle([mcp_x - 35, mcp_text_y - 12, mcp_x + 35, mcp_text_y + 12],
+                  fill=rgb('terminal_dark'), outline=green, width=1)
 
     # Right side - "protected data"
     right_x = width - 150
 
     # Data blocks on right (protected - tokenized)
-    cyan = hex_to_rgb(COLORS['electric_cyan'])
-    for i in range(4):
-        y = center_y - 90 + i * 60
-        draw.rectangle([right_x - 60, y - 15, right_x + 60, y + 15],
-                      fill=(*hex_to_rgb(COLORS['terminal_dark']), 200), outline=cyan, width=2)
+    cyan = rgb('electric_cyan')
+    for y in _hero_rows(height):
+        scene.rectangle([right_x - 60, y - 15, right_x + 60, y + 15],
+                      fill=rgba('terminal_dark', 200), outline=cyan, width=2)
         # Asterisks to show tokenized
         for j in range(5):
-            draw.ellipse([right_x - 40 + j * 20, y - 3, right_x - 34 + j * 20, y + 3], fill=cyan)
+            scene.ellipse([right_x - 40 + j * 20, y - 3, right_x - 34 + j * 20, y + 3], fill=cyan)
 
-    # Flow lines left to MCP
-    for i in range(4):
-        y = center_y - 90 + i * 60
-        # Animated-looking dashed line
-        for x in range(left_x + 70, mcp_x - 90, 20):
-            draw.line([(x, y), (x + 10, y)], fill=block_color, width=2)
+    return scene
 
-    # Flow lines MCP to right
-    for i in range(4):
-        y = center_y - 90 + i * 60
-        for x in range(mcp_x + 90, right_x - 70, 20):
-            draw.line([(x, y), (x + 10, y)], fill=cyan, width=2)
+def hero_flow_scene(width=1200, height=600, phase=0):
+    """Dashed flow lines into and out of the shield, shifted phase px downstream."""
+    scene = Scene(width, height)
+    mcp_x = width // 2
+    spans = [
+        (150 + 70, mcp_x - 90, rgb('hot_coral')),
+        (mcp_x + 90, width - 150 - 70, rgb('electric_cyan')),
+    ]
+    offset = phase % HERO_DASH_PERIOD
+    for start, end, color in spans:
+        for y in _hero_rows(height):
+            # Dashes clipped to the span, so one entering at the start grows in
+            for x in range(start + offset - HERO_DASH_PERIOD, end, HERO_DASH_PERIOD):
+                x0, x1 = max(x, start), min(x + 10, end)
+                if x1 > x0:
+                    scene.line([(x0, y), (x1, y)], fill=color, width=2)
+    return scene
+
+def hero_overlay_scene(width=1200, height=600):
+    """Hero layers above the flow lines: arrow heads and label areas."""
+    scene = Scene(width, height)
+    left_x, mcp_x, right_x = 150, width // 2, width - 150
+    block_color = rgb('hot_coral')
+    cyan = rgb('electric_cyan')
+    green = rgb('terminal_green')
 
     # Arrow heads
     arrow_size = 8
-    for i in range(4):
-        y = center_y - 90 + i * 60
+    for y in _hero_rows(height):
         # Left arrow (into MCP)
         ax = mcp_x - 90
-        draw.polygon([(ax, y), (ax - arrow_size, y - arrow_size), (ax - arrow_size, y + arrow_size)],
+        scene.polygon([(ax, y), (ax - arrow_size, y - arrow_size), (ax - arrow_size, y + arrow_size)],
                     fill=block_color)
         # Right arrow (out of MCP)
         ax = right_x - 70
-        draw.polygon([(ax, y), (ax - arrow_size, y - arrow_size), (ax - arrow_size, y + arrow_size)],
+        scene.polygon([(ax, y), (ax - arrow_size, y - arrow_size), (ax - arrow_size, y + arrow_size)],
                     fill=cyan)
 
     # Labels
     # These would need a font, so we'll use simple shapes
     # "SENSITIVE" label area
-    draw.rectangle([left_x - 50, height - 60, left_x + 50, height - 40],
+    scene.rectangle([left_x - 50, height - 60, left_x + 50, height - 40],
                   outline=block_color, width=1)
 
     # "PROTECTED" label area
-    draw.rectangle([right_x - 50, height - 60, right_x + 50, height - 40],
+    scene.rectangle([right_x - 50, height - 60, right_x + 50, height - 40],
                   outline=cyan, width=1)
 
     # "MCP SERVER" label
-    draw.rectangle([mcp_x - 60, height - 60, mcp_x + 60, height - 40],
+    scene.rectangle([mcp_x - 60, height - 60, mcp_x + 60, height - 40],
                   outline=green, width=1)
 
-    img.save(os.path.join(output_dir, 'hero-graphic.png'), 'PNG')
+    return scene
+
+def hero_scene(width=1200, height=600, phase=0):
+    """Hero graphic with data flow visualization."""
+    scene = hero_base_scene(width, height)
+    scene.items += hero_flow_scene(width, height, phase).items
+    scene.items += hero_overlay_scene(width, height).items
+    return scene
+
+@themed
+def create_hero_graphic(output_dir, width=1200, height=600):
+    """Create hero graphic with data flow visualization."""
+    img = rasterize(hero_scene(width, height))
+    save_image(img, os.path.join(output_dir, 'hero-graphic.png'))
     print(f"Created hero graphic: hero-graphic.png")
 
+@themed
+def create_hero_animation(output_dir, width=1200, height=600, frames=60, cycles=3, duration=40):
+    """Animated hero: the flow dashes move at cycles dash periods per frames frames.
+
+    The dashes repeat every HERO_DASH_PERIOD px, so one period loops
+    seamlessly; steps are rounded to whole pixels and only that period's
+    distinct frames are rendered and encoded.
+    """
+    base, overlay = hero_base_scene(width, height), hero_overlay_scene(width, height)
+    step = max(1, round(HERO_DASH_PERIOD * cycles / frames))
+    count = HERO_DASH_PERIOD // math.gcd(HERO_DASH_PERIOD, step)
+    images = list(layered_frames(base, lambda i: hero_flow_scene(width, height, i * step),
+                                 overlay, count))
+    for ext in available_extensions():
+        save_animation(images, os.path.join(output_dir, f'hero-graphic-animated{ext}'), duration)
+    print(f"Created animated hero: {count} frames, {', '.join(available_extensions())}")
+
+@themed
 def create_pattern_tile(output_dir, size=100):
     """Create repeating pattern tile for backgrounds."""
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    # Dot grid pattern, wrapped at the edges so the tile repeats seamlessly
+    dot_color = rgba('matrix_gray', 80)
+    img = tiled(dot_tile(20, 2, dot_color), size, size)
 
-    # Dot grid pattern
-    dot_color = (*hex_to_rgb(COLORS['matrix_gray']), 80)
-    spacing = 20
-    dot_r = 2
+    save_image(img, os.path.join(output_dir, 'pattern-tile.png'))
+    print(f"Created pattern tile: pattern-tile.png")
 
-    for x in range(0, size, spacing):
-        for y in range(0, size, spacing):
-            draw.ellipse([x - dot_r, y - dot_r, x + dot_r, y + dot_r], fill=dot_color)
+def entity_icon_scene(name, size=80):
+    """Entity type icon."""
+    scene = Scene(size, size)
 
-    img.save(os.path.join(output_dir, 'pattern-tile.png'), 'PNG')
-    print(f"Created pattern tile: pattern-tile.png")
+    center = size // 2
+    cyan = rgb('electric_cyan')
+
+    # Background circle
+    bg_r = size // 2 - 4
+    scene.ellipse([center - bg_r, center - bg_r, center + bg_r, center + bg_r],
+                  fill=rgba('terminal_dark', 200),
+                  outline=cyan, width=1)
 
+    # Simple geometric representation
+    if name == 'person':
+        # Head
+        scene.ellipse([center - 8, center - 20, center + 8, center - 4], outline=cyan, width=2)
+        # Body
+        scene.arc([center - 15, center - 5, center + 15, center + 25], 0, 180, fill=cyan, width=2)
+    elif name == 'email':
+        # Envelope
+        scene.rectangle([center - 18, center - 10, center + 18, center + 12], outline=cyan, width=2)
+        scene.line([(center - 18, center - 10), (center, center + 5), (center + 18, center - 10)], fill=cyan, width=2)
+    elif name == 'phone':
+        # Phone
+        scene.rounded_rectangle([center - 10, center - 18, center + 10, center + 18], radius=3, outline=cyan, width=2)
+        scene.line([(center - 5, center + 12), (center + 5, center + 12)], fill=cyan, width=2)
+    elif name == 'location':
+        # Pin
+        scene.ellipse([center - 8, center - 15, center + 8, center + 1], outline=cyan, width=2)
+        scene.polygon([(center - 8, center - 2), (center, center + 18), (center + 8, center - 2)], outline=cyan, width=2)
+    elif name == 'id-card':
+        # Card
+        scene.rounded_rectangle([center - 20, center - 12, center + 20, center + 12], radius=2, outline=cyan, width=2)
+        scene.line([(center - 15, center - 5), (center - 5, center - 5)], fill=cyan, width=2)
+        scene.line([(center - 15, center + 2), (center + 10, center + 2)], fill=cyan, width=2)
+        scene.line([(center - 15, center + 7), (center + 5, center + 7)], fill=cyan, width=2)
+    elif name == 'credit-card':
+        scene.rounded_rectangle([center - 22, center - 14, center + 22, center + 14], radius=2, outline=cyan, width=2)
+        scene.line([(center - 22, center - 6), (center + 22, center - 6)], fill=cyan, width=2)
+        scene.rectangle([center - 18, center + 2, center - 8, center + 8], outline=cyan, width=1)
+    elif name == 'code':
+        # Brackets
+        scene.line([(center - 12, center - 12), (center - 18, center - 12)], fill=cyan, width=2)
+        scene.line([(center - 18, center - 12), (center - 18, center + 12)], fill=cyan, width=2)
+        scene.line([(center - 12, center + 12), (center - 18, center + 12)], fill=cyan, width=2)
+        scene.line([(center + 12, center - 12), (center + 18, center - 12)], fill=cyan, width=2)
+        scene.line([(center + 18, center - 12), (center + 18, center + 12)], fill=cyan, width=2)
+        scene.line([(center + 12, center + 12), (center + 18, center + 12)], fill=cyan, width=2)
+
+    return scene
+
+@themed
 def create_entity_icons(output_dir, size=80):
-    """Create entity type icons."""
-    entities = [
-        ('person', 'User silhouette'),
-        ('email', 'Envelope'),
-        ('phone', 'Phone'),
-        ('location', 'Pin'),
-        ('id-card', 'Card'),
-        ('credit-card', 'Payment card'),
-        ('code', 'Code brackets'),
-    ]
+    """Create entity type icons at 1x and 2x."""
+    for name, _ in ENTITIES:
+        icons = derive_sizes(rasterize(entity_icon_scene(name, size), SUPERSAMPLE), [size, 2 * size])
+        save_image(icons[size], os.path.join(output_dir, f'entity-{name}.png'))
+        save_image(icons[2 * size], os.path.join(output_dir, f'entity-{name}@2x.png'))
 
-    for name, _ in entities:
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-
-        center = size // 2
-        cyan = hex_to_rgb(COLORS['electric_cyan'])
-
-        # Background circle
-        bg_r = size // 2 - 4
-        draw.ellipse([center - bg_r, center - bg_r, center + bg_r, center + bg_r],
-                    fill=(*hex_to_rgb(COLORS['terminal_dark']), 200),
-                    outline=cyan, width=1)
-
-        # Simple geometric representation
-        if name == 'person':
-            # Head
-            draw.ellipse([center - 8, center - 20, center + 8, center - 4], outline=cyan, width=2)
-            # Body
-            draw.arc([center - 15, center - 5, center + 15, center + 25], 0, 180, fill=cyan, width=2)
-        elif name == 'email':
-            # Envelope
-            draw.rectangle([center - 18, center - 10, center + 18, center + 12], outline=cyan, width=2)
-            draw.line([(center - 18, center - 10), (center, center + 5), (center + 18, center - 10)], fill=cyan, width=2)
-        elif name == 'phone':
-            # Phone
-            draw.rounded_rectangle([center - 10, center - 18, center + 10, center + 18], radius=3, outline=cyan, width=2)
-            draw.line([(center - 5, center + 12), (center + 5, center + 12)], fill=cyan, width=2)
-        elif name == 'location':
-            # Pin
-            draw.ellipse([center - 8, center - 15, center + 8, center + 1], outline=cyan, width=2)
-            draw.polygon([(center - 8, center - 2), (center, center + 18), (center + 8, center - 2)], outline=cyan, width=2)
-        elif name == 'id-card':
-            # Card
-            draw.rounded_rectangle([center - 20, center - 12, center + 20, center + 12], radius=2, outline=cyan, width=2)
-            draw.line([(center - 15, center - 5), (center - 5, center - 5)], fill=cyan, width=2)
-            draw.line([(center - 15, center + 2), (center + 10, center + 2)], fill=cyan, width=2)
-            draw.line([(center - 15, center + 7), (center + 5, center + 7)], fill=cyan, width=2)
-        elif name == 'credit-card':
-            draw.rounded_rectangle([center - 22, center - 14, center + 22, center + 14], radius=2, outline=cyan, width=2)
-            draw.line([(center - 22, center - 6), (center + 22, center - 6)], fill=cyan, width=2)
-            draw.rectangle([center - 18, center + 2, center - 8, center + 8], outline=cyan, width=1)
-        elif name == 'code':
-            # Brackets
-            draw.line([(center - 12, center - 12), (center - 18, center - 12)], fill=cyan, width=2)
-            draw.line([(center - 18, center - 12), (center - 18, center + 12)], fill=cyan, width=2)
-            draw.line([(center - 12, center + 12), (center - 18, center + 12)], fill=cyan, width=2)
-            draw.line([(center + 12, center - 12), (center + 18, center - 12)], fill=cyan, width=2)
-            draw.line([(center + 18, center - 12), (center + 18, center + 12)], fill=cyan, width=2)
-            draw.line([(center + 12, center + 12), (center + 18, center + 12)], fill=cyan, width=2)
-
-        img.save(os.path.join(output_dir, f'entity-{name}.png'), 'PNG')
-
-    print(f"Created entity icons: {len(entities)} icons")
+    print(f"Created entity icons: {len(ENTITIES)} icons")
 
+def feature_icon_scene(name, size=100):
+    """Feature icon."""
+    scene = Scene(size, size)
+
+    center = size // 2
+    cyan = rgb('electric_cyan')
+    green = rgb('terminal_green')
+
+    if name == 'shield':
+        points = [
+            (center, center - 35),
+            (center + 30, center - 20),
+            (center + 30, center + 10),
+            (center, center + 35),
+            (center - 30, center + 10),
+            (center - 30, center - 20),
+        ]
+        scene.polygon(points, outline=green, width=3)
+        # Checkmark
+        scene.line([(center - 12, center), (center - 2, center + 10), (center + 15, center - 12)], fill=green, width=3)
+    elif name == 'lock':
+        # Lock body
+        scene.rounded_rectangle([center - 18, center - 5, center + 18, center + 25], radius=3, outline=cyan, width=2)
+        # Lock shackle
+        scene.arc([center - 12, center - 25, center + 12, center], 0, 180, fill=cyan, width=2)
+        scene.line([(center - 12, center - 12), (center - 12, center - 5)], fill=cyan, width=2)
+        scene.line([(center + 12, center - 12), (center + 12, center - 5)], fill=cyan, width=2)
+    elif name == 'globe':
+        r = 28
+        scene.ellipse([center - r, center - r, center + r, center + r], outline=cyan, width=2)
+        scene.ellipse([center - r//2, center - r, center + r//2, center + r], outline=cyan, width=1)
+        scene.line([(center - r, center), (center + r, center)], fill=cyan, width=1)
+        scene.arc([center - r, center - r//2, center + r, center + r//2 + r], 200, 340, fill=cyan, width=1)
+    elif name == 'speed':
+        # Speedometer
+        r = 28
+        scene.arc([center - r, center - r, center + r, center + r], 135, 405, fill=cyan, width=3)
+        # Needle
+        scene.line([(center, center), (center + 15, center - 20)], fill=green, width=3)
+        scene.ellipse([center - 5, center - 5, center + 5, center + 5], fill=cyan)
+    elif name == 'terminal':
+        # Terminal window
+        scene.rounded_rectangle([center - 30, center - 22, center + 30, center + 22], radius=4, outline=cyan, width=2)
+        # Title bar
+        scene.line([(center - 30, center - 14), (center + 30, center - 14)], fill=cyan, width=1)
+        # Traffic lights
+        colors = ['hot_coral', 'neon_magenta', 'terminal_green']
+        for i, c in enumerate(colors):
+            scene.ellipse([center - 24 + i * 10, center - 20, center - 18 + i * 10, center - 14], fill=rgb(c))
+        # Prompt
+        scene.line([(center - 22, center - 2), (center - 12, center - 2)], fill=green, width=2)
+        scene.line([(center - 22, center + 8), (center + 15, center + 8)], fill=cyan, width=2)
+
+    return scene
+
+@themed
 def create_feature_icons(output_dir, size=100):
-    """Create feature icons."""
-    features = ['shield', 'lock', 'globe', 'speed', 'terminal']
-
-    for name in features:
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-
-        center = size // 2
-        cyan = hex_to_rgb(COLORS['electric_cyan'])
-        green = hex_to_rgb(COLORS['terminal_green'])
-
-        if name == 'shield':
-            points = [
-                (center, center - 35),
-                (center + 30, center - 20),
-                (center + 30, center + 10),
-                (center, center + 35),
-                (center - 30, center + 10),
-                (center - 30, center - 20),
-            ]
-            draw.polygon(points, outline=green, width=3)
-            # Checkmark
-            draw.line([(center - 12, center), (center - 2, center + 10), (center + 15, center - 12)], fill=green, width=3)
-        elif name == 'lock':
-            # Lock body
-            draw.rounded_rectangle([center - 18, center - 5, center + 18, center + 25], radius=3, outline=cyan, width=2)
-            # Lock shackle
-            draw.arc([center - 12, center - 25, center + 12, center], 0, 180, fill=cyan, width=2)
-            draw.line([(center - 12, center - 12), (center - 12, center - 5)], fill=cyan, width=2)
-            draw.line([(center + 12, center - 12), (center + 12, center - 5)], fill=cyan, width=2)
-        elif name == 'globe':
-            r = 28
-            draw.ellipse([center - r, center - r, center + r, center + r], outline=cyan, width=2)
-            draw.ellipse([center - r//2, center - r, center + r//2, center + r], outline=cyan, width=1)
-            draw.line([(center - r, center), (center + r, center)], fill=cyan, width=1)
-            draw.arc([center - r, center - r//2, center + r, center + r//2 + r], 200, 340, fill=cyan, width=1)
-        elif name == 'speed':
-            # Speedometer
-            r = 28
-            draw.arc([center - r, center - r, center + r, center + r], 135, 405, fill=cyan, width=3)
-            # Needle
-            draw.line([(center, center), (center + 15, center - 20)], fill=green, width=3)
-            draw.ellipse([center - 5, center - 5, center + 5, center + 5], fill=cyan)
-        elif name == 'terminal':
-            # Terminal window
-            draw.rounded_rectangle([center - 30, center - 22, center + 30, center + 22], radius=4, outline=cyan, width=2)
-            # Title bar
-            draw.line([(center - 30, center - 14), (center + 30, center - 14)], fill=cyan, width=1)
-            # Traffic lights
-            colors = [COLORS['hot_coral'], COLORS['neon_magenta'], COLORS['terminal_green']]
-            for i, c in enumerate(colors):
-                draw.ellipse([center - 24 + i * 10, center - 20, center - 18 + i * 10, center - 14], fill=hex_to_rgb(c))
-            # Prompt
-            draw.line([(center - 22, center - 2), (center - 12, center - 2)], fill=green, width=2)
-            draw.line([(center - 22, center + 8), (center + 15, center + 8)], fill=cyan, width=2)
-
-        img.save(os.path.join(output_dir, f'icon-{name}.png'), 'PNG')
-
-    print(f"Created feature icons: {len(features)} icons")
+    """Create feature icons at 1x and 2x."""
+    for name in FEATURES:
+        icons = derive_sizes(rasterize(feature_icon_scene(name, size), SUPERSAMPLE), [size, 2 * size])
+        save_image(icons[size], os.path.join(output_dir, f'icon-{name}.png'))
+        save_image(icons[2 * size], os.path.join(output_dir, f'icon-{name}@2x.png'))
+
+    print(f"Created feature icons: {len(FEATURES)} icons")
+
+SCENES = {
+    'logo': logo_scene,
+    'favicon': favicon_scene,
+    'hero-graphic': hero_scene,
+    **{f'icon-{name}': partial(product_icon_scene, icon_type) for name, icon_type in PRODUCT_ICONS},
+    **{f'entity-{name}': partial(entity_icon_scene, name) for name, _ in ENTITIES},
+    **{f'icon-{name}': partial(feature_icon_scene, name) for name in FEATURES},
+}
+
+def build_tasks(output_dir):
+    """Independent renderer calls that make up the brand asset set."""
+    def out(*names):
+        return [os.path.join(output_dir, name) for name in names]
+
+    return [
+        task('logo', create_logo, output_dir,
+             outputs=out('logo-anonymize-dev.png', 'logo-anonymize-dev.pdf')),
+        task('favicon', create_favicon, output_dir,
+             outputs=out(*[f'favicon-{size}.png' for size in FAVICON_SIZES],
+                         'favicon.ico', 'favicon.svg', 'apple-touch-icon.png')),
+    ] + [
+        task(f'icon-{name}', create_product_icon, output_dir, name, icon_type,
+             outputs=out(f'icon-{name}.png'))
+        for name, icon_type in PRODUCT_ICONS
+    ] + [
+        task('hero-graphic', create_hero_graphic, output_dir, outputs=out('hero-graphic.png')),
+        task('hero-animation', create_hero_animation, output_dir,
+             outputs=out(*[f'hero-graphic-animated{ext}' for ext in available_extensions()])),
+        task('pattern-tile', create_pattern_tile, output_dir, outputs=out('pattern-tile.png')),
+        task('entity-icons', create_entity_icons, output_dir,
+             outputs=out(*[f'entity-{name}{s}.png' for name, _ in ENTITIES for s in ('', '@2x')])),
+        task('feature-icons', create_feature_icons, output_dir,
+             outputs=out(*[f'icon-{name}{s}.png' for name in FEATURES for s in ('', '@2x')])),
+        # Sprite sheets are rebuilt only when a member icon task reruns
+        task('entity-atlas', create_atlas, output_dir, 'entity-icons',
+             {name: out(f'entity-{name}.png', f'entity-{name}@2x.png') for name, _ in ENTITIES},
+             deps=['entity-icons'], outputs=atlas_outputs(output_dir, 'entity-icons')),
+        task('feature-atlas', create_atlas, output_dir, 'feature-icons',
+             {name: out(f'icon-{name}.png', f'icon-{name}@2x.png') for name in FEATURES},
+             deps=['feature-icons'], outputs=atlas_outputs(output_dir, 'feature-icons')),
+    ]
 
 def main():
     # Create output directory
@@ -570,17 +657,8 @@ def main():
     print("Generating Anonymize.dev brand assets...")
     print("=" * 50)
 
-    # Generate all assets
-    create_logo(output_dir)
-    create_favicon(output_dir)
-    create_product_icon(output_dir, 'mcp-server', 'mcp')
-    create_product_icon(output_dir, 'desktop-app', 'desktop')
-    create_product_icon(output_dir, 'office-addin', 'office')
-    create_product_icon(output_dir, 'api', 'api')
-    create_hero_graphic(output_dir)
-    create_pattern_tile(output_dir)
-    create_entity_icons(output_dir)
-    create_feature_icons(output_dir)
+    for t in build_tasks(output_dir):
+        t.func(*t.args, **t.kwargs)
 
     print("=" * 50)
     print("Brand assets generated successfully!")
@@ -5,292 +5,215 @@ Neon Protocol Theme - Social Media & Marketing Assets
 """
 
 import os
-from PIL import Image, ImageDraw, ImageFont
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.colors import HexColor
-
-# Neon Protocol Colors
-COLORS = {
-    'void_black': '#0a0a0f',
-    'terminal_dark': '#12121a',
-    'matrix_gray': '#1e1e2e',
-    'syntax_slate': '#6b7280',
-    'electric_cyan': '#00ffff',
-    'neon_magenta': '#ff00ff',
-    'terminal_green': '#00ff41',
-    'pulse_blue': '#0080ff',
-    'hot_coral': '#ff3366',
-    'pure_white': '#ffffff',
-    'ghost_white': '#e5e5e5',
-}
 
-def hex_to_rgb(hex_color):
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
-def create_gradient_bg(width, height):
-    """Create dark gradient background."""
-    img = Image.new('RGB', (width, height), hex_to_rgb(COLORS['void_black']))
-    draw = ImageDraw.Draw(img)
-
-    # Add subtle grid
-    grid_color = hex_to_rgb(COLORS['matrix_gray'])
-    for x in range(0, width, 40):
-        draw.line([(x, 0), (x, height)], fill=(*grid_color, 50), width=1)
-    for y in range(0, height, 40):
-        draw.line([(0, y), (width, y)], fill=(*grid_color, 50), width=1)
-
-    return img
-
-def add_glow_text(draw, text, pos, font, color, glow_color=None):
-    """Draw text with neon glow effect."""
-    if glow_color is None:
-        glow_color = color
-    x, y = pos
-
-    # Glow layers
-    glow_rgb = hex_to_rgb(glow_color) if isinstance(glow_color, str) else glow_color
-    for offset in range(5, 0, -1):
-        alpha = int(40 - offset * 6)
-        glow = (*glow_rgb, alpha)
-        for dx in range(-offset, offset + 1):
-            for dy in range(-offset, offset + 1):
-                try:
-                    draw.text((x + dx, y + dy), text, font=font, fill=glow)
-                except:
-                    pass
-
-    # Main text
-    text_color = hex_to_rgb(color) if isinstance(color, str) else color
-    draw.text((x, y), text, font=font, fill=text_color)
+from encoders import save_image
+from layout import fit_block, fit_size, place_block, place_text
+from scene import Scene, rasterize
+from taskgraph import task
+from theme import palette, rgb, themed
+from templates import TEMPLATE_DIR, load_rows, load_spec, output_name, render_batch, render_to_file
 
-def create_linkedin_post(output_dir):
-    """Create LinkedIn post graphic (1200x627)."""
+# Smallest size auto-fit text may shrink to
+MIN_TEXT_SIZE = 20
+
+def marketing_scene(width, height):
+    """Dark background with the subtle 40px grid."""
+    return Scene(width, height, background=rgb('void_black'),
+                 grid=(40, rgb('matrix_gray')))
+
+def save_scene(scene, output_dir, name):
+    save_image(rasterize(scene), os.path.join(output_dir, name))
+    print(f"Created: {name} ({scene.width}x{scene.height})")
+
+def linkedin_scene(title="Privacy-as-Code", subtitle="Protect data in your AI workflows"):
+    """LinkedIn post graphic (1200x627)."""
     width, height = 1200, 627
-    img = create_gradient_bg(width, height)
-    draw = ImageDraw.Draw(img)
-
-    # Load fonts (fallback to default if not available)
-    try:
-        font_large = ImageFont.truetype("arial.ttf", 56)
-        font_medium = ImageFont.truetype("arial.ttf", 32)
-        font_small = ImageFont.truetype("arial.ttf", 24)
-    except:
-        font_large = ImageFont.load_default()
-        font_medium = font_large
-        font_small = font_large
+    scene = marketing_scene(width, height)
+    # Text column ends short of the decorative box on the right
+    text_width = width - 300 - 60 - 30
 
     # Title
-    title = "Privacy-as-Code"
-    add_glow_text(draw, title, (60, 180), font_large, COLORS['electric_cyan'])
+    scene.glow_text((60, 180), title, fit_size(title, text_width, 56, MIN_TEXT_SIZE), rgb('electric_cyan'))
 
-    # Subtitle
-    subtitle = "Protect data in your AI workflows"
-    draw.text((60, 260), subtitle, font=font_medium, fill=hex_to_rgb(COLORS['ghost_white']))
+    # Subtitle, wrapped above the feature list
+    size, lines = fit_block(subtitle, text_width, 70, 32, MIN_TEXT_SIZE)
+    place_block(scene, (60, 260), lines, size, rgb('ghost_white'))
 
     # Features
     features = ["MCP Server for Claude & Cursor", "50+ Entity Types", "48 Languages"]
     y = 340
     for feature in features:
-        draw.text((80, y), ">" + feature, font=font_small, fill=hex_to_rgb(COLORS['terminal_green']))
+        scene.text((80, y), ">" + feature, 24, rgb('terminal_green'))
         y += 40
 
     # URL
-    draw.text((60, height - 80), "anonymize.dev", font=font_medium, fill=hex_to_rgb(COLORS['neon_magenta']))
+    scene.text((60, height - 80), "anonymize.dev", 32, rgb('neon_magenta'))
 
     # Decorative elements
-    cyan = hex_to_rgb(COLORS['electric_cyan'])
-    draw.rectangle([width - 300, 100, width - 60, 500], outline=cyan, width=2)
-    draw.text((width - 280, 120), "MCP", font=font_large, fill=cyan)
-    draw.text((width - 280, 200), "Server", font=font_medium, fill=hex_to_rgb(COLORS['terminal_green']))
+    cyan = rgb('electric_cyan')
+    scene.rectangle([width - 300, 100, width - 60, 500], outline=cyan, width=2)
+    scene.text((width - 280, 120), "MCP", 56, cyan)
+    scene.text((width - 280, 200), "Server", 32, rgb('terminal_green'))
+    return scene
 
-    img.save(os.path.join(output_dir, 'linkedin-post.png'), 'PNG')
-    print("Created: linkedin-post.png (1200x627)")
+@themed
+def create_linkedin_post(output_dir):
+    """Create LinkedIn post graphic (1200x627)."""
+    save_scene(linkedin_scene(), output_dir, 'linkedin-post.png')
 
-def create_twitter_post(output_dir):
-    """Create Twitter/X post graphic (1200x675)."""
+def twitter_scene(title="Privacy-as-Code", subtitle="MCP Server for AI workflows"):
+    """Twitter/X post graphic (1200x675)."""
     width, height = 1200, 675
-    img = create_gradient_bg(width, height)
-    draw = ImageDraw.Draw(img)
-
-    try:
-        font_large = ImageFont.truetype("arial.ttf", 64)
-        font_medium = ImageFont.truetype("arial.ttf", 36)
-    except:
-        font_large = ImageFont.load_default()
-        font_medium = font_large
+    scene = marketing_scene(width, height)
 
-    # Centered layout
-    title = "Privacy-as-Code"
-    subtitle = "MCP Server for AI workflows"
-    url = "anonymize.dev"
-
-    # Title with glow
-    add_glow_text(draw, title, (width // 2 - 280, height // 2 - 80), font_large, COLORS['electric_cyan'])
+    # Title with glow, centered between the corner decorations
+    center, text_width = width // 2, width - 2 * 140
+    place_text(scene, (center, height // 2 - 80), title, fit_size(title, text_width, 64, MIN_TEXT_SIZE),
+               rgb('electric_cyan'), align='center', glow=True)
 
     # Subtitle
-    draw.text((width // 2 - 220, height // 2 + 20), subtitle, font=font_medium, fill=hex_to_rgb(COLORS['ghost_white']))
+    place_text(scene, (center, height // 2 + 20), subtitle,
+               fit_size(subtitle, text_width, 36, MIN_TEXT_SIZE), rgb('ghost_white'), align='center')
 
     # URL with magenta accent
-    draw.text((width // 2 - 120, height - 100), url, font=font_medium, fill=hex_to_rgb(COLORS['neon_magenta']))
+    place_text(scene, (center, height - 100), "anonymize.dev", 36, rgb('neon_magenta'), align='center')
 
     # Corner decorations
-    green = hex_to_rgb(COLORS['terminal_green'])
-    draw.line([(40, 40), (40, 120)], fill=green, width=3)
-    draw.line([(40, 40), (120, 40)], fill=green, width=3)
-    draw.line([(width - 40, height - 40), (width - 40, height - 120)], fill=green, width=3)
-    draw.line([(width - 40, height - 40), (width - 120, height - 40)], fill=green, width=3)
-
-    img.save(os.path.join(output_dir, 'twitter-post.png'), 'PNG')
-    print("Created: twitter-post.png (1200x675)")
+    green = rgb('terminal_green')
+    scene.line([(40, 40), (40, 120)], fill=green, width=3)
+    scene.line([(40, 40), (120, 40)], fill=green, width=3)
+    scene.line([(width - 40, height - 40), (width - 40, height - 120)], fill=green, width=3)
+    scene.line([(width - 40, height - 40), (width - 120, height - 40)], fill=green, width=3)
+    return scene
+
+@themed
+def create_twitter_post(output_dir):
+    """Create Twitter/X post graphic (1200x675)."""
+    save_scene(twitter_scene(), output_dir, 'twitter-post.png')
 
-def create_instagram_square(output_dir):
-    """Create Instagram square (1080x1080)."""
+def instagram_scene():
+    """Instagram square (1080x1080)."""
     size = 1080
-    img = create_gradient_bg(size, size)
-    draw = ImageDraw.Draw(img)
-
-    try:
-        font_large = ImageFont.truetype("arial.ttf", 72)
-        font_medium = ImageFont.truetype("arial.ttf", 40)
-        font_small = ImageFont.truetype("arial.ttf", 28)
-    except:
-        font_large = ImageFont.load_default()
-        font_medium = font_large
-        font_small = font_large
+    scene = marketing_scene(size, size)
 
     # Large "A" logo in center
-    cyan = hex_to_rgb(COLORS['electric_cyan'])
+    cyan = rgb('electric_cyan')
     center = size // 2
 
-    # Draw concentric circles
+    # Concentric glow rings, brightest outside
     for r in range(200, 50, -30):
-        alpha = int(100 - (200 - r) * 0.4)
-        draw.ellipse([center - r, center - r - 50, center + r, center + r - 50],
-                    outline=(*cyan, alpha), width=2)
+        opacity = (100 - (200 - r) * 0.4) / 100
+        scene.halo('ring', cyan, spread=12, strength=0.35 * opacity, inner=opacity,
+                   center=(center, center - 50), radius=r - 1, width=2)
 
     # Title below
-    add_glow_text(draw, "Privacy-as-Code", (center - 280, center + 180), font_large, COLORS['electric_cyan'])
+    place_text(scene, (center, center + 180), "Privacy-as-Code", 72, cyan, align='center', glow=True)
 
     # Tagline
-    draw.text((center - 260, center + 280), "Protect your AI workflows", font=font_medium, fill=hex_to_rgb(COLORS['ghost_white']))
+    place_text(scene, (center, center + 280), "Protect your AI workflows", 40, rgb('ghost_white'),
+               align='center')
 
     # URL
-    draw.text((center - 120, size - 100), "anonymize.dev", font=font_medium, fill=hex_to_rgb(COLORS['neon_magenta']))
+    place_text(scene, (center, size - 100), "anonymize.dev", 40, rgb('neon_magenta'), align='center')
+    return scene
 
-    img.save(os.path.join(output_dir, 'instagram-square.png'), 'PNG')
-    print("Created: instagram-square.png (1080x1080)")
+@themed
+def create_instagram_square(output_dir):
+    """Create Instagram square (1080x1080)."""
+    save_scene(instagram_scene(), output_dir, 'instagram-square.png')
 
-def create_web_banner(output_dir):
-    """Create web banner (1920x400)."""
+def web_banner_scene():
+    """Web banner (1920x400)."""
     width, height = 1920, 400
-    img = create_gradient_bg(width, height)
-    draw = ImageDraw.Draw(img)
-
-    try:
-        font_large = ImageFont.truetype("arial.ttf", 64)
-        font_medium = ImageFont.truetype("arial.ttf", 32)
-    except:
-        font_large = ImageFont.load_default()
-        font_medium = font_large
+    scene = marketing_scene(width, height)
 
     # Title
-    add_glow_text(draw, "Privacy-as-Code", (100, 120), font_large, COLORS['electric_cyan'])
+    scene.glow_text((100, 120), "Privacy-as-Code", 64, rgb('electric_cyan'))
 
     # Subtitle
-    draw.text((100, 210), "MCP Server | Desktop App | Office Add-in", font=font_medium, fill=hex_to_rgb(COLORS['ghost_white']))
+    scene.text((100, 210), "MCP Server | Desktop App | Office Add-in", 32, rgb('ghost_white'))
 
     # Right side: decorative terminal
     terminal_x = width - 600
-    draw.rectangle([terminal_x, 80, width - 80, height - 80], outline=hex_to_rgb(COLORS['matrix_gray']), width=2)
-    draw.rectangle([terminal_x, 80, width - 80, 120], fill=hex_to_rgb(COLORS['matrix_gray']))
-
-    # Terminal content
-    green = hex_to_rgb(COLORS['terminal_green'])
-    draw.text((terminal_x + 20, 140), "$ npx @anonym-legal/mcp-server", font=font_medium, fill=green)
-    draw.text((terminal_x + 20, 190), "> PII protection enabled", font=font_medium, fill=hex_to_rgb(COLORS['electric_cyan']))
-    draw.text((terminal_x + 20, 240), "> 50+ entity types active", font=font_medium, fill=hex_to_rgb(COLORS['syntax_slate']))
-
-    img.save(os.path.join(output_dir, 'web-banner.png'), 'PNG')
-    print("Created: web-banner.png (1920x400)")
+    scene.rectangle([terminal_x, 80, width - 80, height - 80], outline=rgb('matrix_gray'), width=2)
+    scene.rectangle([terminal_x, 80, width - 80, 120], fill=rgb('matrix_gray'))
+
+    # Terminal content, one size for every line so the longest fits inside the frame
+    lines = [("$ npx @anonym-legal/mcp-server", rgb('terminal_green')),
+             ("> PII protection enabled", rgb('electric_cyan')),
+             ("> 50+ entity types active", rgb('syntax_slate'))]
+    size = min(fit_size(text, width - 80 - terminal_x - 40, 32, MIN_TEXT_SIZE) for text, _ in lines)
+    for i, (text, color) in enumerate(lines):
+        scene.text((terminal_x + 20, 140 + 50 * i), text, size, color)
+    return scene
+
+@themed
+def create_web_banner(output_dir):
+    """Create web banner (1920x400)."""
+    save_scene(web_banner_scene(), output_dir, 'web-banner.png')
 
-def create_email_banner(output_dir):
-    """Create email banner (600x200)."""
+def email_banner_scene():
+    """Email banner (600x200)."""
     width, height = 600, 200
-    img = create_gradient_bg(width, height)
-    draw = ImageDraw.Draw(img)
-
-    try:
-        font_large = ImageFont.truetype("arial.ttf", 36)
-        font_medium = ImageFont.truetype("arial.ttf", 20)
-    except:
-        font_large = ImageFont.load_default()
-        font_medium = font_large
+    scene = marketing_scene(width, height)
 
     # Title
-    add_glow_text(draw, "Anonymize.dev", (40, 50), font_large, COLORS['electric_cyan'])
+    scene.glow_text((40, 50), "Anonymize.dev", 36, rgb('electric_cyan'))
 
     # Subtitle
-    draw.text((40, 110), "Privacy-as-Code for Developers", font=font_medium, fill=hex_to_rgb(COLORS['ghost_white']))
+    scene.text((40, 110), "Privacy-as-Code for Developers", 20, rgb('ghost_white'))
 
     # Decorative line
-    draw.line([(40, 160), (width - 40, 160)], fill=hex_to_rgb(COLORS['terminal_green']), width=2)
+    scene.line([(40, 160), (width - 40, 160)], fill=rgb('terminal_green'), width=2)
+    return scene
+
+@themed
+def create_email_banner(output_dir):
+    """Create email banner (600x200)."""
+    save_scene(email_banner_scene(), output_dir, 'email-banner.png')
+
+SCENES = {
+    'linkedin-post': linkedin_scene,
+    'twitter-post': twitter_scene,
+    'instagram-square': instagram_scene,
+    'web-banner': web_banner_scene,
+    'email-banner': email_banner_scene,
+}
+
+PRODUCT_CARD_TEMPLATE = os.path.join(TEMPLATE_DIR, 'product-card.json')
+PRODUCT_CARD_ROWS = os.path.join(TEMPLATE_DIR, 'product-cards.json')
 
-    img.save(os.path.join(output_dir, 'email-banner.png'), 'PNG')
-    print("Created: email-banner.png (600x200)")
+@themed
+def create_product_card(output_dir, row, template=PRODUCT_CARD_TEMPLATE):
+    """Create one product marketing card (400x500) from the card template."""
+    render_to_file(template, row, output_dir, palette().hex)
 
+@themed
 def create_product_cards(output_dir):
     """Create product marketing cards (400x500 each)."""
-    width, height = 400, 500
-
-    products = [
-        ('mcp-server', 'MCP Server', 'AI Privacy Shield', COLORS['terminal_green']),
-        ('desktop-app', 'Desktop App', 'Bulk Processing', COLORS['electric_cyan']),
-        ('office-add-in', 'Office Add-in', 'In-app Protection', COLORS['neon_magenta']),
+    rows = load_rows(PRODUCT_CARD_ROWS)
+    render_batch(PRODUCT_CARD_TEMPLATE, rows, output_dir, palette().hex)
+
+    print(f"Created: {len(rows)} product cards (400x500)")
+
+def build_tasks(output_dir):
+    """Independent renderer calls that make up the marketing set."""
+    def out(name):
+        return [os.path.join(output_dir, name)]
+
+    card_spec = load_spec(PRODUCT_CARD_TEMPLATE)
+    return [
+        task('linkedin-post', create_linkedin_post, output_dir, outputs=out('linkedin-post.png')),
+        task('twitter-post', create_twitter_post, output_dir, outputs=out('twitter-post.png')),
+        task('instagram-square', create_instagram_square, output_dir, outputs=out('instagram-square.png')),
+        task('web-banner', create_web_banner, output_dir, outputs=out('web-banner.png')),
+        task('email-banner', create_email_banner, output_dir, outputs=out('email-banner.png')),
+    ] + [
+        task(f'card-{row["id"]}', create_product_card, output_dir, row, PRODUCT_CARD_TEMPLATE,
+             outputs=out(output_name(card_spec, row)))
+        for row in load_rows(PRODUCT_CARD_ROWS)
     ]
 
-    try:
-        font_large = ImageFont.truetype("arial.ttf", 36)
-        font_medium = ImageFont.truetype("arial.ttf", 24)
-    except:
-        font_large = ImageFont.load_default()
-        font_medium = font_large
-
-    for product_id, title, subtitle, accent in products:
-        img = create_gradient_bg(width, height)
-        draw = ImageDraw.Draw(img)
-
-        # Border
-        accent_rgb = hex_to_rgb(accent)
-        draw.rectangle([10, 10, width - 10, height - 10], outline=accent_rgb, width=2)
-
-        # Icon placeholder (large circle)
-        center_x = width // 2
-        draw.ellipse([center_x - 60, 80, center_x + 60, 200], outline=accent_rgb, width=3)
-
-        # Title
-        add_glow_text(draw, title, (width // 2 - len(title) * 10, 240), font_large, accent)
-
-        # Subtitle
-        draw.text((width // 2 - len(subtitle) * 6, 300), subtitle, font=font_medium, fill=hex_to_rgb(COLORS['ghost_white']))
-
-        # Features
-        features = {
-            'mcp-server': ['Claude Desktop', 'Cursor IDE', 'Pro+ plans'],
-            'desktop-app': ['Windows FREE', 'Drag & drop', 'Local processing'],
-            'office-add-in': ['Word, Excel, PPT', 'Select & protect', 'All plans'],
-        }
-
-        y = 360
-        for feature in features[product_id]:
-            draw.text((60, y), "> " + feature, font=font_medium, fill=hex_to_rgb(COLORS['syntax_slate']))
-            y += 35
-
-        img.save(os.path.join(output_dir, f'card-{product_id}.png'), 'PNG')
-
-    print("Created: 3 product cards (400x500)")
-
 def main():
     output_dir = os.path.join(os.path.dirname(__file__), 'marketing')
     os.makedirs(output_dir, exist_ok=True)
@@ -298,12 +221,8 @@ def main():
     print("Generating Anonymize.dev marketing materials...")
     print("=" * 50)
 
-    create_linkedin_post(output_dir)
-    create_twitter_post(output_dir)
-    create_instagram_square(output_dir)
-    create_web_banner(output_dir)
-    create_email_banner(output_dir)
-    create_product_cards(output_dir)
+    for t in build_tasks(output_dir):
+        t.func(*t.args, **t.kwargs)
 
     print("=" * 50)
     print("Marketing materials generated successfully!")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Glow Compositor
+Neon Protocol Theme - blurred halo layers for text and shapes
+"""
+
+from PIL import Image, ImageChops, ImageDraw, ImageFilter
+
+from glyphs import glow_run
+from shaping import draw_text as draw_shaped, text_bbox
+
+# (blur radius, strength) pairs - tight bright core plus a wide soft halo
+GLOW_LAYERS = ((2, 0.9), (5, 0.6), (10, 0.35))
+
+def to_rgba(color):
+    """Normalize a hex string or RGB/RGBA tuple to an RGBA tuple."""
+    if isinstance(color, str):
+        color = color.lstrip('#')
+        return tuple(int(color[i:i+2], 16) for i in (0, 2, 4)) + (255,)
+    if len(color) == 3:
+        return tuple(color) + (255,)
+    return tuple(color)
+
+def glow_mask(mask, layers=GLOW_LAYERS):
+    """Blur a coverage mask at several radii and screen the results together."""
+    glow = None
+    for radius, strength in layers:
+        layer = mask.filter(ImageFilter.GaussianBlur(radius))
+        if strength != 1:
+            layer = layer.point(lambda v, s=strength: int(v * s))
+        glow = layer if glow is None else ImageChops.screen(glow, layer)
+    return glow
+
+def glow_padding(layers=GLOW_LAYERS):
+    """Margin needed around a mask so the widest blur is not clipped."""
+    return max(radius for radius, _ in layers) * 3
+
+def composite_mask(img, color, mask, origin):
+    """Alpha-composite a solid color through an L mask onto img at origin."""
+    rgba = to_rgba(color)
+    if rgba[3] != 255:
+        mask = mask.point(lambda v, a=rgba[3]: v * a // 255)
+    img.paste(rgba[:len(img.getbands())], origin, mask)
+
+def add_glow_text(img, text, pos, font, color, glow_color=None, layers=GLOW_LAYERS):
+    """Draw text with neon glow effect.
+
+    The text is rasterized once into a coverage mask; the glow is that mask
+    blurred at each radius in ``layers``, and the crisp text is the mask
+    itself, so both share a single rasterization. Both come from the
+    glyph-run cache, so repeated strings skip rasterizing and blurring.
+    """
+    if glow_color is None:
+        glow_color = color
+    x, y = pos
+    pad = glow_padding(layers)
+
+    left, top, right, bottom = text_bbox(font, text)
+    # Only mask pixels within 2 * pad of the canvas can reach it, so text much
+    # larger than the canvas (a strip of a poster) is rasterized cropped
+    x0, y0 = max(0, -pad - x), max(0, -pad - y)
+    x1 = min(right + 2 * pad, img.width + 3 * pad - x)
+    y1 = min(bottom + 2 * pad, img.height + 3 * pad - y)
+    if x0 >= x1 or y0 >= y1:
+        return
+    if (x0, y0, x1, y1) == (0, 0, right + 2 * pad, bottom + 2 * pad):
+        mask, glow = glow_run(font, text, layers, glow_mask, pad)
+    else:
+        # Cropped masks are one-offs; keep them out of the cache
+        mask = Image.new('L', (x1 - x0, y1 - y0), 0)
+        draw_shaped(ImageDraw.Draw(mask), (pad - x0, pad - y0), text, font, 255)
+        glow = glow_mask(mask, layers)
+
+    origin = (x - pad + x0, y - pad + y0)
+    composite_mask(img, glow_color, glow, origin)
+    composite_mask(img, color, mask, origin)
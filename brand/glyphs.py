@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Glyph-Run Cache
+Rasterized text masks shared by every image drawn in a process
+
+The same strings ("anonymize.dev", "MCP", product titles) are drawn at the
+same font and size across the marketing set and every template row. A run
+is rasterized once into a coverage mask cropped to its ink bbox; repeat
+draws paste that mask in the fill color, which is pixel-identical to
+ImageDraw.text at integer positions. Glow text also caches the blurred glow
+of its padded mask. Entries are evicted least recently used once the masks
+exceed CACHE_BYTES, and stats() reports hit rates.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from PIL import Image, ImageDraw
+
+from shaping import draw_text as draw_shaped, text_bbox
+
+# Total mask bytes kept per process
+CACHE_BYTES = 32 * 1024 * 1024
+
+# mask: L coverage of the ink box; offset: ink box (left, top) from the draw
+# position; bbox: ink box of the text as laid out across the font's fallback chain
+GlyphRun = namedtuple('GlyphRun', ['mask', 'offset', 'bbox'])
+
+class GlyphCache:
+    """LRU of rasterized runs, bounded by mask bytes; safe across server threads."""
+
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, render):
+        """Cached value for key, else render() -> (value, size in bytes)."""
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key][0]
+            self.misses += 1
+        # Rendered unlocked; two threads may race to render the same run
+        value, size = render()
+        with self.lock:
+            if size <= self.max_bytes and key not in self.entries:
+                self.entries[key] = (value, size)
+                self.bytes += size
+                while self.bytes > self.max_bytes:
+                    _, (_, evicted) = self.entries.popitem(last=False)
+                    self.bytes -= evicted
+                    self.evictions += 1
+        return value
+
+    def stats(self):
+        """Counters plus hit rate and current size."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'hit_rate': self.hits / lookups if lookups else 0.0,
+                    'entries': len(self.entries), 'bytes': self.bytes}
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+_cache = GlyphCache()
+
+def _font_key(font):
+    return (getattr(font, 'path', None), font.size, getattr(font, 'index', 0))
+
+def _features_key(features):
+    return tuple(features) if features else ()
+
+def glyph_run(font, text, features=None):
+    """GlyphRun for text in font, rasterized on first use."""
+    def render():
+        bbox = text_bbox(font, text, features)
+        left, top, right, bottom = bbox
+        mask = Image.new('L', (max(right - left, 0), max(bottom - top, 0)), 0)
+        if mask.width and mask.height:
+            draw_shaped(ImageDraw.Draw(mask), (-left, -top), text, font, 255, features)
+        return GlyphRun(mask, (left, top), bbox), mask.width * mask.height
+    return _cache.get(('run', _font_key(font), text, _features_key(features)), render)
+
+def draw_text(img, pos, text, font, fill, features=None):
+    """ImageDraw.text(pos, text, font=font, fill=fill) through the run cache.
+
+    pos must be integer; fill is a color tuple sized for img's mode.
+    """
+    run = glyph_run(font, text, features)
+    if run.mask.width and run.mask.height:
+        img.paste(fill, (pos[0] + run.offset[0], pos[1] + run.offset[1]), run.mask)
+
+def padded_mask(font, text, pad, features=None):
+    """Coverage of text with its draw position at (pad, pad) on a canvas padded by pad.
+
+    The canvas is (bbox right + 2 * pad, bbox bottom + 2 * pad), as glow text lays it out.
+    """
+    def render():
+        run = glyph_run(font, text, features)
+        _, _, right, bottom = run.bbox
+        mask = Image.new('L', (right + 2 * pad, bottom + 2 * pad), 0)
+        if run.mask.width and run.mask.height:
+            mask.paste(run.mask, (pad + run.offset[0], pad + run.offset[1]))
+        return mask, mask.width * mask.height
+    return _cache.get(('padded', _font_key(font), text, _features_key(features), pad), render)
+
+def glow_run(font, text, layers, blur, pad, features=None):
+    """(padded mask, blurred glow) for text; blur(mask, layers) makes the glow."""
+    def render():
+        mask = padded_mask(font, text, pad, features)
+        glow = blur(mask, layers)
+        return (mask, glow), glow.width * glow.height
+    key = ('glow', _font_key(font), text, _features_key(features), layers, blur.__qualname__)
+    return _cache.get(key, render)
+
+def stats():
+    """Hit and size counters of this process's glyph-run cache."""
+    return _cache.stats()
+
+def clear():
+    """Drop every cached run and reset the counters."""
+    _cache.clear()
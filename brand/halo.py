@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Halo Renderer
+Neon glows from a signed distance field, computed in one NumPy pass
+
+A halo is described by a shape (circle, ring or polygon), a color and a
+falloff: full ``inner`` opacity inside the shape, then ``strength`` fading
+to zero over ``spread`` pixels outside it. The distance field is evaluated
+once per pixel and turned into a coverage mask, which is alpha-composited
+so overlapping halos blend instead of overwriting each other.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from glow import to_rgba
+
+def _grid(box):
+    """Pixel-center coordinates for a box, as a row and a column."""
+    left, top, right, bottom = box
+    xs = np.arange(left, right, dtype=np.float32) + 0.5
+    ys = np.arange(top, bottom, dtype=np.float32) + 0.5
+    return xs[np.newaxis, :], ys[:, np.newaxis]
+
+def circle_sdf(x, y, center, radius):
+    """Signed distance to a circle: negative inside, positive outside."""
+    cx, cy = center
+    # x and y are a row and a column; only the sum is full-size
+    return np.sqrt((x - cx) ** 2 + (y - cy) ** 2) - radius
+
+def ring_sdf(x, y, center, radius, width):
+    """Signed distance to a circular stroke of the given width."""
+    return np.abs(circle_sdf(x, y, center, radius)) - width / 2
+
+def polygon_sdf(x, y, points):
+    """Signed distance to a closed polygon (even-odd inside test)."""
+    x, y = np.broadcast_arrays(x, y)
+    dist = np.full(x.shape, np.inf, dtype=np.float32)
+    inside = np.zeros(x.shape, dtype=bool)
+    for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+        ex, ey = x1 - x0, y1 - y0
+        px, py = x - x0, y - y0
+        t = np.clip((px * ex + py * ey) / (ex * ex + ey * ey), 0, 1)
+        np.minimum(dist, np.hypot(px - t * ex, py - t * ey), out=dist)
+        crosses = (y0 > y) != (y1 > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inside ^= crosses & (x < x0 + ex * (y - y0) / ey)
+    return np.where(inside, -dist, dist)
+
+SHAPES = {
+    'circle': lambda x, y, g: circle_sdf(x, y, g['center'], g['radius']),
+    'ring': lambda x, y, g: ring_sdf(x, y, g['center'], g['radius'], g['width']),
+    'polygon': lambda x, y, g: polygon_sdf(x, y, list(g['points'])),
+}
+
+def falloff(distance, spread, strength=0.25, inner=None, power=2.0):
+    """Opacity (0-1) for each signed distance.
+
+    Outside the shape opacity falls from ``strength`` to 0 as
+    ``(1 - d / spread) ** power``; inside it is ``inner`` (default
+    ``strength``). The shape edge gets one pixel of anti-aliasing.
+    """
+    if inner is None:
+        inner = strength
+    glow = np.clip(distance * (-1 / spread), -1, 0)
+    glow += 1
+    if power == 2:
+        glow *= glow
+    else:
+        np.power(glow, power, out=glow)
+    glow *= strength
+    coverage = np.clip(0.5 - distance, 0, 1)
+    coverage *= inner - glow
+    coverage += glow
+    return coverage
+
+def bounds(kind, geometry, spread):
+    """Scene-space (left, top, right, bottom) that the halo can touch."""
+    if kind == 'polygon':
+        xs, ys = zip(*geometry['points'])
+        left, top, right, bottom = min(xs), min(ys), max(xs), max(ys)
+    else:
+        cx, cy = geometry['center']
+        r = geometry['radius'] + geometry.get('width', 0) / 2
+        left, top, right, bottom = cx - r, cy - r, cx + r, cy + r
+    return left - spread, top - spread, right + spread, bottom + spread
+
+# Scene pixels per upsampling block; blocks whose neighbourhood is constant are filled
+UPSAMPLE_BLOCK = 16
+
+def upsample(mask, scale):
+    """mask.resize(scale times, BILINEAR), resampling only where the mask varies.
+
+    A halo is mostly flat: full opacity inside the shape, nothing past the
+    falloff. A block that is constant together with its one-pixel margin
+    (the bilinear filter's reach) upsamples to that constant, so it is
+    filled; runs of varying blocks are resized from a crop with that margin,
+    which gives the same pixels as resizing the whole mask.
+    """
+    a = np.asarray(mask)
+    h, w = a.shape
+    padded = np.pad(a, 1, mode='edge')
+    shifts = [padded[dy:dy + h, dx:dx + w] for dy in range(3) for dx in range(3)]
+    block = UPSAMPLE_BLOCK
+    rows, cols = -(-h // block), -(-w // block)
+
+    def per_block(values, reduce):
+        values = np.pad(values, ((0, rows * block - h), (0, cols * block - w)), mode='edge')
+        return reduce(values.reshape(rows, block, cols, block), axis=(1, 3))
+
+    low = per_block(np.minimum.reduce(shifts), np.min)
+    varying = low != per_block(np.maximum.reduce(shifts), np.max)
+    step = block * scale
+    out = np.repeat(np.repeat(low, step, axis=0), step, axis=1)[:h * scale, :w * scale]
+    for row in range(rows):
+        col = 0
+        while col < cols:
+            if not varying[row, col]:
+                col += 1
+                continue
+            end = col
+            while end < cols and varying[row, end]:
+                end += 1
+            x0, y0, x1, y1 = col * block, row * block, min(end * block, w), min((row + 1) * block, h)
+            cx0, cy0, cx1, cy1 = max(x0 - 1, 0), max(y0 - 1, 0), min(x1 + 1, w), min(y1 + 1, h)
+            part = mask.crop((cx0, cy0, cx1, cy1)).resize(((cx1 - cx0) * scale, (cy1 - cy0) * scale),
+                                                          Image.BILINEAR)
+            out[y0 * scale:y1 * scale, x0 * scale:x1 * scale] = np.asarray(part)[
+                (y0 - cy0) * scale:(y1 - cy0) * scale, (x0 - cx0) * scale:(x1 - cx0) * scale]
+            col = end
+    return Image.fromarray(np.ascontiguousarray(out), 'L')
+
+def halo_mask(kind, geometry, spread, strength=0.25, inner=None, power=2.0, scale=1, size=None,
+              offset=(0, 0), extent=None):
+    """Render a halo into an L mask; returns (mask, origin) in canvas pixels.
+
+    The field is evaluated at scene resolution over the halo's bounds
+    (clipped to the canvas size) and resampled once to the canvas scale:
+    the falloff is smooth, and crisp edges come from the shapes drawn on top.
+
+    offset and extent describe a canvas that is a window of a larger one:
+    offset is its top-left in scaled pixels and extent the full size. The
+    field is then evaluated over the window plus a margin and cropped, so
+    windows rendered separately join into the full-canvas result.
+    """
+    left, top, right, bottom = bounds(kind, geometry, spread)
+    box = [int(np.floor(left)), int(np.floor(top)), int(np.ceil(right)) + 1, int(np.ceil(bottom)) + 1]
+    window = None
+    if size is not None:
+        ox, oy = offset
+        full = extent or size
+        # One scene pixel of margin covers the bilinear filter's reach
+        window = [ox, oy, ox + size[0], oy + size[1]]
+        box = [max(box[0], 0, ox // scale - 1), max(box[1], 0, oy // scale - 1),
+               min(box[2], full[0] // scale, -(-window[2] // scale) + 1),
+               min(box[3], full[1] // scale, -(-window[3] // scale) + 1)]
+    width, height = box[2] - box[0], box[3] - box[1]
+    if width <= 0 or height <= 0:
+        return None, (0, 0)
+    x, y = _grid(box)
+    alpha = falloff(SHAPES[kind](x, y, geometry), spread, strength, inner, power)
+    mask = Image.fromarray(np.round(alpha * 255).astype(np.uint8), 'L')
+    if scale != 1:
+        mask = upsample(mask, scale)
+    origin = (box[0] * scale, box[1] * scale)
+    if window is not None and any(offset):
+        crop = (max(window[0], origin[0]), max(window[1], origin[1]),
+                min(window[2], origin[0] + mask.width), min(window[3], origin[1] + mask.height))
+        if crop[0] >= crop[2] or crop[1] >= crop[3]:
+            return None, (0, 0)
+        mask = mask.crop((crop[0] - origin[0], crop[1] - origin[1],
+                          crop[2] - origin[0], crop[3] - origin[1]))
+        origin = (crop[0] - window[0], crop[1] - window[1])
+    return mask, origin
+
+def composite_halo(img, color, mask, origin):
+    """Blend a solid color through mask onto img with source-over.
+
+    On RGBA canvases source-over is computed only where img already has
+    content; elsewhere the colored mask is the result and is pasted, which
+    is most of a halo drawn first. A halo covering an empty canvas is
+    written into it directly.
+    """
+    rgba = to_rgba(color)
+    if rgba[3] != 255:
+        mask = mask.point(lambda v, a=rgba[3]: v * a // 255)
+    if img.mode != 'RGBA':
+        img.paste(rgba[:3], origin, mask)
+        return
+    drawn = img.getbbox()
+    if drawn is None and origin == (0, 0) and mask.size == img.size:
+        img.paste(rgba[:3] + (0,), (0, 0) + img.size)
+        img.putalpha(mask)
+        return
+    layer = Image.new('RGBA', mask.size, rgba[:3] + (0,))
+    layer.putalpha(mask)
+    x, y = origin
+    if drawn is not None:
+        # The canvas's drawn box, in layer coordinates, clipped to the layer
+        drawn = (max(drawn[0] - x, 0), max(drawn[1] - y, 0),
+                 min(drawn[2] - x, mask.width), min(drawn[3] - y, mask.height))
+    if drawn is None or drawn[0] >= drawn[2] or drawn[1] >= drawn[3]:
+        img.paste(layer, origin)
+    elif drawn == (0, 0) + mask.size:
+        img.alpha_composite(layer, origin)
+    else:
+        left, top, right, bottom = drawn
+        under = img.crop((x + left, y + top, x + right, y + bottom))
+        under.alpha_composite(layer.crop(drawn))
+        img.paste(layer, origin)
+        img.paste(under, (x + left, y + top))
+
+# Masks depend on geometry and falloff only, never on color, so every theme
+# rendering the same shape shares one field evaluation
+MASK_CACHE_SIZE = 32
+_masks = OrderedDict()
+
+def cached_halo_mask(kind, geometry, spread, strength=0.25, inner=None, power=2.0, scale=1, size=None,
+                     offset=(0, 0), extent=None):
+    """halo_mask through a small LRU; the returned mask must not be modified."""
+    key = (kind, repr(sorted(geometry.items())), spread, strength, inner, power, scale, size,
+           offset, extent)
+    if key in _masks:
+        _masks.move_to_end(key)
+        return _masks[key]
+    result = _masks[key] = halo_mask(kind, geometry, spread, strength, inner, power, scale, size,
+                                     offset, extent)
+    if len(_masks) > MASK_CACHE_SIZE:
+        _masks.popitem(last=False)
+    return result
+
+def clear():
+    """Drop every cached mask."""
+    _masks.clear()
+
+def draw_halo(img, kind, geometry, color, spread, strength=0.25, inner=None, power=2.0, scale=1,
+              offset=(0, 0), extent=None):
+    """Render and composite one halo onto img; geometry is in scene units.
+
+    offset and extent place img as a window of a larger canvas (see halo_mask).
+    """
+    if any(offset):
+        # Windows of a larger canvas rarely repeat; keep them out of the cache
+        mask, origin = halo_mask(kind, geometry, spread, strength, inner, power, scale, img.size,
+                                 offset, extent)
+    else:
+        mask, origin = cached_halo_mask(kind, geometry, spread, strength, inner, power, scale, img.size,
+                                        offset, extent)
+    if mask is not None:
+        composite_halo(img, color, mask, origin)
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Hashing
+File digests shared by the build manifest and the modules it fingerprints
+"""
+
+import hashlib
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def file_digest(path):
+    """SHA-256 of a file's bytes."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
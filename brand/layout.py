@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Text Layout
+Measured alignment, auto-fit and line wrapping with memoized metrics
+
+Positions come from the font's own measurements rather than per-character
+guesses: getlength() for advance widths (what alignment and wrapping need)
+and getbbox() for ink extents. Each (text, size, role) is measured once per
+process, so fitting hundreds of localized variants mostly hits the cache.
+fit_size() starts from the width at the largest size, predicts the fitting
+size from the near-linear width/size relation and binary-searches only the
+small bracket around the prediction.
+"""
+
+from functools import lru_cache
+
+from fonts import get_font
+import shaping
+
+ALIGNMENTS = ('left', 'center', 'right')
+# Line advance as a multiple of the font size
+LINE_HEIGHT = 1.25
+METRICS_CACHE_SIZE = 16384
+
+@lru_cache(maxsize=METRICS_CACHE_SIZE)
+def text_length(text, size, role='sans'):
+    """Advance width of text in pixels."""
+    return shaping.text_length(get_font(size, role), text)
+
+@lru_cache(maxsize=METRICS_CACHE_SIZE)
+def text_bbox(text, size, role='sans'):
+    """Ink box (left, top, right, bottom) of text drawn at the origin."""
+    return shaping.text_bbox(get_font(size, role), text)
+
+def aligned_x(x, text, size, align='left', role='sans'):
+    """Left edge for text anchored at x on its left, center or right."""
+    if align not in ALIGNMENTS:
+        raise ValueError(f"Unknown alignment: {align}")
+    if align == 'left':
+        return x
+    length = text_length(text, size, role)
+    return int(x - length / 2) if align == 'center' else int(x - length)
+
+def wrap(text, size, max_width, role='sans'):
+    """Greedy word wrap into lines no wider than max_width.
+
+    Explicit newlines are kept; a single word wider than max_width is split
+    between characters.
+    """
+    lines = []
+    for paragraph in text.split('\n'):
+        line = ''
+        for word in paragraph.split():
+            candidate = f'{line} {word}' if line else word
+            if text_length(candidate, size, role) <= max_width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            line = word
+            while len(line) > 1 and text_length(line, size, role) > max_width:
+                cut = len(line) - 1
+                while cut > 1 and text_length(line[:cut], size, role) > max_width:
+                    cut -= 1
+                lines.append(line[:cut])
+                line = line[cut:]
+        lines.append(line)
+    return lines
+
+def block_height(lines, size, line_height=LINE_HEIGHT):
+    """Height of a wrapped block: full line advances plus the last line's size."""
+    return round(size * line_height) * (len(lines) - 1) + size if lines else 0
+
+def _largest(fits, low, high):
+    """Largest size in [low, high] for which fits(size) holds, given fits(low)."""
+    while low < high:
+        mid = (low + high + 1) // 2
+        if fits(mid):
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+def fit_size(text, max_width, max_size, min_size=12, role='sans'):
+    """Largest size from min_size to max_size at which text fits in max_width on one line."""
+    def fits(size):
+        return text_length(text, size, role) <= max_width
+
+    if fits(max_size) or max_size <= min_size:
+        return max_size
+    # Width grows almost linearly with size: predict, then search the bracket
+    guess = min(max_size - 1, max(min_size, int(max_size * max_width / text_length(text, max_size, role))))
+    if fits(guess):
+        return _largest(fits, guess, max_size - 1)
+    if not fits(min_size):
+        return min_size
+    return _largest(fits, min_size, guess - 1)
+
+def fit_block(text, max_width, max_height, max_size, min_size=12, line_height=LINE_HEIGHT, role='sans'):
+    """(size, lines): the largest size whose wrapped text fits the box."""
+    def fits(size):
+        lines = wrap(text, size, max_width, role)
+        return (block_height(lines, size, line_height) <= max_height
+                and all(text_length(line, size, role) <= max_width for line in lines))
+
+    if max_size <= min_size or fits(max_size):
+        size = max_size
+    elif not fits(min_size):
+        size = min_size
+    else:
+        size = _largest(fits, min_size, max_size - 1)
+    return size, wrap(text, size, max_width, role)
+
+def place_text(scene, xy, text, size, fill, align='left', glow=False, role='sans'):
+    """Add one line to a scene with x anchored per align."""
+    x, y = xy
+    pos = (aligned_x(x, text, size, align, role), y)
+    if glow:
+        scene.glow_text(pos, text, size, fill, role=role)
+    else:
+        scene.text(pos, text, size, fill, role=role)
+
+def place_block(scene, xy, lines, size, fill, align='left', line_height=LINE_HEIGHT, glow=False,
+                role='sans'):
+    """Add wrapped lines to a scene, one line advance apart; returns the block height."""
+    x, y = xy
+    for line in lines:
+        place_text(scene, (x, y), line, size, fill, align, glow, role)
+        y += round(size * line_height)
+    return block_height(lines, size, line_height)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Build Manifest
+Content-hashed record of rendered outputs so unchanged assets are skipped
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import platform
+import sys
+import types
+import zlib
+from functools import lru_cache
+from importlib import metadata
+
+from PIL import features
+
+from hashing import file_digest
+
+BRAND_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(BRAND_DIR, '.build-manifest.json')
+
+# Bump to invalidate every recorded output at once
+MANIFEST_VERSION = 1
+
+# Build plumbing whose edits never change pixels
+BUILD_MODULES = {'build', 'hashing', 'manifest', 'taskgraph'}
+
+DATA_TYPES = (str, int, float, bool, tuple, list, dict, type(None))
+
+# Distributions whose versions can change rendered or encoded bytes
+LIBRARIES = ('Pillow', 'numpy', 'reportlab')
+
+def _relative(value):
+    """Make absolute paths under brand/ relative so fingerprints are portable."""
+    if isinstance(value, str) and value.startswith(BRAND_DIR):
+        return os.path.relpath(value, BRAND_DIR)
+    if isinstance(value, (list, tuple)):
+        return [_relative(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _relative(v) for k, v in sorted(value.items())}
+    return value
+
+def _code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+def _code_strings(code):
+    strings = set()
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            strings |= _code_strings(const)
+        elif isinstance(const, str):
+            strings.add(const)
+    return strings
+
+def _strings(value):
+    """Every string nested in a data value."""
+    if isinstance(value, str):
+        return {value}
+    if isinstance(value, dict):
+        value = list(value.keys()) + list(value.values())
+    if isinstance(value, (list, tuple)):
+        return set().union(*map(_strings, value))
+    return set()
+
+def is_brand_module(module):
+    path = getattr(module, '__file__', None) or ''
+    return os.path.dirname(os.path.abspath(path)) == BRAND_DIR
+
+def helper_modules(module):
+    """module plus every brand module it imports from, transitively."""
+    found = {}
+    stack = [module]
+    while stack:
+        mod = stack.pop()
+        if mod.__name__ in found or mod.__name__ in BUILD_MODULES:
+            continue
+        found[mod.__name__] = mod
+        for value in vars(mod).values():
+            owner = value if isinstance(value, types.ModuleType) else inspect.getmodule(value)
+            if owner is not None and owner is not mod and is_brand_module(owner):
+                stack.append(owner)
+    return found
+
+def renderer_inputs(func, texts=()):
+    """Source of func plus every same-module function and constant it reaches.
+
+    Helpers imported from other brand modules (glow, fonts, ...) contribute
+    their file digest instead, since they are shared by many renderers, plus
+    whatever their optional build_inputs(texts) hook reports (e.g. font
+    files). texts are the strings the renderer can draw: texts passed in
+    (arguments, data files) plus the string constants it reaches.
+    The brand modules a helper itself imports count as helpers too.
+    """
+    func = inspect.unwrap(func)
+    module = sys.modules[func.__module__]
+    sources, data, helpers, hooks = {}, {}, {}, {}
+    texts = set(texts)
+    stack = [func]
+    while stack:
+        fn = stack.pop()
+        key = f'{fn.__module__}.{fn.__qualname__}'
+        if key in sources:
+            continue
+        sources[key] = inspect.getsource(fn)
+        texts |= _code_strings(fn.__code__)
+        for name in sorted(_code_names(fn.__code__) & set(vars(module))):
+            value = vars(module)[name]
+            if isinstance(value, types.FunctionType) and value.__module__ == module.__name__:
+                stack.append(inspect.unwrap(value))
+            elif isinstance(value, DATA_TYPES) and not name.startswith('__'):
+                data[name] = _relative(value)
+                texts |= _strings(value)
+            else:
+                owner = inspect.getmodule(value)
+                if owner is not None and owner is not module and is_brand_module(owner):
+                    for helper_name, helper in helper_modules(owner).items():
+                        helpers[helper_name] = file_digest(helper.__file__)
+                        if hasattr(helper, 'build_inputs'):
+                            hooks[helper_name] = helper.build_inputs
+    for helper_name, hook in hooks.items():
+        data[f'{helper_name}.build_inputs'] = hook(sorted(texts))
+    return {'sources': sources, 'data': data, 'helpers': helpers}
+
+@lru_cache(maxsize=None)
+def library_versions():
+    """Versions of Python, the imaging libraries and the native codecs Pillow links."""
+    versions = {'python': platform.python_version(), 'zlib': zlib.ZLIB_RUNTIME_VERSION}
+    for name in LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    for name in ('freetype2', 'raqm', 'libimagequant', 'webp', 'avif'):
+        try:
+            versions[name] = features.version(name)
+        except ValueError:
+            # Feature unknown to this Pillow
+            versions[name] = None
+    return versions
+
+def _file_args(values):
+    """Digests of arguments naming existing files (templates, datasets, ...)."""
+    return {_relative(v): file_digest(v) for v in values
+            if isinstance(v, str) and os.path.isfile(v)}
+
+def _file_text(path):
+    """A text file argument's contents (rows a template draws), or '' for binary files."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return ''
+
+def fingerprint(t, context=None):
+    """Hash of everything that determines a task's outputs.
+
+    context carries build-wide settings that change the files written,
+    such as the encoder formats and widths.
+    """
+    values = list(t.args) + list(t.kwargs.values())
+    texts = _strings(values) | {_file_text(v) for v in values if isinstance(v, str) and os.path.isfile(v)}
+    payload = {
+        'context': context,
+        'files': _file_args(values),
+        'version': MANIFEST_VERSION,
+        'libraries': library_versions(),
+        'renderer': renderer_inputs(t.func, texts),
+        'args': _relative(list(t.args)),
+        'kwargs': _relative(t.kwargs),
+    }
+    blob = json.dumps(payload, sort_keys=True, default=repr).encode()
+    return hashlib.sha256(blob).hexdigest()
+
+def load(path=MANIFEST_PATH):
+    """Read the manifest, treating a missing or foreign one as empty."""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('tasks', {})
+
+def save(entries, path=MANIFEST_PATH):
+    """Write the manifest atomically."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'version': MANIFEST_VERSION, 'tasks': entries}, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, path)
+
+def is_fresh(t, entries, digest):
+    """True when the recorded fingerprint matches and every output exists."""
+    entry = entries.get(t.name)
+    if not entry or entry.get('fingerprint') != digest:
+        return False
+    recorded = [os.path.join(BRAND_DIR, p) for p in entry.get('outputs', [])]
+    return bool(t.outputs) and all(os.path.exists(p) for p in list(t.outputs) + recorded)
+
+def record(t, entries, digest, encoded=()):
+    """Remember a finished task; encoded are encoder size-report entries."""
+    encoded = [dict(e, path=_relative(e['path'])) for e in encoded]
+    outputs = [_relative(p) for p in t.outputs]
+    entries[t.name] = {
+        'fingerprint': digest,
+        'outputs': sorted(set(outputs) | {e['path'] for e in encoded}),
+        'encoded': encoded,
+    }
+
+def stale_tasks(tasks, entries, digests):
+    """Tasks needing a render: changed ones plus anything downstream of them."""
+    stale = {t.name for t in tasks if not is_fresh(t, entries, digests[t.name])}
+    changed = True
+    while changed:
+        changed = False
+        for t in tasks:
+            if t.name not in stale and any(d in stale for d in t.deps):
+                stale.add(t.name)
+                changed = True
+    return [t for t in tasks if t.name in stale]
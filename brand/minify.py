@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Minifiers
+Conservative CSS and JavaScript minification for the static site
+
+Both minifiers scan the source once, copying string literals (and, for
+JavaScript, regex and template literals) verbatim while dropping comments
+and layout whitespace. The JavaScript minifier only joins lines after
+'{', ';' or ',' and before '}', so automatic semicolon insertion behaves
+exactly as in the source.
+
+    python minify.py ../css/style.css > style.min.css
+"""
+
+import re
+import sys
+
+# Whitespace around these is never significant in a stylesheet
+CSS_TIGHT = set('{};,>')
+
+def _string_end(src, i):
+    """Index just past the quoted string starting at src[i]."""
+    quote = src[i]
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == quote or (c == '\n' and quote != '`'):
+            return i + 1
+        i += 1
+    return i
+
+def minify_css(src):
+    """Strip comments and collapse whitespace outside strings."""
+    out = []
+    i, n = 0, len(src)
+    pending_space = False
+    while i < n:
+        c = src[i]
+        if c == '/' and src.startswith('*', i + 1):
+            end = src.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            pending_space = True
+            continue
+        if c.isspace():
+            pending_space = True
+            i += 1
+            continue
+        if pending_space and out and out[-1][-1] not in CSS_TIGHT and out[-1][-1] != ':' \
+                and c not in CSS_TIGHT:
+            out.append(' ')
+        pending_space = False
+        if c in '\'"':
+            end = _string_end(src, i)
+            out.append(src[i:end])
+            i = end
+            continue
+        if c == '}' and out and out[-1] == ';':
+            out.pop()
+        out.append(c)
+        i += 1
+    return ''.join(out).strip() + '\n'
+
+# Whitespace next to these never separates tokens; '+', '-', '.' and '/'
+# are left out so 'a - -b', '1 .x' and comments stay intact
+JS_TIGHT = set('{}()[];,=:<>!&|?*%^~')
+
+# A newline after these (or before '}') can never trigger ASI
+JS_LINE_JOINERS = set('{;,')
+
+# A '/' after one of these (or at the start) begins a regex literal
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'delete', 'void', 'throw', 'new'}
+
+def _regex_end(src, i):
+    """Index just past the regex literal (flags included) starting at src[i]."""
+    i += 1
+    in_class = False
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            i += 1
+            break
+        elif c == '\n':
+            break
+        i += 1
+    while i < len(src) and (src[i].isalnum() or src[i] == '_'):
+        i += 1
+    return i
+
+def _template_end(src, i):
+    """Index just past the template literal starting at src[i], nesting ${...}."""
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '`':
+            return i + 1
+        if c == '$' and src.startswith('{', i + 1):
+            i = _expression_end(src, i + 2)
+            continue
+        i += 1
+    return i
+
+def _expression_end(src, i):
+    """Index just past the '}' closing a template ${ expression."""
+    depth = 1
+    while i < len(src) and depth:
+        c = src[i]
+        if c in '\'"':
+            i = _string_end(src, i)
+            continue
+        if c == '`':
+            i = _template_end(src, i)
+            continue
+        depth += {'{': 1, '}': -1}.get(c, 0)
+        i += 1
+    return i
+
+def _regex_allowed(out):
+    text = ''.join(out[-3:]).rstrip()
+    if not text:
+        return True
+    if text[-1] in _REGEX_PRECEDERS:
+        return True
+    word = re.search(r'[A-Za-z_$]+$', text)
+    return bool(word) and word.group() in _REGEX_KEYWORDS
+
+def minify_js(src):
+    """Drop comments, indentation, blank lines and ASI-safe line breaks."""
+    out = []
+    i, n = 0, len(src)
+    space = newline = False
+    while i < n:
+        c = src[i]
+        if c == '/' and src.startswith('/', i + 1):
+            end = src.find('\n', i)
+            i = n if end < 0 else end
+            continue
+        if c == '/' and src.startswith('*', i + 1):
+            end = src.find('*/', i + 2)
+            newline = newline or '\n' in src[i:end]
+            space = True
+            i = n if end < 0 else end + 2
+            continue
+        if c == '\n':
+            newline = True
+            i += 1
+            continue
+        if c.isspace():
+            space = True
+            i += 1
+            continue
+        if out:
+            prev = out[-1][-1]
+            if newline and (prev in JS_LINE_JOINERS or c == '}'):
+                newline, space = False, True
+            if newline:
+                out.append('\n')
+            elif space and prev not in JS_TIGHT and c not in JS_TIGHT:
+                out.append(' ')
+        space = newline = False
+        if c in '\'"':
+            end = _string_end(src, i)
+        elif c == '`':
+            end = _template_end(src, i)
+        elif c == '/' and _regex_allowed(out):
+            end = _regex_end(src, i)
+        else:
+            end = i + 1
+        out.append(src[i:end])
+        i = end
+    return ''.join(out) + '\n'
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    for path in argv:
+        ext = path[path.rfind('.'):]
+        with open(path, encoding='utf-8') as f:
+            sys.stdout.write(MINIFIERS[ext](f.read()))
+
+if __name__ == '__main__':
+    main()
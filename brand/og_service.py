@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Open Graph Image Service
+Renders social cards on request, per page or per title, behind an LRU cache
+
+    python og_service.py --port 8088
+    curl 'http://127.0.0.1:8088/card/twitter.png?title=Hello&subtitle=World'
+    curl 'http://127.0.0.1:8088/page/mcp.png'
+
+Rendered bytes live in a bounded in-memory LRU backed by a bounded disk
+tier. Cache keys hash the card parameters together with the renderer code,
+so they double as ETags and stay valid across restarts. Concurrent
+requests for the same card wait on a single render.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from html.parser import HTMLParser
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from functools import lru_cache
+from urllib.parse import parse_qs, urlsplit
+
+import glyphs
+import manifest
+from encoders import available_formats, encode_bytes
+from generate_marketing import linkedin_scene, twitter_scene
+from scene import rasterize
+
+BRAND_DIR = os.path.dirname(os.path.abspath(__file__))
+SITE_DIR = os.path.dirname(BRAND_DIR)
+CACHE_DIR = os.path.join(BRAND_DIR, '.og-cache')
+
+# card name -> scene builder taking (title, subtitle)
+CARDS = {
+    'linkedin': linkedin_scene,
+    'twitter': twitter_scene,
+}
+
+MEDIA_TYPES = {'png': 'image/png', 'webp': 'image/webp', 'avif': 'image/avif'}
+
+@lru_cache(maxsize=None)
+def render_version():
+    """Digest of the card renderers' code, palette and helper modules."""
+    inputs = [manifest.renderer_inputs(build) for _, build in sorted(CARDS.items())]
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+def render_card(card='twitter', title=None, subtitle=None, fmt='png'):
+    """Render a social card in memory and return the encoded bytes.
+
+    Omitted title/subtitle fall back to the renderer's defaults.
+    """
+    text = {k: v for k, v in (('title', title), ('subtitle', subtitle)) if v}
+    return encode_bytes(rasterize(CARDS[card](**text)), fmt)
+
+def cache_key(card, title, subtitle, fmt):
+    blob = json.dumps([render_version(), card, title, subtitle, fmt])
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+class _PageMeta(HTMLParser):
+    """Collects <title>, the meta description and og:* properties."""
+
+    def __init__(self):
+        super().__init__()
+        self.meta = {}
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'title':
+            self._in_title = True
+        elif tag == 'meta':
+            name = attrs.get('property') or attrs.get('name') or ''
+            self.meta.setdefault(name, attrs.get('content') or '')
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.meta['title'] = self.meta.get('title', '') + data
+
+def page_text(page):
+    """(title, subtitle) for a site page from its og:title/<title> and description."""
+    path = os.path.join(SITE_DIR, page + '.html')
+    if os.path.dirname(os.path.abspath(path)) != SITE_DIR or not os.path.isfile(path):
+        raise KeyError(page)
+    parser = _PageMeta()
+    with open(path, encoding='utf-8') as f:
+        parser.feed(f.read())
+    meta = parser.meta
+    title = meta.get('og:title') or meta.get('title', '')
+    # "Anonymize.dev | Privacy-as-Code" and "MCP Server | Anonymize.dev" alike
+    parts = [p.strip() for p in title.split('|') if p.strip() != 'Anonymize.dev']
+    title = parts[0] if parts else title.strip()
+    # "MCP Server - Privacy shield for ... . More." -> "Privacy shield for ..."
+    description = meta.get('og:description') or meta.get('description', '')
+    head, sep, rest = description.partition(' - ')
+    if sep and len(head) < 40:
+        description = rest
+    return title, description.split('. ')[0].rstrip('.')
+
+class RenderCache:
+    """Two-tier LRU of rendered bytes with per-key request coalescing."""
+
+    def __init__(self, memory_bytes=64 << 20, disk_dir=CACHE_DIR, disk_bytes=512 << 20):
+        self.memory = OrderedDict()
+        self.memory_bytes = memory_bytes
+        self.memory_used = 0
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self.disk_used = 0
+        self.lock = threading.Lock()
+        self.inflight = {}
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'renders': 0, 'coalesced': 0, 'errors': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.disk_used = sum(e.stat().st_size for e in os.scandir(disk_dir) if e.is_file())
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key)
+
+    def _remember(self, key, data):
+        """Insert into the memory tier; caller holds the lock."""
+        if len(data) > self.memory_bytes:
+            return
+        if key in self.memory:
+            self.memory_used -= len(self.memory.pop(key))
+        self.memory[key] = data
+        self.memory_used += len(data)
+        while self.memory_used > self.memory_bytes:
+            _, old = self.memory.popitem(last=False)
+            self.memory_used -= len(old)
+
+    def _disk_get(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        os.utime(path)
+        return data
+
+    def _disk_put(self, key, data):
+        if not self.disk_dir or len(data) > self.disk_bytes:
+            return
+        path = self._disk_path(key)
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        with self.lock:
+            # Overwriting a key replaces its bytes; only the difference is new
+            try:
+                old = os.stat(path).st_size
+            except FileNotFoundError:
+                old = 0
+            os.replace(tmp, path)
+            self.disk_used += len(data) - old
+            if self.disk_used <= self.disk_bytes:
+                return
+            # Least recently used first: hits refresh the mtime
+            entries = sorted((e for e in os.scandir(self.disk_dir) if e.name != key and e.is_file()
+                              and not e.name.endswith('.tmp')), key=lambda e: e.stat().st_mtime)
+            for entry in entries:
+                if self.disk_used <= self.disk_bytes:
+                    break
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                self.disk_used -= size
+
+    def get(self, key, render):
+        """Cached bytes for key, calling render() at most once across threads."""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return self.memory[key]
+            future = self.inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self.inflight[key] = Future()
+            else:
+                self.stats['coalesced'] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            data = self._disk_get(key)
+            if data is None:
+                data = render()
+                self._disk_put(key, data)
+                outcome = 'renders'
+            else:
+                outcome = 'disk_hits'
+        except BaseException as exc:
+            with self.lock:
+                self.stats['errors'] += 1
+                del self.inflight[key]
+            future.set_exception(exc)
+            raise
+        with self.lock:
+            self.stats[outcome] += 1
+            self._remember(key, data)
+            del self.inflight[key]
+        future.set_result(data)
+        return data
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats, memory_entries=len(self.memory), memory_bytes=self.memory_used,
+                        disk_bytes=self.disk_used)
+
+class OGHandler(BaseHTTPRequestHandler):
+    """GET /card/<card>.<fmt>?title=&subtitle=, /page/<page>.<fmt> and /stats."""
+
+    server_version = 'AnonymizeOG/1.0'
+    cache = None
+    max_age = 86400
+
+    def _send(self, status, body=b'', content_type='text/plain; charset=utf-8', headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _card_request(self, url):
+        """(card, title, subtitle, fmt) for a URL, or raise KeyError/ValueError."""
+        kind, _, name = url.path.strip('/').partition('/')
+        stem, dot, fmt = name.rpartition('.')
+        if not dot or fmt not in MEDIA_TYPES:
+            raise ValueError(f"unsupported format: {fmt or name}")
+        query = parse_qs(url.query)
+        card = query.get('card', ['twitter'])[0]
+        if kind == 'card':
+            card, (title, subtitle) = stem, (query.get('title', [''])[0], query.get('subtitle', [''])[0])
+        elif kind == 'page':
+            title, subtitle = page_text(stem)
+        else:
+            raise KeyError(url.path)
+        if card not in CARDS:
+            raise KeyError(card)
+        return card, title, subtitle, fmt
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/stats':
+            body = json.dumps(dict(self.cache.snapshot(), glyphs=glyphs.stats()), indent=2).encode()
+            return self._send(HTTPStatus.OK, body, 'application/json')
+        try:
+            card, title, subtitle, fmt = self._card_request(url)
+        except KeyError:
+            return self._send(HTTPStatus.NOT_FOUND, b'not found\n')
+        except ValueError as exc:
+            return self._send(HTTPStatus.BAD_REQUEST, f'{exc}\n'.encode())
+        if fmt not in self.server.formats:
+            return self._send(HTTPStatus.NOT_IMPLEMENTED, f'{fmt} encoding unavailable\n'.encode())
+
+        key = cache_key(card, title, subtitle, fmt)
+        etag = f'"{key[:32]}"'
+        headers = [('ETag', etag), ('Cache-Control', f'public, max-age={self.max_age}')]
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            return self._send(HTTPStatus.NOT_MODIFIED, headers=headers)
+        name = 'webp-lossy' if fmt == 'webp' else fmt
+        try:
+            body = self.cache.get(key, lambda: render_card(card, title, subtitle, name))
+        except Exception as exc:
+            self.log_error("render failed for %s: %r", self.path, exc)
+            return self._send(HTTPStatus.INTERNAL_SERVER_ERROR, b'render failed\n')
+        self._send(HTTPStatus.OK, body, MEDIA_TYPES[fmt], headers)
+
+    do_HEAD = do_GET
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def make_server(host='127.0.0.1', port=8088, cache=None, verbose=False):
+    """A ThreadingHTTPServer serving cards from cache (a RenderCache)."""
+    handler = type('Handler', (OGHandler,), {'cache': cache or RenderCache()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.verbose = verbose
+    server.formats = {'png'} | {name for name in ('webp', 'avif')
+                                if ('webp-lossy' if name == 'webp' else name) in available_formats()}
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Open Graph cards rendered on demand.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8088)
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="disk tier directory ('' disables it)")
+    parser.add_argument('--memory-mb', type=int, default=64, help="memory tier size (default 64)")
+    parser.add_argument('--disk-mb', type=int, default=512, help="disk tier size (default 512)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="log every request")
+    args = parser.parse_args(argv)
+
+    cache = RenderCache(args.memory_mb << 20, args.cache_dir or None, args.disk_mb << 20)
+    server = make_server(args.host, args.port, cache, args.verbose)
+    print(f"Serving Open Graph cards on http://{args.host}:{args.port}/ "
+          f"(cards: {', '.join(sorted(CARDS))}; formats: {', '.join(sorted(server.formats))})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
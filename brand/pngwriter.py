@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev PNG Writer
+Minimal PNG encoder that searches filter and zlib strategy combinations
+
+Pillow picks one filter heuristic and one zlib strategy per file. Flat
+brand graphics compress very differently under each, so this writer
+filters the scanlines every way PNG allows (plus the per-row adaptive
+choice), deflates each candidate under every zlib strategy in parallel
+threads (zlib releases the GIL) and keeps the smallest stream. PNGStream
+writes images too large for memory band by band with a single filter pass.
+"""
+
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PNG color types
+GRAY, RGB, INDEXED, GRAY_ALPHA, RGBA = 0, 2, 3, 4, 6
+CHANNELS = {GRAY: 1, RGB: 3, INDEXED: 1, GRAY_ALPHA: 2, RGBA: 4}
+
+# Scanline filter types, plus 'adaptive' (best of these per row)
+NONE, SUB, UP, AVERAGE, PAETH = range(5)
+FILTER_NAMES = {NONE: 'none', SUB: 'sub', UP: 'up', AVERAGE: 'average', PAETH: 'paeth'}
+
+STRATEGIES = {
+    'default': zlib.Z_DEFAULT_STRATEGY,
+    'filtered': zlib.Z_FILTERED,
+    'rle': zlib.Z_RLE,
+    'huffman': zlib.Z_HUFFMAN_ONLY,
+}
+
+# Raw bytes filtered per step by PNGStream; the filter candidates take ~40x this
+STREAM_BYTES = 1024 * 1024
+
+_pool = ThreadPoolExecutor(max_workers=4)
+
+def chunk(kind, data=b''):
+    """One length-prefixed, CRC-suffixed PNG chunk."""
+    body = kind + data
+    return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body))
+
+def pack_rows(pixels, bit_depth):
+    """(height, width) indices packed to bit_depth bits per pixel, rows byte-aligned."""
+    if bit_depth == 8:
+        return pixels.astype(np.uint8)
+    per_byte = 8 // bit_depth
+    height, width = pixels.shape
+    padded = np.zeros((height, -(-width // per_byte) * per_byte), np.uint8)
+    padded[:, :width] = pixels
+    groups = padded.reshape(height, -1, per_byte)
+    shifts = np.arange(per_byte - 1, -1, -1, dtype=np.uint8) * bit_depth
+    return np.bitwise_or.reduce(groups << shifts, axis=2).astype(np.uint8)
+
+def filtered_rows(raw, bpp):
+    """{filter type: (height, 1 + row bytes) array with the filter byte prepended}."""
+    raw = raw.astype(np.int16)
+    left = np.zeros_like(raw)
+    left[:, bpp:] = raw[:, :-bpp]
+    up = np.zeros_like(raw)
+    up[1:] = raw[:-1]
+    upper_left = np.zeros_like(raw)
+    upper_left[1:, bpp:] = raw[:-1, :-bpp]
+
+    estimate = left + up - upper_left
+    pa, pb, pc = np.abs(estimate - left), np.abs(estimate - up), np.abs(estimate - upper_left)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upper_left))
+
+    predictions = {NONE: 0, SUB: left, UP: up, AVERAGE: (left + up) >> 1, PAETH: paeth}
+    rows = {}
+    for kind, predicted in predictions.items():
+        body = ((raw - predicted) & 0xFF).astype(np.uint8)
+        rows[kind] = np.hstack([np.full((raw.shape[0], 1), kind, np.uint8), body])
+    return rows
+
+def adaptive_rows(rows):
+    """Per row, the filter with the smallest sum of absolute signed bytes."""
+    stacked = np.stack([rows[kind] for kind in sorted(rows)])
+    cost = np.abs(stacked[:, :, 1:].view(np.int8).astype(np.int32)).sum(axis=2)
+    best = cost.argmin(axis=0)
+    return stacked[best, np.arange(stacked.shape[1])]
+
+def _deflate(data, strategy):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+    return compressor.compress(data) + compressor.flush()
+
+def best_idat(raw, bpp, strategies=STRATEGIES):
+    """Smallest deflate stream over every filter choice and zlib strategy.
+
+    Returns (compressed bytes, filter name, strategy name).
+    """
+    rows = filtered_rows(raw, bpp)
+    candidates = {FILTER_NAMES[kind]: r.tobytes() for kind, r in rows.items()}
+    candidates['adaptive'] = adaptive_rows(rows).tobytes()
+    jobs = {(name, strategy): _pool.submit(_deflate, data, code)
+            for name, data in candidates.items() for strategy, code in strategies.items()}
+    (filter_name, strategy), future = min(jobs.items(), key=lambda item: len(item[1].result()))
+    return future.result(), filter_name, strategy
+
+def encode_png(width, height, color_type, bit_depth, idat, palette=None, transparency=None):
+    """Assemble a PNG file from an already compressed IDAT stream."""
+    parts = [PNG_SIGNATURE,
+             chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0))]
+    if palette is not None:
+        parts.append(chunk(b'PLTE', bytes(np.asarray(palette, np.uint8).reshape(-1))))
+    if transparency:
+        parts.append(chunk(b'tRNS', bytes(transparency)))
+    parts += [chunk(b'IDAT', idat), chunk(b'IEND')]
+    return b''.join(parts)
+
+def encode_pixels(pixels, color_type, bit_depth=8, palette=None, transparency=None):
+    """PNG bytes for a (height, width[, channels]) uint8 array, searching filters and strategies.
+
+    Returns (png bytes, filter name, strategy name).
+    """
+    height, width = pixels.shape[:2]
+    if color_type == INDEXED:
+        raw, bpp = pack_rows(pixels, bit_depth), 1
+    else:
+        raw, bpp = pixels.reshape(height, -1), CHANNELS[color_type]
+    idat, filter_name, strategy = best_idat(raw, bpp)
+    return encode_png(width, height, color_type, bit_depth, idat, palette, transparency), filter_name, strategy
+
+class PNGStream:
+    """PNG written to a file in horizontal bands, for images too large to hold.
+
+    Each band is filtered per row (adaptive, with the previous band's last
+    row as the Up/Paeth reference) and fed to one running deflate stream;
+    compressed output goes out as IDAT chunks as it is produced. Memory is
+    bounded by the band size, not the image size.
+    """
+
+    def __init__(self, f, width, height, color_type, dpi=None, level=6):
+        self.f = f
+        self.width, self.height = width, height
+        self.bpp = CHANNELS[color_type]
+        self.rows = 0
+        self.previous = None
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9)
+        f.write(PNG_SIGNATURE)
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)))
+        if dpi:
+            per_meter = round(dpi / 0.0254)
+            f.write(chunk(b'pHYs', struct.pack('>IIB', per_meter, per_meter, 1)))
+
+    def write(self, pixels):
+        """Append a (rows, width, channels) uint8 band."""
+        raw = pixels.reshape(pixels.shape[0], -1)
+        step = max(1, STREAM_BYTES // raw.shape[1])
+        for start in range(0, raw.shape[0], step):
+            block = raw[start:start + step]
+            if self.previous is not None:
+                rows = adaptive_rows(filtered_rows(np.vstack([self.previous, block]), self.bpp))[1:]
+            else:
+                rows = adaptive_rows(filtered_rows(block, self.bpp))
+            self.previous = block[-1:].copy()
+            self.rows += block.shape[0]
+            self._emit(self.compressor.compress(rows.tobytes()))
+
+    def _emit(self, data):
+        if data:
+            self.f.write(chunk(b'IDAT', data))
+
+    def close(self):
+        if self.rows != self.height:
+            raise ValueError(f"PNG stream got {self.rows} rows, expected {self.height}")
+        self._emit(self.compressor.flush())
+        self.f.write(chunk(b'IEND'))
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Poster Renderer
+Print-resolution PNG or TIFF rendered in horizontal strips with bounded memory
+
+A 300 DPI poster of the web banner or hero graphic is 20k+ pixels wide,
+too large for one canvas. It is cut into horizontal strips of at most
+STRIP_BYTES, and each strip into tiles of at most TILE_WIDTH pixels, each
+rasterized alone with rasterize(region=...). Halos and text glows are
+computed in canvas space and cropped to the tile, so tiles join without
+seams and need no overlap. Tiles are rendered in worker processes, at most
+a few ahead of the writer; each finished strip is streamed into a PNG
+(pngwriter.PNGStream) or a deflate-compressed strip TIFF. Peak memory
+depends on the strip budget, tile width and job count, not on the poster
+size.
+
+    python poster.py web-banner web-banner-poster.tiff --width 24000 -j 4
+"""
+
+import argparse
+import math
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pngwriter import RGB, RGBA, PNGStream
+from scene import rasterize
+
+DEFAULT_DPI = 300
+# Uncompressed bytes per strip; with jobs * 2 strips in flight this caps memory
+STRIP_BYTES = 16 * 1024 * 1024
+# Widest tile; bounds the per-tile glow and halo buffers on very wide posters
+TILE_WIDTH = 4096
+
+def strip_rows(width, channels, budget=STRIP_BYTES):
+    """Rows per strip so one strip stays within budget bytes."""
+    return max(1, budget // (width * channels))
+
+def is_opaque(scene):
+    """True when every pixel of the scene is covered by an opaque background."""
+    background = scene.background
+    return background is not None and (len(background) == 3 or background[3] == 255)
+
+def tiles(width, height, rows, tile_width=TILE_WIDTH):
+    """Strips of tile boxes, top to bottom and left to right."""
+    return [[(left, top, min(left + tile_width, width), min(top + rows, height))
+             for left in range(0, width, tile_width)]
+            for top in range(0, height, rows)]
+
+def render_tile(scene, scale, box):
+    """(rows, columns, channels) uint8 pixels for one canvas box."""
+    img = rasterize(scene, scale, region=box)
+    if is_opaque(scene):
+        img = img.convert('RGB')
+    return np.asarray(img)
+
+_worker = {}
+
+def _init_worker(scene, scale):
+    _worker['scene'], _worker['scale'] = scene, scale
+
+def _worker_tile(box):
+    return render_tile(_worker['scene'], _worker['scale'], box)
+
+class TIFFStream:
+    """Baseline TIFF written strip by strip: Adobe Deflate strips, IFD last."""
+
+    def __init__(self, f, width, height, channels, rows_per_strip, dpi=None):
+        self.f = f
+        self.width, self.height, self.channels = width, height, channels
+        self.rows_per_strip = rows_per_strip
+        self.dpi = dpi
+        self.offsets, self.counts = [], []
+        self.rows = 0
+        # Header; the IFD offset is patched in close()
+        f.write(b'II*\x00\x00\x00\x00\x00')
+
+    def write(self, pixels):
+        """Append one strip of rows_per_strip rows (fewer for the last)."""
+        data = zlib.compress(np.ascontiguousarray(pixels).tobytes(), 6)
+        self.offsets.append(self.f.tell())
+        self.counts.append(len(data))
+        self.f.write(data)
+        if self.f.tell() % 2:
+            self.f.write(b'\x00')
+        self.rows += pixels.shape[0]
+
+    def close(self):
+        if self.rows != self.height:
+            raise ValueError(f"TIFF stream got {self.rows} rows, expected {self.height}")
+        resolution = [round(self.dpi or 72), 1]
+        # tag -> (type, values); types are SHORT, LONG and RATIONAL
+        tags = {
+            256: ('I', [self.width]),
+            257: ('I', [self.height]),
+            258: ('H', [8] * self.channels),
+            259: ('H', [8]),  # Adobe Deflate
+            262: ('H', [2]),  # RGB
+            273: ('I', self.offsets),
+            277: ('H', [self.channels]),
+            278: ('I', [self.rows_per_strip]),
+            279: ('I', self.counts),
+            282: ('R', resolution),
+            283: ('R', resolution),
+            284: ('H', [1]),  # chunky
+            296: ('H', [2]),  # inches
+        }
+        if self.channels == 4:
+            tags[338] = ('H', [2])  # unassociated alpha
+        entries = []
+        for tag, (fmt, values) in sorted(tags.items()):
+            kind, count = {'H': 3, 'I': 4, 'R': 5}[fmt], len(values) // (2 if fmt == 'R' else 1)
+            data = struct.pack(f'<{len(values)}{"I" if fmt == "R" else fmt}', *values)
+            if len(data) <= 4:
+                value = data.ljust(4, b'\x00')
+            else:
+                # Values that do not fit in the entry go before the IFD
+                value = struct.pack('<I', self.f.tell())
+                self.f.write(data)
+            entries.append(struct.pack('<HHI', tag, kind, count) + value)
+        if self.f.tell() % 2:
+            self.f.write(b'\x00')
+        ifd = self.f.tell()
+        self.f.write(struct.pack('<H', len(entries)) + b''.join(entries) + struct.pack('<I', 0))
+        self.f.seek(4)
+        self.f.write(struct.pack('<I', ifd))
+
+def render_poster(scene, path, scale, dpi=DEFAULT_DPI, jobs=None, budget=STRIP_BYTES):
+    """Render scene at scale into path (.png or .tif/.tiff) strip by strip.
+
+    Returns (width, height, strip count, tile count).
+    """
+    width, height = scene.width * scale, scene.height * scale
+    channels = 3 if is_opaque(scene) else 4
+    rows = strip_rows(width, channels, budget)
+    strips = tiles(width, height, rows)
+    jobs = jobs or os.cpu_count() or 1
+
+    with open(path, 'wb') as f:
+        if os.path.splitext(path)[1].lower() in ('.tif', '.tiff'):
+            writer = TIFFStream(f, width, height, channels, rows, dpi)
+        else:
+            writer = PNGStream(f, width, height, RGB if channels == 3 else RGBA, dpi)
+        if jobs == 1:
+            for strip in strips:
+                writer.write(np.hstack([render_tile(scene, scale, box) for box in strip]))
+        else:
+            with ProcessPoolExecutor(jobs, initializer=_init_worker,
+                                     initargs=(scene, scale)) as pool:
+                # Keep about 2 * jobs tiles queued; write each strip once its tiles are in
+                pending = deque()
+                for strip in strips:
+                    pending.append([pool.submit(_worker_tile, box) for box in strip])
+                    while sum(map(len, pending)) > 2 * jobs and len(pending) > 1:
+                        writer.write(np.hstack([tile.result() for tile in pending.popleft()]))
+                while pending:
+                    writer.write(np.hstack([tile.result() for tile in pending.popleft()]))
+        writer.close()
+    return width, height, len(strips), sum(map(len, strips))
+
+def main(argv=None):
+    import generate_assets
+    import generate_marketing
+    from theme import DEFAULT_THEME, PALETTES, use
+
+    scenes = {**generate_assets.SCENES, **generate_marketing.SCENES}
+    parser = argparse.ArgumentParser(description="Render a brand scene at print resolution in strips.")
+    parser.add_argument('scene', choices=sorted(scenes))
+    parser.add_argument('output', help="output path (.png, .tif or .tiff)")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--scale', type=int, help="integer multiple of the scene size")
+    size.add_argument('--width', type=int, default=20000,
+                      help="minimum output width in pixels (default 20000)")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI, help=f"resolution tag (default {DEFAULT_DPI})")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--strip-mib', type=int, default=STRIP_BYTES >> 20,
+                        help=f"uncompressed MiB per strip (default {STRIP_BYTES >> 20})")
+    parser.add_argument('--theme', choices=sorted(PALETTES), default=DEFAULT_THEME,
+                        help=f"brand palette (default {DEFAULT_THEME})")
+    args = parser.parse_args(argv)
+
+    with use(args.theme):
+        scene = scenes[args.scene]()
+    scale = args.scale or math.ceil(args.width / scene.width)
+    start = time.perf_counter()
+    width, height, strip_count, tile_count = render_poster(scene, args.output, scale, args.dpi, args.jobs,
+                                         args.strip_mib << 20)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.output}: {width}x{height} ({width / args.dpi:.1f}x{height / args.dpi:.1f} in "
+          f"at {args.dpi} DPI), {strip_count} strips of {tile_count} tiles in {elapsed:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Palette Quantization
+Indexed-PNG encoding for flat, low-color brand graphics
+
+Brand art is a few theme colors plus anti-aliased ramps between them. An
+image with at most 256 distinct RGBA values is indexed losslessly; one with
+a few thousand is mapped onto a 256-entry palette seeded with the theme
+colors (which therefore stay exact) and refined by weighted k-means in
+premultiplied space, then kept only if it stays above QUALITY_DB PSNR.
+Alpha rides along in tRNS, with translucent entries sorted first so the
+chunk stays short. Images that do not index fall back to truecolor; both
+go through the filter and strategy search of pngwriter.
+"""
+
+import math
+
+import numpy as np
+
+from pngwriter import INDEXED, RGB, RGBA, encode_pixels
+
+MAX_COLORS = 256
+# Above this many distinct colors an image is not flat art; leave it truecolor
+LOW_COLOR_LIMIT = 8192
+# Minimum PSNR (premultiplied RGBA) for a lossy palette
+QUALITY_DB = 42.0
+KMEANS_ROUNDS = 4
+
+def _premultiplied(colors):
+    colors = colors.astype(np.float32)
+    return np.concatenate([colors[:, :3] * colors[:, 3:] / 255, colors[:, 3:]], axis=1)
+
+def _straight(premultiplied):
+    alpha = premultiplied[:, 3:]
+    rgb = np.where(alpha > 0, premultiplied[:, :3] * 255 / np.maximum(alpha, 1e-6), 0)
+    return np.clip(np.round(np.concatenate([rgb, alpha], axis=1)), 0, 255).astype(np.uint8)
+
+def _nearest(points, centers, block=2048):
+    """Index of the nearest center for each point, in blocks to bound memory."""
+    out = np.empty(len(points), np.intp)
+    for start in range(0, len(points), block):
+        chunk = points[start:start + block]
+        distance = ((chunk[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        out[start:start + block] = distance.argmin(axis=1)
+    return out
+
+def seeded_palette(colors, counts, seeds, max_colors=MAX_COLORS, rounds=KMEANS_ROUNDS):
+    """max_colors entries (straight RGBA) for the distinct colors, keeping seeds fixed.
+
+    The remaining entries start at the most frequent colors and move to the
+    weighted centroid of their members each round; empty ones are re-seeded
+    at the worst-represented color.
+    """
+    points = _premultiplied(colors)
+    fixed = _premultiplied(np.asarray(seeds, np.uint8).reshape(-1, 4))[:max_colors]
+    free = max_colors - len(fixed)
+    order = np.argsort(-counts, kind='stable')
+    centers = np.concatenate([fixed, points[order[:free]]])
+    weights = counts.astype(np.float32)
+    for _ in range(rounds):
+        members = _nearest(points, centers)
+        error = ((points - centers[members]) ** 2).sum(axis=1) * weights
+        for k in range(len(fixed), len(centers)):
+            mask = members == k
+            if mask.any():
+                w = weights[mask][:, None]
+                centers[k] = (points[mask] * w).sum(axis=0) / w.sum()
+            else:
+                worst = error.argmax()
+                centers[k] = points[worst]
+                error[worst] = 0
+    return _straight(centers)
+
+def palette_image(img, seeds=(), quality=QUALITY_DB):
+    """(indices, palette) for an image that indexes well, else None.
+
+    indices is a (height, width) uint8 array into palette, an (n, 4) array
+    of straight RGBA with translucent entries first.
+    """
+    rgba = np.ascontiguousarray(np.asarray(img.convert('RGBA')))
+    keys = rgba.reshape(-1, 4).view(np.uint32).ravel()
+    distinct, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    if len(distinct) > LOW_COLOR_LIMIT:
+        return None
+    colors = distinct.view(np.uint8).reshape(-1, 4)
+    if len(colors) <= MAX_COLORS:
+        palette, mapping = colors, np.arange(len(colors))
+    else:
+        palette = seeded_palette(colors, counts, list(seeds) + [(0, 0, 0, 0)])
+        mapping = _nearest(_premultiplied(colors), _premultiplied(palette))
+        error = ((_premultiplied(colors) - _premultiplied(palette)[mapping]) ** 2).sum(axis=1)
+        mse = (error * counts).sum() / (len(keys) * 4)
+        if mse > 0 and 10 * math.log10(255 ** 2 / mse) < quality:
+            return None
+
+    # Used entries only: translucent first, then most frequent first
+    usage = np.bincount(mapping, weights=counts, minlength=len(palette))
+    used = np.flatnonzero(usage)
+    used = used[np.lexsort((-usage[used], palette[used, 3] == 255))]
+    remap = np.zeros(len(palette), np.uint8)
+    remap[used] = np.arange(len(used))
+    indices = remap[mapping][inverse].reshape(rgba.shape[:2])
+    return indices, palette[used]
+
+def _bit_depth(colors):
+    return next(bits for bits in (1, 2, 4, 8) if colors <= 1 << bits)
+
+def optimize_png(img, seeds=()):
+    """Smallest PNG for img: indexed when it quantizes cleanly, else truecolor.
+
+    Returns (png bytes, description such as 'indexed 9 colors 4-bit, none/filtered').
+    """
+    indexed = palette_image(img, seeds)
+    if indexed is not None:
+        indices, palette = indexed
+        alpha = palette[:, 3]
+        transparency = alpha[:np.count_nonzero(alpha < 255)]
+        bits = _bit_depth(len(palette))
+        data, filter_name, strategy = encode_pixels(indices, INDEXED, bits, palette[:, :3],
+                                                    transparency.tobytes())
+        return data, f'indexed {len(palette)} colors {bits}-bit, {filter_name}/{strategy}'
+    pixels = np.asarray(img.convert('RGBA'))
+    if (pixels[..., 3] == 255).all():
+        data, filter_name, strategy = encode_pixels(np.ascontiguousarray(pixels[..., :3]), RGB)
+        return data, f'rgb, {filter_name}/{strategy}'
+    data, filter_name, strategy = encode_pixels(pixels, RGBA)
+    return data, f'rgba, {filter_name}/{strategy}'
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Supersampled Rasterizer
+Draw a master once at N x resolution and derive every size in one downscale
+"""
+
+import math
+
+from PIL import Image, ImageDraw
+
+# Master resolution multiplier; 4x gives smooth ellipses and diagonals
+SUPERSAMPLE = 4
+
+class ScaledDraw:
+    """ImageDraw proxy that takes final-size coordinates and draws at scale.
+
+    Boxes keep PIL's inclusive-pixel meaning (a box covers the same area
+    once reduced); line and polygon points map to pixel centers; stroke
+    widths and radii are multiplied by the scale. origin is the scaled-pixel
+    position of the image's top-left corner and extent the scaled canvas
+    size, for drawing one window of a larger canvas.
+
+    PIL rounds a shape's edges differently once the image border cuts it,
+    so a shape the window cuts (but the canvas does not) is drawn whole on
+    a scratch image and the window's part copied back; drawing overwrites
+    rather than blends, so windows match the full render pixel for pixel.
+    """
+
+    def __init__(self, img, scale=SUPERSAMPLE, origin=(0, 0), extent=None):
+        self.img = img
+        self.draw = ImageDraw.Draw(img)
+        self.scale = scale
+        self.origin = origin
+        self.extent = extent or (origin[0] + img.width, origin[1] + img.height)
+
+    def _box(self, box):
+        s = self.scale
+        x0, y0, x1, y1 = box
+        return [x0 * s, y0 * s, (x1 + 1) * s - 1, (y1 + 1) * s - 1]
+
+    def _points(self, points):
+        s = self.scale
+        offset = (s - 1) / 2
+        return [(x * s + offset, y * s + offset) for x, y in points]
+
+    def _width(self, width):
+        return max(1, round(width * self.scale))
+
+    def _paint(self, method, xy, bounds, *args, **kwargs):
+        """ImageDraw.<method> at canvas coordinates xy; bounds is the shape's (l, t, r, b)."""
+        ox, oy = self.origin
+        window = (ox, oy, ox + self.img.width, oy + self.img.height)
+        # The canvas clips the full render too; only the window's own cut differs
+        left, top = max(int(bounds[0]), 0), max(int(bounds[1]), 0)
+        right = min(math.ceil(bounds[2]), self.extent[0])
+        bottom = min(math.ceil(bounds[3]), self.extent[1])
+        if left >= window[0] and top >= window[1] and right <= window[2] and bottom <= window[3]:
+            getattr(self.draw, method)(_shifted(xy, ox, oy), *args, **kwargs)
+            return
+        overlap = (max(left, window[0]), max(top, window[1]),
+                   min(right, window[2]), min(bottom, window[3]))
+        if overlap[0] >= overlap[2] or overlap[1] >= overlap[3]:
+            return
+        scratch = Image.new(self.img.mode, (right - left, bottom - top))
+        inside = (overlap[0] - left, overlap[1] - top, overlap[2] - left, overlap[3] - top)
+        scratch.paste(self.img.crop((overlap[0] - ox, overlap[1] - oy, overlap[2] - ox, overlap[3] - oy)),
+                      inside[:2])
+        getattr(ImageDraw.Draw(scratch), method)(_shifted(xy, left, top), *args, **kwargs)
+        self.img.paste(scratch.crop(inside), (overlap[0] - ox, overlap[1] - oy))
+
+    def _paint_box(self, method, box, *args, **kwargs):
+        xy = self._box(box)
+        self._paint(method, xy, (xy[0], xy[1], xy[2] + 1, xy[3] + 1), *args, **kwargs)
+
+    def _paint_points(self, method, points, **kwargs):
+        xy = self._points(points)
+        # Wide strokes and curved joints reach about a stroke width past the points
+        pad = kwargs['width'] + 2
+        xs, ys = [x for x, _ in xy], [y for _, y in xy]
+        self._paint(method, xy, (min(xs) - pad, min(ys) - pad, max(xs) + pad + 1, max(ys) + pad + 1),
+                    **kwargs)
+
+    def ellipse(self, box, fill=None, outline=None, width=1):
+        self._paint_box('ellipse', box, fill=fill, outline=outline, width=self._width(width))
+
+    def rectangle(self, box, fill=None, outline=None, width=1):
+        self._paint_box('rectangle', box, fill=fill, outline=outline, width=self._width(width))
+
+    def rounded_rectangle(self, box, radius=0, fill=None, outline=None, width=1):
+        self._paint_box('rounded_rectangle', box, radius=radius * self.scale, fill=fill,
+                        outline=outline, width=self._width(width))
+
+    def arc(self, box, start, end, fill=None, width=1):
+        self._paint_box('arc', box, start, end, fill=fill, width=self._width(width))
+
+    def line(self, points, fill=None, width=1):
+        self._paint_points('line', points, fill=fill, width=self._width(width), joint='curve')
+
+    def polygon(self, points, fill=None, outline=None, width=1):
+        self._paint_points('polygon', points, fill=fill, outline=outline, width=self._width(width))
+
+def _shifted(xy, dx, dy):
+    """Box [x0, y0, x1, y1] or point list moved by (-dx, -dy)."""
+    if xy and isinstance(xy[0], tuple):
+        return [(x - dx, y - dy) for x, y in xy]
+    x0, y0, x1, y1 = xy
+    return [x0 - dx, y0 - dy, x1 - dx, y1 - dy]
+
+def _premultiplied(img):
+    return img.convert('RGBa') if img.mode == 'RGBA' else img
+
+def _unpremultiplied(img):
+    return img.convert('RGBA') if img.mode == 'RGBa' else img
+
+def downscale(master, size):
+    """One high-quality pass from the master to a final size.
+
+    Exact integer factors use Image.reduce (a box filter); anything else
+    uses LANCZOS. Alpha is premultiplied so transparent edges do not fringe.
+    """
+    width, height = (size, size) if isinstance(size, int) else size
+    src = _premultiplied(master)
+    if master.width % width == 0 and master.width // width == master.height // height \
+            and master.height % height == 0:
+        out = src.reduce(master.width // width)
+    else:
+        out = src.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+    return _unpremultiplied(out)
+
+def derive_sizes(master, sizes):
+    """Map each requested size to a downscaled copy of the master."""
+    return {size: downscale(master, size) for size in sizes}
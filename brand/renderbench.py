@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Renderer Benchmarks
+Times every brand and marketing renderer in isolation, cold and warm
+
+Cold runs execute each task as the first call in a fresh interpreter, so
+font, tile and template caches start empty; warm runs repeat it in-process
+after a warm-up call. Results are stored in brand/.benchmarks.json keyed by
+git commit and can be compared against an earlier run.
+
+    python renderbench.py                   # benchmark everything and save
+    python renderbench.py -k icon --compare # compare with the previous run
+    python renderbench.py --profile prof/   # cProfile each renderer as well
+"""
+
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from multiprocessing import get_context
+
+import PIL
+import numpy
+
+from build import BRAND_DIR, TARGETS, collect_tasks
+
+RESULTS_PATH = os.path.join(BRAND_DIR, '.benchmarks.json')
+
+# Relative slowdown that counts as a regression, and the absolute floor
+# below which timing differences are treated as noise
+DEFAULT_THRESHOLD = 0.10
+NOISE_FLOOR_MS = 1.0
+
+def commit_key():
+    """Short HEAD hash, suffixed with +dirty when brand/ has local changes."""
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=BRAND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    try:
+        head = git('rev-parse', '--short', 'HEAD')
+        dirty = git('status', '--porcelain', '--untracked-files=no', '--', '.')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return head + ('+dirty' if dirty else '')
+
+def peak_rss_mib():
+    """Peak resident set size of this process so far.
+
+    Prefers Linux's VmHWM: ru_maxrss survives fork and exec, so a child
+    would report the parent's peak.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def time_task(t):
+    """One call of a task with its output silenced: (wall ms, CPU ms)."""
+    with redirect_stdout(io.StringIO()):
+        wall, cpu = time.perf_counter(), time.process_time()
+        t.func(*t.args, **t.kwargs)
+        return (time.perf_counter() - wall) * 1000, (time.process_time() - cpu) * 1000
+
+def traced_peak_mib(t):
+    """Peak Python and NumPy heap allocated during one call of a task.
+
+    Pillow's image buffers are allocated outside the Python allocator and
+    are not counted; the cold run's RSS covers them.
+    """
+    tracemalloc.start()
+    try:
+        with redirect_stdout(io.StringIO()):
+            t.func(*t.args, **t.kwargs)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+def _cold_run(targets, name, output_root):
+    """Child-process entry: render one task in a fresh interpreter."""
+    t = {t.name: t for t in collect_tasks(targets, output_root)}[name]
+    baseline = peak_rss_mib()
+    wall, cpu = time_task(t)
+    peak = peak_rss_mib()
+    return {'wall_ms': wall, 'cpu_ms': cpu, 'peak_rss_mib': peak, 'rss_growth_mib': peak - baseline}
+
+def cold(targets, t, output_root):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+        return pool.submit(_cold_run, targets, t.name, output_root).result()
+
+def warm(t, repeat):
+    time_task(t)
+    runs = [time_task(t) for _ in range(repeat)]
+    walls = [wall for wall, _ in runs]
+    return {
+        'wall_ms': statistics.median(walls),
+        'wall_min_ms': min(walls),
+        'cpu_ms': statistics.median(cpu for _, cpu in runs),
+        'traced_peak_mib': traced_peak_mib(t),
+    }
+
+def profile(t, profile_dir, top=25):
+    """Dump cProfile stats for one warm call as .prof plus a text summary."""
+    stem = os.path.join(profile_dir, t.name.replace(':', '-'))
+    profiler = cProfile.Profile()
+    with redirect_stdout(io.StringIO()):
+        profiler.runcall(t.func, *t.args, **t.kwargs)
+    profiler.dump_stats(stem + '.prof')
+    with open(stem + '.txt', 'w') as f:
+        pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(top)
+    return stem + '.prof'
+
+def benchmark(tasks, targets, output_root, repeat=5, run_cold=True, profile_dir=None):
+    """Measure each task; warm runs go first so dependency outputs exist for cold ones."""
+    results = {}
+    for t in tasks:
+        results[t.name] = {'warm': warm(t, repeat)}
+        if profile_dir:
+            profile(t, profile_dir)
+    if run_cold:
+        for t in tasks:
+            results[t.name]['cold'] = cold(targets, t, output_root)
+    return results
+
+def load_results(path=RESULTS_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_results(store, path=RESULTS_PATH):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(store, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, path)
+
+# (phase, metric, unit) compared between runs
+COMPARED = [
+    ('warm', 'wall_ms', 'ms'),
+    ('warm', 'traced_peak_mib', 'MiB'),
+    ('cold', 'wall_ms', 'ms'),
+    ('cold', 'rss_growth_mib', 'MiB'),
+]
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Regressions as (renderer, metric, old, new) where new > old * (1 + threshold)."""
+    regressions = []
+    for name, run in sorted(current.items()):
+        old_run = baseline.get(name)
+        if not old_run:
+            continue
+        for phase, metric, unit in COMPARED:
+            old = old_run.get(phase, {}).get(metric)
+            new = run.get(phase, {}).get(metric)
+            if old is None or new is None:
+                continue
+            floor = NOISE_FLOOR_MS if unit == 'ms' else 0.5
+            if new > old * (1 + threshold) and new - old > floor:
+                regressions.append((name, f'{phase} {metric}', old, new))
+    return regressions
+
+def report(results):
+    print(f"{'renderer':<34} {'warm ms':>9} {'cpu ms':>8} {'heap MiB':>9} {'cold ms':>9} {'rss MiB':>8}")
+    print("-" * 82)
+    for name, run in results.items():
+        w, c = run['warm'], run.get('cold', {})
+        cold_ms = f"{c['wall_ms']:9.1f}" if c else f"{'-':>9}"
+        cold_rss = f"{c['rss_growth_mib']:8.1f}" if c else f"{'-':>8}"
+        print(f"{name:<34} {w['wall_ms']:9.1f} {w['cpu_ms']:8.1f} {w['traced_peak_mib']:9.2f} {cold_ms} {cold_rss}")
+    total = sum(run['warm']['wall_ms'] for run in results.values())
+    print(f"{'total (warm)':<34} {total:9.1f}")
+
+def _previous_key(store, key):
+    others = [k for k in store if k != key]
+    return max(others, key=lambda k: store[k]['date']) if others else None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every brand renderer in isolation.")
+    parser.add_argument('targets', nargs='*', metavar='target',
+                        help=f"one of {', '.join(sorted(TARGETS))} (default: all)")
+    parser.add_argument('-k', '--match', default='', help="only renderers whose task name contains this")
+    parser.add_argument('-n', '--repeat', type=int, default=5, help="warm runs per renderer (default 5)")
+    parser.add_argument('--no-cold', action='store_true', help="skip the fresh-process cold runs")
+    parser.add_argument('--profile', metavar='DIR', help="write cProfile .prof and .txt stats per renderer")
+    parser.add_argument('--compare', nargs='?', const='previous', metavar='COMMIT',
+                        help="flag regressions against a stored run (default: the previous one)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"relative slowdown counted as a regression (default {DEFAULT_THRESHOLD})")
+    parser.add_argument('--no-save', action='store_true', help=f"do not record results in {RESULTS_PATH}")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.targets) - set(TARGETS))
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)}")
+
+    targets = args.targets or sorted(TARGETS)
+    store = load_results()
+    key = commit_key()
+    baseline_key = None
+    if args.compare:
+        baseline_key = _previous_key(store, key) if args.compare == 'previous' else args.compare
+        if baseline_key not in store:
+            parser.error(f"no stored benchmark run for {args.compare!r}")
+        baseline = dict(store[baseline_key]['renderers'])
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix='renderbench-') as output_root:
+        tasks = [t for t in collect_tasks(targets, output_root) if args.match in t.name]
+        print(f"Benchmarking {len(tasks)} renderer(s) at {key} "
+              f"({args.repeat} warm runs{'' if args.no_cold else ' + 1 cold'})...")
+        print("=" * 82)
+        results = benchmark(tasks, targets, output_root, args.repeat, not args.no_cold, args.profile)
+    report(results)
+    if args.profile:
+        print(f"Profiles written to {args.profile}/")
+
+    if not args.no_save:
+        entry = store.setdefault(key, {'renderers': {}})
+        entry['renderers'].update(results)
+        entry.update({
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': args.repeat,
+            'python': sys.version.split()[0],
+            'pillow': PIL.__version__,
+            'numpy': numpy.__version__,
+        })
+        save_results(store)
+
+    if baseline_key:
+        regressions = compare(results, baseline, args.threshold)
+        print()
+        print(f"Compared with {baseline_key} (threshold {args.threshold:.0%}): "
+              f"{len(regressions)} regression(s)")
+        for name, metric, old, new in regressions:
+            print(f"  {name:<34} {metric:<22} {old:9.2f} -> {new:9.2f}  (+{(new / old - 1):.0%})")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
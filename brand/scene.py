@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Scene Model
+Record an asset's geometry once and emit it as PNG, PDF or SVG
+
+A Scene exposes the ImageDraw calls the renderers already use (ellipse,
+line, polygon, rectangle, ...) but records them instead of drawing. The
+backends below replay the recording: rasterize() through the supersampling
+ScaledDraw, write_pdf() through reportlab with the Y axis flipped, and
+to_svg() as markup. Coordinates are top-left-origin pixels at final size.
+
+    python scene.py logo logo.svg
+"""
+
+import argparse
+import math
+import os
+from collections import namedtuple
+from xml.sax.saxutils import escape
+from PIL import Image
+from reportlab.lib.colors import Color
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from fonts import font_path, get_font
+from glyphs import draw_text
+from glow import GLOW_LAYERS, add_glow_text, glow_padding, to_rgba
+from halo import SHAPES as HALO_SHAPES, draw_halo, falloff
+from raster import ScaledDraw, downscale
+from shaping import text_bbox
+from tiles import grid
+
+Shape = namedtuple('Shape', ['kind', 'xy', 'fill', 'outline', 'width', 'options'])
+
+class Scene:
+    """Drawing recorder with an ImageDraw-like API."""
+
+    def __init__(self, width, height, background=None, grid=None):
+        self.width = width
+        self.height = height
+        self.background = background
+        # (spacing, line color) of a 1px background grid
+        self.grid = grid
+        self.items = []
+
+    def _add(self, kind, xy, fill=None, outline=None, width=1, **options):
+        self.items.append(Shape(kind, xy, fill, outline, width, options))
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self._add('ellipse', list(xy), fill, outline, width)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self._add('rectangle', list(xy), fill, outline, width)
+
+    def rounded_rectangle(self, xy, radius=0, fill=None, outline=None, width=1):
+        self._add('rounded_rectangle', list(xy), fill, outline, width, radius=radius)
+
+    def arc(self, xy, start, end, fill=None, width=1):
+        self._add('arc', list(xy), None, fill, width, start=start, end=end)
+
+    def line(self, xy, fill=None, width=1):
+        self._add('line', [tuple(p) for p in xy], None, fill, width)
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self._add('polygon', [tuple(p) for p in xy], fill, outline, width)
+
+    def text(self, xy, text, size, fill, role='sans'):
+        """Text with its top-left (ascender line) at xy, as ImageDraw.text."""
+        self._add('text', tuple(xy), fill, None, 0, text=text, size=size, role=role)
+
+    def glow_text(self, xy, text, size, fill, glow=None, role='sans'):
+        self._add('glow_text', tuple(xy), fill, None, 0, text=text, size=size, role=role,
+                  glow=glow if glow is not None else fill)
+
+    def halo(self, shape, color, spread, strength=0.25, inner=None, power=2.0, **geometry):
+        """Soft glow around a circle (center, radius), ring (center, radius,
+        width) or polygon (points); see halo.falloff for the curve."""
+        if shape not in HALO_SHAPES:
+            raise ValueError(f"Unknown halo shape: {shape}")
+        self._add('halo', None, color, None, 0, shape=shape, geometry=geometry, spread=spread,
+                  strength=strength, inner=strength if inner is None else inner, power=power)
+
+# Raster backend
+
+def _scaled_layers(scale):
+    return tuple((radius * scale, strength) for radius, strength in GLOW_LAYERS)
+
+def _raster_text(img, shape, scale, origin=(0, 0)):
+    opts = shape.options
+    font = get_font(round(opts['size'] * scale), opts['role'])
+    x, y = shape.xy
+    pos = (round(x * scale) - origin[0], round(y * scale) - origin[1])
+    pad = glow_padding(_scaled_layers(scale)) if shape.kind == 'glow_text' else 0
+    left, top, right, bottom = text_bbox(font, opts['text'])
+    if pos[1] + bottom + pad < 0 or pos[1] - pad >= img.height \
+            or pos[0] + right + pad < 0 or pos[0] - pad >= img.width:
+        return
+    if shape.kind == 'glow_text':
+        add_glow_text(img, opts['text'], pos, font, shape.fill, opts['glow'], _scaled_layers(scale))
+    else:
+        fill = to_rgba(shape.fill)[:len(img.getbands())]
+        draw_text(img, pos, opts['text'], font, fill)
+
+def rasterize(scene, scale=1, into=None, region=None):
+    """Render the scene to an image scale times the final size.
+
+    into, if given, is an image of that size to draw on in place of a fresh
+    canvas; the scene's background and grid are then skipped. region, a
+    (left, top, right, bottom) box in scaled pixels, renders only that
+    window of the canvas: glows and halos are computed in canvas space and
+    shapes outside the window are skipped, so adjacent regions join
+    seamlessly into the full render.
+    """
+    extent = (scene.width * scale, scene.height * scale)
+    region = region or (0, 0) + extent
+    origin = tuple(region[:2])
+    size = (region[2] - region[0], region[3] - region[1])
+    background = scene.background if scene.background is not None else (0, 0, 0, 0)
+    if into is not None:
+        img = into
+    elif scene.grid:
+        spacing, line_color = scene.grid
+        img = grid(size[0], size[1], spacing * scale, line_color, background, origin)
+    else:
+        img = Image.new('RGBA' if len(background) == 4 else 'RGB', size, background)
+
+    draw = ScaledDraw(img, scale, origin, extent)
+    for shape in scene.items:
+        if shape.kind in ('text', 'glow_text'):
+            _raster_text(img, shape, scale, origin)
+        elif shape.kind == 'halo':
+            opts = shape.options
+            draw_halo(img, opts['shape'], opts['geometry'], shape.fill, opts['spread'],
+                      opts['strength'], opts['inner'], opts['power'], scale, origin, extent)
+        elif shape.kind == 'line':
+            draw.line(shape.xy, fill=shape.outline, width=shape.width)
+        elif shape.kind == 'arc':
+            draw.arc(shape.xy, shape.options['start'], shape.options['end'],
+                     fill=shape.outline, width=shape.width)
+        elif shape.kind == 'rounded_rectangle':
+            draw.rounded_rectangle(shape.xy, radius=shape.options['radius'], fill=shape.fill,
+                                   outline=shape.outline, width=shape.width)
+        else:
+            getattr(draw, shape.kind)(shape.xy, fill=shape.fill, outline=shape.outline,
+                                      width=shape.width)
+    return img
+
+# PDF backend
+
+_PDF_FONTS = {}
+
+def _pdf_font(role):
+    if role not in _PDF_FONTS:
+        name = f'Brand-{role}'
+        pdfmetrics.registerFont(TTFont(name, font_path(role)))
+        _PDF_FONTS[role] = name
+    return _PDF_FONTS[role]
+
+def _pdf_color(color):
+    r, g, b, a = to_rgba(color)
+    return Color(r / 255, g / 255, b / 255, alpha=a / 255)
+
+def _box_center(box):
+    x0, y0, x1, y1 = box
+    return (x0 + x1) / 2, (y0 + y1) / 2, (x1 - x0) / 2, (y1 - y0) / 2
+
+# Opacity bands used to approximate a halo's falloff in PDF
+PDF_HALO_STEPS = 8
+
+def _pdf_dilated(c, opts, grow, fy):
+    """Draw the halo shape grown outward by grow units with the current fill."""
+    g = opts['geometry']
+    if opts['shape'] == 'circle':
+        cx, cy = g['center']
+        c.circle(cx, fy(cy), g['radius'] + grow, fill=1, stroke=0)
+    elif opts['shape'] == 'ring':
+        cx, cy = g['center']
+        c.setLineWidth(g['width'] + 2 * grow)
+        c.circle(cx, fy(cy), g['radius'], fill=0, stroke=1)
+    else:
+        path = c.beginPath()
+        (x0, y0), rest = g['points'][0], g['points'][1:]
+        path.moveTo(x0, fy(y0))
+        for x, y in rest:
+            path.lineTo(x, fy(y))
+        path.close()
+        c.setLineJoin(1)
+        c.setLineWidth(2 * grow)
+        c.drawPath(path, fill=1, stroke=int(grow > 0))
+
+def _pdf_halo(c, shape, fy):
+    """Stack translucent dilations whose combined opacity follows the falloff."""
+    opts = shape.options
+    r, g, b, a = to_rgba(shape.fill)
+    spread = opts['spread']
+    covered = 0.0
+    bands = [spread * (k - 0.5) / PDF_HALO_STEPS for k in range(PDF_HALO_STEPS, 0, -1)]
+    for grow, target in [(d, float(falloff(d, spread, opts['strength'], 0, opts['power'])))
+                         for d in bands] + [(0, opts['inner'])]:
+        if target <= covered:
+            continue
+        alpha = 1 - (1 - target) / (1 - covered)
+        covered = target
+        color = Color(r / 255, g / 255, b / 255, alpha=alpha * a / 255)
+        c.setFillColor(color)
+        c.setStrokeColor(color)
+        _pdf_dilated(c, opts, grow, fy)
+
+def write_pdf(scene, path):
+    """Write the scene as a vector PDF page of the final size."""
+    height = scene.height
+    # invariant drops the timestamp and random document id, so rebuilds are byte-identical
+    c = canvas.Canvas(path, pagesize=(scene.width, height), invariant=1)
+
+    def fy(y):
+        return height - y
+
+    if scene.background is not None and to_rgba(scene.background)[3]:
+        c.setFillColor(_pdf_color(scene.background))
+        c.rect(0, 0, scene.width, height, fill=1, stroke=0)
+    if scene.grid:
+        spacing, line_color = scene.grid
+        c.setStrokeColor(_pdf_color(line_color))
+        c.setLineWidth(1)
+        for x in range(0, scene.width, spacing):
+            c.line(x + 0.5, 0, x + 0.5, height)
+        for y in range(0, height, spacing):
+            c.line(0, fy(y + 0.5), scene.width, fy(y + 0.5))
+
+    for shape in scene.items:
+        fill = shape.fill is not None
+        stroke = shape.outline is not None
+        if fill:
+            c.setFillColor(_pdf_color(shape.fill))
+        if stroke:
+            c.setStrokeColor(_pdf_color(shape.outline))
+            c.setLineWidth(shape.width)
+        kind = shape.kind
+        if kind == 'halo':
+            _pdf_halo(c, shape, fy)
+        elif kind == 'ellipse':
+            cx, cy, rx, ry = _box_center(shape.xy)
+            c.ellipse(cx - rx, fy(cy) - ry, cx + rx, fy(cy) + ry, fill=int(fill), stroke=int(stroke))
+        elif kind in ('rectangle', 'rounded_rectangle'):
+            x0, y0, x1, y1 = shape.xy
+            radius = shape.options.get('radius', 0)
+            if radius:
+                c.roundRect(x0, fy(y1), x1 - x0, y1 - y0, radius, fill=int(fill), stroke=int(stroke))
+            else:
+                c.rect(x0, fy(y1), x1 - x0, y1 - y0, fill=int(fill), stroke=int(stroke))
+        elif kind == 'arc':
+            x0, y0, x1, y1 = shape.xy
+            start, end = shape.options['start'], shape.options['end']
+            c.arc(x0, fy(y1), x1, fy(y0), startAng=-end, extent=end - start)
+        elif kind in ('line', 'polygon'):
+            path = c.beginPath()
+            path.moveTo(shape.xy[0][0], fy(shape.xy[0][1]))
+            for x, y in shape.xy[1:]:
+                path.lineTo(x, fy(y))
+            if kind == 'polygon':
+                path.close()
+            c.drawPath(path, fill=int(fill), stroke=int(stroke))
+        elif kind in ('text', 'glow_text'):
+            opts = shape.options
+            ascent = get_font(opts['size'], opts['role']).getmetrics()[0]
+            c.setFillColor(_pdf_color(shape.fill))
+            c.setFont(_pdf_font(opts['role']), opts['size'])
+            c.drawString(shape.xy[0], fy(shape.xy[1] + ascent), opts['text'])
+    c.save()
+
+# SVG backend
+
+def _svg_paint(color, attr):
+    if color is None:
+        return f' {attr}="none"'
+    r, g, b, a = to_rgba(color)
+    paint = f' {attr}="#{r:02x}{g:02x}{b:02x}"'
+    if a != 255:
+        paint += f' {attr}-opacity="{a / 255:.3g}"'
+    return paint
+
+def _svg_style(shape):
+    style = _svg_paint(shape.fill, 'fill') + _svg_paint(shape.outline, 'stroke')
+    if shape.outline is not None:
+        style += f' stroke-width="{shape.width}"'
+    return style
+
+def _svg_points(points):
+    return ' '.join(f'{x},{y}' for x, y in points)
+
+def _svg_arc(shape):
+    cx, cy, rx, ry = _box_center(shape.xy)
+    start, end = shape.options['start'], shape.options['end']
+
+    def point(angle):
+        rad = math.radians(angle)
+        return cx + rx * math.cos(rad), cy + ry * math.sin(rad)
+
+    (x0, y0), (x1, y1) = point(start), point(end)
+    large = 1 if (end - start) % 360 > 180 else 0
+    return f'<path d="M{x0:.2f},{y0:.2f} A{rx},{ry} 0 {large} 1 {x1:.2f},{y1:.2f}"{_svg_style(shape)}/>'
+
+def _svg_halo_shape(opts, grow, color):
+    """Halo shape grown outward by grow units, as an unclosed SVG element."""
+    g = opts['geometry']
+    fill, stroke = _svg_paint(color, 'fill'), _svg_paint(color, 'stroke')
+    if opts['shape'] == 'polygon':
+        outline = f'{stroke} stroke-width="{2 * grow:g}" stroke-linejoin="round"' if grow else ''
+        return f'<polygon points="{_svg_points(g["points"])}"{fill}{outline}'
+    cx, cy = g['center']
+    if opts['shape'] == 'ring':
+        return (f'<circle cx="{cx}" cy="{cy}" r="{g["radius"]}" fill="none"{stroke}'
+                f' stroke-width="{g["width"] + 2 * grow:g}"')
+    return f'<circle cx="{cx}" cy="{cy}" r="{g["radius"] + grow:g}"{fill}'
+
+def _svg_halo(shape, index):
+    """Blurred, slightly grown copy of the shape under a crisp core."""
+    opts = shape.options
+    r, g, b, a = to_rgba(shape.fill)
+    blur = opts['spread'] / 4
+    parts = [
+        f'<defs><filter id="halo{index}" x="-50%" y="-50%" width="200%" height="200%">'
+        f'<feGaussianBlur stdDeviation="{blur:g}"/></filter></defs>',
+        _svg_halo_shape(opts, blur, (r, g, b, round(opts['strength'] * a)))
+        + f' filter="url(#halo{index})"/>',
+    ]
+    if opts['inner']:
+        parts.append(_svg_halo_shape(opts, 0, (r, g, b, round(opts['inner'] * a))) + '/>')
+    return '\n'.join(parts)
+
+def to_svg(scene):
+    """Serialize the scene as a standalone SVG document."""
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {scene.width} {scene.height}">']
+    if any(shape.kind == 'glow_text' for shape in scene.items):
+        blur = max(radius for radius, _ in GLOW_LAYERS) / 2
+        parts.append(f'<defs><filter id="glow"><feGaussianBlur stdDeviation="{blur}"/></filter></defs>')
+    if scene.background is not None and to_rgba(scene.background)[3]:
+        parts.append(f'<rect width="100%" height="100%"{_svg_paint(scene.background, "fill")}/>')
+    if scene.grid:
+        spacing, line_color = scene.grid
+        parts.append(
+            f'<defs><pattern id="grid" width="{spacing}" height="{spacing}" patternUnits="userSpaceOnUse">'
+            f'<path d="M{spacing},0.5 H0.5 V{spacing}" fill="none"{_svg_paint(line_color, "stroke")}/>'
+            '</pattern></defs><rect width="100%" height="100%" fill="url(#grid)"/>'
+        )
+
+    for index, shape in enumerate(scene.items):
+        kind = shape.kind
+        if kind == 'halo':
+            parts.append(_svg_halo(shape, index))
+        elif kind == 'ellipse':
+            cx, cy, rx, ry = _box_center(shape.xy)
+            # ImageDraw strokes outlines inside the box; SVG centers them on the path
+            inset = shape.width / 2 if shape.outline is not None else 0
+            parts.append(f'<ellipse cx="{cx}" cy="{cy}" rx="{rx - inset:g}" ry="{ry - inset:g}"'
+                         f'{_svg_style(shape)}/>')
+        elif kind in ('rectangle', 'rounded_rectangle'):
+            x0, y0, x1, y1 = shape.xy
+            inset = shape.width / 2 if shape.outline is not None else 0
+            x0, y0, x1, y1 = x0 + inset, y0 + inset, x1 - inset, y1 - inset
+            radius = shape.options.get('radius', 0)
+            parts.append(f'<rect x="{x0}" y="{y0}" width="{x1 - x0}" height="{y1 - y0}" rx="{radius}"'
+                         f'{_svg_style(shape)}/>')
+        elif kind == 'arc':
+            parts.append(_svg_arc(shape))
+        elif kind == 'line':
+            parts.append(f'<polyline points="{_svg_points(shape.xy)}"{_svg_style(shape)}/>')
+        elif kind == 'polygon':
+            parts.append(f'<polygon points="{_svg_points(shape.xy)}"{_svg_style(shape)}/>')
+        elif kind in ('text', 'glow_text'):
+            opts = shape.options
+            ascent = get_font(opts['size'], opts['role']).getmetrics()[0]
+            x, y = shape.xy
+            text = (f' x="{x}" y="{y + ascent}" font-family="DejaVu Sans, sans-serif"'
+                    f' font-size="{opts["size"]}">{escape(opts["text"])}</text>')
+            if kind == 'glow_text':
+                parts.append(f'<text filter="url(#glow)"{_svg_paint(opts["glow"], "fill")}{text}')
+            parts.append(f'<text{_svg_paint(shape.fill, "fill")}{text}')
+    parts.append('</svg>')
+    return '\n'.join(parts) + '\n'
+
+def emit(scene, path, scale=1):
+    """Write the scene in the format implied by path's extension.
+
+    Raster formats are drawn at scale x and downscaled once.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.pdf':
+        write_pdf(scene, path)
+    elif ext == '.svg':
+        with open(path, 'w') as f:
+            f.write(to_svg(scene))
+    else:
+        img = rasterize(scene, scale)
+        if scale != 1:
+            img = downscale(img, (scene.width, scene.height))
+        img.save(path)
+
+def main(argv=None):
+    import generate_assets
+    import generate_marketing
+    from theme import DEFAULT_THEME, PALETTES, use
+
+    scenes = {**generate_assets.SCENES, **generate_marketing.SCENES}
+    parser = argparse.ArgumentParser(description="Emit any brand scene as PNG, PDF or SVG.")
+    parser.add_argument('scene', choices=sorted(scenes))
+    parser.add_argument('output', help="output path; the extension picks the backend")
+    parser.add_argument('--scale', type=int, default=4, help="supersampling for raster output")
+    parser.add_argument('--theme', choices=sorted(PALETTES), default=DEFAULT_THEME,
+                        help=f"brand palette (default {DEFAULT_THEME})")
+    args = parser.parse_args(argv)
+    with use(args.theme):
+        emit(scenes[args.scene](), args.output, args.scale)
+    print(f"Wrote {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Text Shaping
+Multilingual text drawn across a font-fallback chain, shaped by libraqm when present
+
+Text is itemized into runs that one font can draw: each character stays in
+the current run's font when that font covers it, otherwise it moves to the
+first face in fonts.font_chain() that does. Coverage is a set lookup
+(coverage.py), so no glyph is rendered twice to find out it is missing.
+Runs also split where the bidi level changes (levels() implements the
+single-paragraph core of the Unicode bidi algorithm) and are placed left to
+right on a shared baseline in visual order. With Pillow's raqm layout
+engine each run is shaped by raqm, so Arabic joins and Devanagari and Thai
+marks combine; with the basic engine right-to-left runs are reversed code
+point by code point, which keeps them readable but unjoined.
+
+Text the primary font covers in full, with no right-to-left characters to
+reorder, takes the fast path straight through the font, so Latin output is
+unchanged.
+"""
+
+import os
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+from PIL import features as pil_features
+
+from coverage import coverage
+from fonts import font_chain, load_font
+
+# Pillow picks raqm for every font it loads when libraqm is available
+RAQM = pil_features.check('raqm')
+
+RUNS_CACHE_SIZE = 4096
+
+# text: run characters in visual order for the basic engine; path: face to draw
+# with; x: advance from the draw position; rtl: right-to-left characters
+Run = namedtuple('Run', ['text', 'path', 'x', 'rtl'])
+
+def _direction(ch):
+    """'R' for strong right-to-left, 'L' for strong left-to-right, else None."""
+    bidi = unicodedata.bidirectional(ch)
+    if bidi in ('R', 'AL'):
+        return 'R'
+    if bidi == 'L':
+        return 'L'
+    return None
+
+def is_rtl(text):
+    """True when the paragraph's first strong character is right-to-left."""
+    for ch in text:
+        direction = _direction(ch)
+        if direction:
+            return direction == 'R'
+    return False
+
+def _covered(codes, ch):
+    return ord(ch) in codes or not ch.isprintable() or ch.isspace()
+
+def _font_path(font):
+    return getattr(font, 'path', None)
+
+@lru_cache(maxsize=RUNS_CACHE_SIZE)
+def _simple(path, text):
+    codes = coverage(path)
+    return all(_covered(codes, ch) for ch in text) and (RAQM or not any(_direction(ch) == 'R' for ch in text))
+
+def is_simple(font, text):
+    """True when font draws text alone, exactly as ImageDraw.text would."""
+    path = _font_path(font)
+    return path is None or isinstance(path, bytes) or _simple(path, text)
+
+def levels(text):
+    """Embedding level per character, a single-paragraph subset of the Unicode bidi algorithm.
+
+    Strong characters take their direction, numbers after right-to-left text
+    and all numbers in a right-to-left paragraph sit one level above it, and
+    neutrals between two like directions join them, else the paragraph's.
+    """
+    base = 'R' if is_rtl(text) else 'L'
+    kinds, previous = [], base
+    for ch in text:
+        kind = _direction(ch)
+        if kind:
+            previous = kind
+        elif unicodedata.bidirectional(ch) in ('EN', 'AN'):
+            # Numbers read left to right but bind to surrounding right-to-left text
+            kind = 'N' if previous == 'R' or base == 'R' else 'L'
+        kinds.append(kind)
+    # Neutrals between two like directions join them; numbers count as right-to-left here
+    resolved, following = list(kinds), base
+    for i in range(len(kinds) - 1, -1, -1):
+        if kinds[i]:
+            following = 'R' if kinds[i] == 'N' else kinds[i]
+        else:
+            resolved[i] = following
+    preceding = base
+    for i, kind in enumerate(kinds):
+        if kind:
+            preceding = 'R' if kind == 'N' else kind
+        elif resolved[i] != preceding:
+            resolved[i] = base
+    if base == 'L':
+        return [{'L': 0, 'R': 1, 'N': 2}[kind] for kind in resolved]
+    return [{'R': 1, 'L': 2, 'N': 2}[kind] for kind in resolved]
+
+def reorder(items, item_levels):
+    """items in visual order: from the highest level down to 1, reverse each stretch at or above it."""
+    items = list(items)
+    for level in range(max(item_levels, default=0), 0, -1):
+        i = 0
+        while i < len(items):
+            if item_levels[i] < level:
+                i += 1
+                continue
+            j = i
+            while j < len(items) and item_levels[j] >= level:
+                j += 1
+            items[i:j] = items[i:j][::-1]
+            item_levels = item_levels[:i] + item_levels[i:j][::-1] + item_levels[j:]
+            i = j
+    return items
+
+def _itemize(path, text):
+    """[(text, path, level)] in logical order, split where the face or bidi level changes."""
+    chain = font_chain(path)
+    sets = [coverage(p) for p in chain]
+    runs = []
+    for ch, level in zip(text, levels(text)):
+        if runs:
+            run_text, run_path, run_level = runs[-1]
+            if level == run_level and _covered(sets[chain.index(run_path)], ch):
+                runs[-1] = (run_text + ch, run_path, level)
+                continue
+        # First face that covers the character; the primary draws it as missing otherwise
+        face = next((p for p, codes in zip(chain, sets) if ord(ch) in codes), path)
+        runs.append((ch, face, level))
+    return runs
+
+@lru_cache(maxsize=RUNS_CACHE_SIZE)
+def _layout(path, size, text, features):
+    logical = _itemize(path, text)
+    placed, x = [], 0
+    for run_text, run_path, level in reorder(logical, [level for _, _, level in logical]):
+        rtl = level % 2 == 1
+        if rtl and not RAQM:
+            # raqm reorders inside a run itself; the basic engine draws code points in order
+            run_text = run_text[::-1]
+        placed.append(Run(run_text, run_path, x, rtl))
+        x += load_font(run_path, size).getlength(run_text, features=features)
+    return tuple(placed), x
+
+def runs(font, text, features=None):
+    """(runs, advance) for text in font; one run on the fast path."""
+    if is_simple(font, text):
+        return (Run(text, _font_path(font), 0, False),), font.getlength(text, features=features)
+    return _layout(_font_path(font), font.size, text, tuple(features) if features else None)
+
+def _run_font(font, run):
+    return font if run.path == _font_path(font) else load_font(run.path, font.size)
+
+def _baseline_shift(font, run_font):
+    """Vertical offset that puts run_font's baseline on font's."""
+    return font.getmetrics()[0] - run_font.getmetrics()[0] if run_font is not font else 0
+
+def text_length(font, text, features=None):
+    """Advance width of text across the fallback chain."""
+    return runs(font, text, features)[1]
+
+def text_bbox(font, text, features=None):
+    """Ink box (left, top, right, bottom) as font.getbbox, across the fallback chain."""
+    if is_simple(font, text):
+        return font.getbbox(text, features=features)
+    box = None
+    for run in runs(font, text, features)[0]:
+        run_font = _run_font(font, run)
+        dy = _baseline_shift(font, run_font)
+        left, top, right, bottom = run_font.getbbox(run.text, features=features)
+        x = round(run.x)
+        run_box = (left + x, top + dy, right + x, bottom + dy)
+        box = run_box if box is None else (min(box[0], run_box[0]), min(box[1], run_box[1]),
+                                           max(box[2], run_box[2]), max(box[3], run_box[3]))
+    return box or (0, 0, 0, 0)
+
+def draw_text(draw, pos, text, font, fill, features=None):
+    """ImageDraw.text(pos, text, font=font, fill=fill) across the fallback chain."""
+    if is_simple(font, text):
+        draw.text(pos, text, font=font, fill=fill, features=features)
+        return
+    x, y = pos
+    for run in runs(font, text, features)[0]:
+        run_font = _run_font(font, run)
+        draw.text((x + round(run.x), y + _baseline_shift(font, run_font)), run.text, font=run_font,
+                  fill=fill, features=features)
+
+def clear():
+    """Forget itemized layouts, after font files change."""
+    _simple.cache_clear()
+    _layout.cache_clear()
+
+def faces(font, text):
+    """File names of the faces that draw text, in first-use order."""
+    return list(dict.fromkeys(os.path.basename(run.path) for run in runs(font, text)[0] if run.path))
+
+def missing(font, text):
+    """Characters of text that no face in the fallback chain covers."""
+    path = _font_path(font)
+    if path is None:
+        return ''
+    sets = [coverage(p) for p in font_chain(path)]
+    return ''.join(ch for ch in dict.fromkeys(text) if not any(_covered(codes, ch) for codes in sets))
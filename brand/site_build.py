@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Site Build
+Generates brand assets, publishes them into images/ and writes a deployable
+copy of the site into dist/ with minified, content-hashed CSS, JS and images
+
+    python site_build.py            # generate, publish, build dist/
+    python site_build.py --skip-generate -j 8
+
+Hashed files (css/style.3f2a9c1e04.css, ...) never change content, so dist/
+carries a _headers file marking them immutable for a year; the pages and
+sitemap reference them by their new names. Images also keep their plain
+names for external links. Every stage is incremental: generators go
+through the build manifest and dist/ files are only rewritten when their
+content changes.
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import build
+import demand
+from minify import MINIFIERS
+
+BRAND_DIR = os.path.dirname(os.path.abspath(__file__))
+SITE_DIR = os.path.dirname(BRAND_DIR)
+DIST_DIR = os.path.join(SITE_DIR, 'dist')
+IMAGES_DIR = os.path.join(SITE_DIR, 'images')
+SITE_URL = 'https://anonymize.dev/'
+
+# Site files deployed from the repository root
+SITE_FILES = ['*.html', 'sitemap.xml', 'robots.txt', 'llms.txt', '.well-known/*', 'api/*',
+              'css/*.css', 'js/*.js', 'images/*']
+# Directories whose files get content-hashed names
+FINGERPRINTED = ('css/', 'js/', 'images/')
+# Files whose references are rewritten to the hashed names
+REWRITTEN = ('.html', '.xml')
+# Brand outputs kept in images/ whether or not a page links them yet
+PUBLISHED = ['logo-anonymize-dev.*', 'favicon.ico', 'favicon.svg', 'apple-touch-icon.png',
+             'icon-*.png', 'entity-*.png', 'hero-graphic.png', 'pattern-tile.png']
+# Never published unless a page references them: favicon.ico carries the
+# favicon sizes, and retina variants and atlases are opt-in
+PUBLISH_EXCLUDE = ['favicon-*.png', '*@2x.*', 'entity-icons.*', 'feature-icons.*']
+# Files whose text nodes can hold URLs (sitemap <loc>, SVG)
+XML_TEXT = ('.xml', '.svg')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+STATE_NAME = '.site-build.json'
+HASH_LENGTH = 10
+
+def publish_assets(tasks, only=None):
+    """Copy changed brand asset outputs into images/; returns the names copied.
+
+    Only names the site references or PUBLISHED lists are copied, so
+    intermediate outputs (atlases, animations, retina variants) stay in
+    brand/. only, if given, limits publishing further to those file names.
+    """
+    referenced = demand.referenced_assets()
+    copied = []
+    for t in tasks:
+        for path in t.outputs:
+            name = os.path.basename(path)
+            if only is not None and name not in only:
+                continue
+            if name not in referenced and not _published(name):
+                continue
+            target = os.path.join(IMAGES_DIR, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            if os.path.exists(target):
+                with open(target, 'rb') as f:
+                    if f.read() == data:
+                        continue
+            with open(target, 'wb') as f:
+                f.write(data)
+            copied.append(name)
+    return copied
+
+def _published(name):
+    return (any(fnmatch.fnmatch(name, pattern) for pattern in PUBLISHED)
+            and not any(fnmatch.fnmatch(name, pattern) for pattern in PUBLISH_EXCLUDE))
+
+def site_sources(root=SITE_DIR):
+    """Relative paths of every deployed site file."""
+    paths = set()
+    for pattern in SITE_FILES:
+        paths.update(os.path.relpath(p, root).replace(os.sep, '/')
+                     for p in glob.glob(os.path.join(root, pattern)) if os.path.isfile(p))
+    return sorted(paths)
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+def hashed_name(rel, data):
+    """css/style.css -> css/style.<hash>.css"""
+    stem, ext = posixpath.splitext(rel)
+    return f'{stem}.{content_hash(data)}{ext}'
+
+def map_url(url, mapping, base=''):
+    """Swap a reference for its hashed name, keeping its prefix, query and fragment.
+
+    base is the directory of the referencing file, for relative URLs.
+    """
+    for prefix in (SITE_URL, '/'):
+        if url.startswith(prefix) and not url.startswith('//'):
+            path, relative = url[len(prefix):], False
+            break
+    else:
+        if ':' in url.split('/')[0] or url.startswith(('#', '//')):
+            return url
+        prefix, path, relative = '', url, True
+    path, suffix = re.match(r'([^?#]*)(.*)', path).groups()
+    resolved = posixpath.normpath(posixpath.join(base, path)) if relative else path
+    if resolved not in mapping:
+        return url
+    target = mapping[resolved]
+    if relative:
+        target = posixpath.relpath(target, base or '.')
+    return prefix + target + suffix
+
+_ATTRIBUTE = re.compile(r'''(\b(?:href|src|content|poster|srcset)\s*=\s*)(["'])(.*?)\2''', re.S)
+_CSS_URL = re.compile(r'''url\(\s*(["']?)([^"')]+)\1\s*\)''')
+_XML_TEXT = re.compile(r'>(\s*)([^<\s][^<]*?)(\s*)<')
+
+def rewrite_markup(text, mapping, base='', xml=False):
+    """Rewrite asset references in HTML attributes (srcset included), and in text nodes when xml."""
+    def attribute(m):
+        name, quote, value = m.groups()
+        if name.lstrip().startswith('srcset'):
+            value = ', '.join(' '.join([map_url(c.split()[0], mapping, base)] + c.split()[1:])
+                              for c in value.split(',') if c.strip())
+        else:
+            value = map_url(value, mapping, base)
+        return f'{name}{quote}{value}{quote}'
+
+    text = _ATTRIBUTE.sub(attribute, text)
+    if not xml:
+        return text
+    return _XML_TEXT.sub(lambda m: f'>{m[1]}{map_url(m[2], mapping, base)}{m[3]}<', text)
+
+def rewrite_css(text, mapping, base):
+    return _CSS_URL.sub(lambda m: f'url({m[1]}{map_url(m[2], mapping, base)}{m[1]})', text)
+
+def _read(rel):
+    with open(os.path.join(SITE_DIR, rel), 'rb') as f:
+        return f.read()
+
+def _code_output(rel, mapping):
+    """Rewrite references in a stylesheet or script, minify it and hash the result."""
+    text = _read(rel).decode('utf-8')
+    ext = posixpath.splitext(rel)[1]
+    if ext == '.css':
+        text = rewrite_css(text, mapping, posixpath.dirname(rel))
+    data = MINIFIERS[ext](text).encode('utf-8')
+    return rel, hashed_name(rel, data), data
+
+def _markup_output(rel, mapping):
+    text = _read(rel).decode('utf-8')
+    text = rewrite_markup(text, mapping, posixpath.dirname(rel), rel.endswith(XML_TEXT))
+    return rel, rel, text.encode('utf-8')
+
+def _headers(hashed):
+    lines = ['# Generated by brand/site_build.py: content-hashed files never change', '']
+    for path in sorted(hashed):
+        lines += [f'/{path}', f'  Cache-Control: {IMMUTABLE}', '']
+    return '\n'.join(lines).encode()
+
+class Dist:
+    """Output tree that only rewrites files whose content changed."""
+
+    def __init__(self, root, force=False):
+        self.root = root
+        self.state_path = os.path.join(root, STATE_NAME)
+        self.force = force
+        self.previous = self._load()
+        self.files = {}
+        self.written = 0
+
+    def _load(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write(self, rel, data):
+        digest = hashlib.sha256(data).hexdigest()
+        self.files[rel] = digest
+        path = os.path.join(self.root, rel)
+        if not self.force and self.previous.get(rel) == digest and os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.written += 1
+
+    def finish(self):
+        """Remove files left over from earlier builds and save the state; returns the count."""
+        removed = 0
+        for rel in set(self.previous) - set(self.files):
+            try:
+                os.remove(os.path.join(self.root, rel))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        with open(self.state_path, 'w') as f:
+            json.dump(self.files, f, indent=2, sort_keys=True)
+            f.write('\n')
+        return removed
+
+def build_site(dist_dir=DIST_DIR, jobs=None, force=False):
+    """Write the deployable site into dist_dir; returns (files, written, removed)."""
+    sources = site_sources()
+    fingerprinted = [rel for rel in sources if rel.startswith(FINGERPRINTED)]
+    images = [rel for rel in fingerprinted if rel.startswith('images/')]
+    code = [rel for rel in fingerprinted if rel not in images]
+    markup = [rel for rel in sources if rel.endswith(REWRITTEN)]
+    other = [rel for rel in sources if rel not in fingerprinted and rel not in markup]
+
+    dist = Dist(dist_dir, force)
+    mapping = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # Images first: stylesheets and pages point at their hashed names
+        for rel, data in zip(images, pool.map(_read, images)):
+            mapping[rel] = hashed_name(rel, data)
+            dist.write(rel, data)
+            dist.write(mapping[rel], data)
+        for rel, target, data in pool.map(lambda rel: _code_output(rel, mapping), code):
+            mapping[rel] = target
+            dist.write(target, data)
+        for rel, target, data in pool.map(lambda rel: _markup_output(rel, mapping), markup):
+            dist.write(target, data)
+        for rel, data in zip(other, pool.map(_read, other)):
+            dist.write(rel, data)
+
+    dist.write('asset-manifest.json', (json.dumps(mapping, indent=2, sort_keys=True) + '\n').encode())
+    dist.write('_headers', _headers(mapping.values()))
+    removed = dist.finish()
+    return len(dist.files), dist.written, removed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the deployable Anonymize.dev site into dist/.")
+    parser.add_argument('-o', '--dist', default=DIST_DIR, help="output directory (default: dist/)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help="parallel workers for generators and site files")
+    parser.add_argument('-f', '--force', action='store_true',
+                        help="re-render every asset and rewrite every dist file")
+    parser.add_argument('--skip-generate', action='store_true',
+                        help="publish and deploy the current outputs without running generators")
+    parser.add_argument('--demand', action='store_true',
+                        help="only render and publish the assets the site references")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if not args.skip_generate:
+        status = build.main(['-j', str(args.jobs)] + (['-f'] if args.force else [])
+                            + (['--demand'] if args.demand else []))
+        if status:
+            return status
+        print()
+
+    only = demand.referenced_assets() if args.demand else None
+    copied = publish_assets(build.collect_tasks(['assets']), only)
+    print(f"Published {len(copied)} changed asset(s) into images/"
+          + (f": {', '.join(copied)}" if copied else ''))
+    files, written, removed = build_site(args.dist, args.jobs, args.force)
+    print(f"Site: {files} files in {os.path.relpath(args.dist, SITE_DIR)}/, "
+          f"{written} written, {removed} stale removed ({time.perf_counter() - start:.2f} s)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Task Graph
+Dependency-ordered renderer execution on a process pool with per-task timing
+"""
+
+import contextlib
+import io
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+Task = namedtuple('Task', ['name', 'func', 'args', 'kwargs', 'deps', 'outputs'])
+Result = namedtuple('Result', ['name', 'wall', 'cpu', 'log', 'error', 'extra'])
+
+def task(name, func, *args, deps=(), outputs=(), **kwargs):
+    """Describe one renderer call.
+
+    deps are names of tasks that must finish first; outputs are the files the
+    call writes, used to decide whether it can be skipped.
+    """
+    return Task(name, func, args, kwargs, tuple(deps), tuple(outputs))
+
+def run_task(t, after=None):
+    """Execute a task, capturing its console output and timing.
+
+    after, if given, runs in the same process once the task returns and its
+    return value is carried back as Result.extra (e.g. queued encodes).
+    """
+    log = io.StringIO()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    error = extra = None
+    try:
+        with contextlib.redirect_stdout(log):
+            t.func(*t.args, **t.kwargs)
+            if after:
+                extra = after()
+    except Exception as exc:
+        error = f'{type(exc).__name__}: {exc}'
+    return Result(t.name, time.perf_counter() - wall_start,
+                  time.process_time() - cpu_start, log.getvalue(), error, extra)
+
+def _report(result, verbose=False):
+    status = 'FAILED' if result.error else 'ok'
+    print(f"  {result.name:<32} {result.wall * 1000:8.1f} ms wall {result.cpu * 1000:8.1f} ms cpu  {status}")
+    if result.error:
+        print(f"    {result.error}")
+    if verbose:
+        for line in result.log.splitlines():
+            print(f"    {line}")
+
+def run(tasks, jobs=None, verbose=False, satisfied=(), initializer=None, initargs=(), after=None):
+    """Run tasks respecting deps; returns results in completion order.
+
+    Names in satisfied count as already-finished dependencies. initializer
+    runs once per worker process (or once inline) to warm shared caches;
+    after is passed through to run_task.
+    """
+    by_name = {t.name: t for t in tasks}
+    for t in tasks:
+        missing = [d for d in t.deps if d not in by_name and d not in satisfied]
+        if missing:
+            raise ValueError(f"Task {t.name} depends on unknown task(s): {missing}")
+
+    pending = dict(by_name)
+    done, failed, results = set(satisfied), set(), []
+
+    def skip_failed():
+        # Repeat until a pass skips nothing, so dependents listed before their
+        # failed dependency are skipped too rather than left looking like a cycle
+        changed = True
+        while changed:
+            changed = False
+            for name, t in list(pending.items()):
+                if any(d in failed for d in t.deps):
+                    del pending[name]
+                    failed.add(name)
+                    results.append(Result(name, 0.0, 0.0, '', 'skipped: dependency failed', None))
+                    _report(results[-1])
+                    changed = True
+
+    def ready():
+        skip_failed()
+        for name, t in list(pending.items()):
+            if all(d in done for d in t.deps):
+                del pending[name]
+                yield t
+
+    def finish(result):
+        results.append(result)
+        (failed if result.error else done).add(result.name)
+        _report(result, verbose)
+
+    if jobs == 1:
+        if initializer:
+            initializer(*initargs)
+        while pending:
+            batch = list(ready())
+            if not batch and pending:
+                raise ValueError(f"Dependency cycle among: {sorted(pending)}")
+            for t in batch:
+                finish(run_task(t, after))
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer,
+                             initargs=initargs) as pool:
+        running = {}
+        while pending or running:
+            for t in ready():
+                running[pool.submit(run_task, t, after)] = t
+            if not running:
+                if not pending:
+                    break
+                raise ValueError(f"Dependency cycle among: {sorted(pending)}")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                del running[future]
+                finish(future.result())
+    return results
+
+def summarize(results, elapsed, jobs):
+    """Print totals and the slowest tasks."""
+    cpu_total = sum(r.cpu for r in results)
+    failures = [r for r in results if r.error]
+    print("=" * 50)
+    print(f"{len(results)} tasks, {len(failures)} failed, jobs={jobs}")
+    print(f"Wall {elapsed:.2f} s | task CPU {cpu_total:.2f} s | parallel speedup {cpu_total / max(elapsed, 1e-9):.1f}x")
+    slowest = sorted(results, key=lambda r: r.wall, reverse=True)[:3]
+    print("Slowest: " + ", ".join(f"{r.name} ({r.wall * 1000:.0f} ms)" for r in slowest))
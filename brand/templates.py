@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Template Renderer
+Declarative JSON/YAML layer specs rendered in batch over rows of data
+
+A spec lists layers drawn in order; any string may reference row fields
+as {field}. Colors are palette names or hex strings. Text layers take an
+align and, for copy of varying length, a max_width to shrink into (plus
+max_height to wrap into a box). Leading layers that reference no row field
+are baked once into a shared base image.
+
+    python templates.py templates/product-card.json templates/product-cards.json -o out/ -j 4
+"""
+
+import argparse
+import csv
+import json
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from PIL import Image, ImageDraw
+
+from encoders import save_image
+from fonts import get_font
+import glyphs
+from glow import add_glow_text
+from glyphs import draw_text
+from layout import LINE_HEIGHT, aligned_x, fit_block, fit_size
+from theme import hex_to_rgb
+from tiles import grid
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+def _read_structured(path):
+    """Parse a JSON file, or YAML when PyYAML is installed."""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError(f"PyYAML is required to read {path}; install it or use JSON")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def load_spec(path):
+    """Read a template spec."""
+    spec = _read_structured(path)
+    for key in ('size', 'output', 'layers'):
+        if key not in spec:
+            raise ValueError(f"Template {path} is missing '{key}'")
+    return spec
+
+def load_rows(path):
+    """Read a dataset: a JSON/YAML list (or {"rows": [...]}) or a CSV file.
+
+    CSV cells containing '|' are split into lists, e.g. feature bullets; list
+    layers also split a single-item cell, which stays a string here.
+    """
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            return [{k: v.split('|') if '|' in v else v for k, v in row.items()}
+                    for row in csv.DictReader(f)]
+    data = _read_structured(path)
+    return data['rows'] if isinstance(data, dict) else data
+
+def _fill(value, row):
+    return value.format_map(row) if isinstance(value, str) else value
+
+def _fields(value):
+    """Row fields a layer value references as {field}, searching nested lists and dicts."""
+    if isinstance(value, str):
+        return {name for _, name, _, _ in string.Formatter().parse(value) if name is not None}
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return set().union(*map(_fields, value))
+    return set()
+
+def _is_static(layer):
+    # Feature lists read their row field by name rather than through {field}
+    return layer['type'] != 'feature_list' and not _fields(layer)
+
+def _items(value):
+    """A list-typed row value as a list; a CSV cell holding one item is a plain string."""
+    if isinstance(value, str):
+        return value.split('|') if value else []
+    return list(value)
+
+def _resolve_color(value, palette):
+    color = palette.get(value, value)
+    if isinstance(color, str):
+        return hex_to_rgb(color)
+    return tuple(color)
+
+def _shape_layer(layer, palette):
+    kind = layer['type']
+    width = layer.get('width', 1)
+
+    def paint(img, draw, row):
+        box = [_fill(v, row) for v in layer['box']]
+        fill = _resolve_color(_fill(layer['fill'], row), palette) if 'fill' in layer else None
+        outline = _resolve_color(_fill(layer['outline'], row), palette) if 'outline' in layer else None
+        if kind == 'rect':
+            draw.rectangle(box, fill=fill, outline=outline, width=width)
+        else:
+            draw.ellipse(box, fill=fill, outline=outline, width=width)
+    return paint
+
+def _line_layer(layer, palette):
+    def paint(img, draw, row):
+        color = _resolve_color(_fill(layer['color'], row), palette)
+        draw.line([tuple(p) for p in layer['points']], fill=color, width=layer.get('width', 1))
+    return paint
+
+def _text_layer(layer, palette):
+    """Text or glow text; max_width shrinks it to fit, max_height as well wraps it."""
+    role = layer.get('font', 'sans')
+    align = layer.get('align', 'left')
+    glow = layer['type'] == 'glow_text'
+    max_width, max_height = layer.get('max_width'), layer.get('max_height')
+    min_size = layer.get('min_size', 12)
+
+    def paint(img, draw, row):
+        text = _fill(layer['text'], row)
+        color = _resolve_color(_fill(layer['color'], row), palette)
+        size, lines = layer['size'], [text]
+        if max_width and max_height:
+            size, lines = fit_block(text, max_width, max_height, size, min_size, role=role)
+        elif max_width:
+            size = fit_size(text, max_width, size, min_size, role)
+        font = get_font(size, role)
+        x, y = layer['xy']
+        for line in lines:
+            pos = (aligned_x(x, line, size, align, role), y)
+            if glow:
+                glow_color = _resolve_color(_fill(layer.get('glow', layer['color']), row), palette)
+                add_glow_text(img, line, pos, font, color, glow_color)
+            else:
+                draw_text(img, pos, line, font, color)
+            y += round(size * LINE_HEIGHT)
+    return paint
+
+def _list_layer(layer, palette):
+    font = get_font(layer['size'], layer.get('font', 'sans'))
+    prefix = layer.get('prefix', '')
+    spacing = layer.get('spacing', layer['size'] + 10)
+
+    def paint(img, draw, row):
+        color = _resolve_color(_fill(layer['color'], row), palette)
+        x, y = layer['xy']
+        for item in _items(row[layer['field']]):
+            draw_text(img, (x, y), prefix + item, font, color)
+            y += spacing
+    return paint
+
+@lru_cache(maxsize=64)
+def _icon_image(path, size):
+    return Image.open(path).convert('RGBA').resize(size, Image.LANCZOS)
+
+def _icon_layer(layer, palette):
+    base = os.path.dirname(TEMPLATE_DIR)
+
+    def paint(img, draw, row):
+        left, top, right, bottom = layer['box']
+        path = os.path.join(base, _fill(layer['path'], row))
+        icon = _icon_image(path, (right - left, bottom - top))
+        img.paste(icon, (left, top), icon)
+    return paint
+
+LAYER_TYPES = {
+    'rect': _shape_layer,
+    'ellipse': _shape_layer,
+    'line': _line_layer,
+    'text': _text_layer,
+    'glow_text': _text_layer,
+    'feature_list': _list_layer,
+    'icon': _icon_layer,
+}
+
+def _background(spec, palette):
+    width, height = spec['size']
+    bg = spec.get('background', {})
+    color = _resolve_color(bg.get('color', 'void_black'), palette)
+    if bg.get('grid'):
+        line = _resolve_color(bg.get('grid_color', 'matrix_gray'), palette)
+        return grid(width, height, bg['grid'], line, color)
+    return Image.new('RGB', (width, height), color)
+
+def compile_template(spec, palette):
+    """Turn a spec into (base image, painters) with static leading layers pre-baked."""
+    painters = []
+    for layer in spec['layers']:
+        if layer['type'] not in LAYER_TYPES:
+            raise ValueError(f"Unknown layer type: {layer['type']}")
+        painters.append((_is_static(layer), LAYER_TYPES[layer['type']](layer, palette)))
+
+    base = _background(spec, palette)
+    draw = ImageDraw.Draw(base)
+    while painters and painters[0][0]:
+        painters.pop(0)[1](base, draw, {})
+    return {
+        'spec': spec,
+        'base': base,
+        'painters': [paint for _, paint in painters],
+    }
+
+@lru_cache(maxsize=16)
+def _cached_template(path, palette_items):
+    return compile_template(load_spec(path), dict(palette_items))
+
+def get_template(path, palette):
+    """Compiled template for (path, palette), parsed once per process."""
+    return _cached_template(os.path.abspath(path), tuple(sorted(palette.items())))
+
+def output_name(spec, row):
+    return spec['output'].format_map(row)
+
+def render(template, row):
+    """Render one row to an Image."""
+    img = template['base'].copy()
+    draw = ImageDraw.Draw(img)
+    for paint in template['painters']:
+        paint(img, draw, row)
+    return img
+
+def render_to_file(path, row, output_dir, palette):
+    """Render one row of the template at path and save it; returns the file path."""
+    template = get_template(path, palette)
+    out = os.path.join(output_dir, output_name(template['spec'], row))
+    save_image(render(template, row), out)
+    return out
+
+_worker = {}
+
+def _init_worker(path, palette):
+    _worker['args'] = (path, palette)
+    get_template(path, palette)
+
+def _render_worker(job):
+    row, output_dir = job
+    path, palette = _worker['args']
+    return render_to_file(path, row, output_dir, palette)
+
+def render_batch(path, rows, output_dir, palette, jobs=1):
+    """Render every row; with jobs > 1 rows are spread over worker processes."""
+    os.makedirs(output_dir, exist_ok=True)
+    if jobs == 1:
+        return [render_to_file(path, row, output_dir, palette) for row in rows]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(path, palette)) as pool:
+        chunk = max(1, len(rows) // (jobs * 4))
+        return list(pool.map(_render_worker, [(row, output_dir) for row in rows], chunksize=chunk))
+
+def main(argv=None):
+    from theme import DEFAULT_THEME, PALETTES
+
+    parser = argparse.ArgumentParser(description="Render a template over every row of a dataset.")
+    parser.add_argument('template', help="template spec (.json, .yaml)")
+    parser.add_argument('rows', help="dataset (.json, .yaml, .csv)")
+    parser.add_argument('-o', '--output-dir', default='.', help="directory for rendered images")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="worker processes")
+    parser.add_argument('--theme', choices=sorted(PALETTES), default=DEFAULT_THEME,
+                        help=f"palette for named colors (default {DEFAULT_THEME})")
+    args = parser.parse_args(argv)
+
+    rows = load_rows(args.rows)
+    written = render_batch(args.template, rows, args.output_dir, PALETTES[args.theme].hex, args.jobs)
+    print(f"Rendered {len(written)} images into {args.output_dir}")
+    if args.jobs == 1:
+        stats = glyphs.stats()
+        print(f"Glyph-run cache: {stats['hit_rate']:.0%} hits ({stats['hits']} of "
+              f"{stats['hits'] + stats['misses']}), {stats['bytes'] / 1024:.0f} KiB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""Tests that posters rendered in strips and tiles match one full rasterization."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import poster
+from generate_assets import hero_scene, logo_scene
+from scene import rasterize
+
+@pytest.mark.parametrize('make_scene', [logo_scene, hero_scene])
+def test_strips_and_tiles_match_full_render(make_scene, tmp_path, monkeypatch):
+    scene, scale = make_scene(), 2
+    tiles = poster.tiles
+    # Uneven strips and tiles so windows cut the diagonal strokes and halos
+    monkeypatch.setattr(poster, 'tiles', lambda width, height, rows: tiles(width, height, rows, 333))
+    path = str(tmp_path / 'poster.png')
+    channels = 3 if poster.is_opaque(scene) else 4
+    poster.render_poster(scene, path, scale, jobs=1, budget=scene.width * scale * channels * 47)
+    full = rasterize(scene, scale)
+    if channels == 3:
+        full = full.convert('RGB')
+    assert np.array_equal(np.asarray(Image.open(path)), np.asarray(full))
+
+def test_window_matches_crop_of_full_render():
+    scene, box = logo_scene(), (0, 288, 700, 336)
+    window = rasterize(scene, 2, region=box)
+    assert window.tobytes() == rasterize(scene, 2).crop(box).tobytes()
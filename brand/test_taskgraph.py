@@ -0,0 +1,26 @@
+"""Tests for dependency-ordered task execution and failure propagation."""
+
+import pytest
+
+from taskgraph import run, task
+
+def ok():
+    pass
+
+def boom():
+    raise RuntimeError('render failed')
+
+def chain():
+    # Transitive dependent first, failing root last
+    return [task('c', ok, deps=('b',)), task('b', ok, deps=('a',)), task('a', boom)]
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_failure_skips_transitive_dependents_listed_first(jobs):
+    results = {r.name: r.error for r in run(chain(), jobs)}
+    assert results['a'] == 'RuntimeError: render failed'
+    assert results['b'] == results['c'] == 'skipped: dependency failed'
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_cycle_is_still_reported(jobs):
+    with pytest.raises(ValueError, match='cycle'):
+        run([task('x', ok, deps=('y',)), task('y', ok, deps=('x',))], jobs)
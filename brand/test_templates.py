@@ -0,0 +1,41 @@
+"""Tests for the template renderer's static-layer baking and list columns."""
+
+from PIL import ImageDraw
+
+import templates
+from theme import palette
+
+SPEC = {
+    'size': [120, 60],
+    'output': '{id}.png',
+    'layers': [
+        {'type': 'rect', 'box': [0, 0, 120, 20], 'fill': 'electric_cyan'},
+        {'type': 'text', 'xy': [4, 24], 'text': '{title}', 'size': 12, 'color': 'ghost_white'},
+    ],
+}
+
+def test_static_leading_layer_is_baked_into_base():
+    template = templates.compile_template(SPEC, palette().hex)
+    assert len(template['painters']) == 1
+    assert template['base'].getpixel((60, 10)) == palette().rgb['electric_cyan']
+
+def test_baked_render_matches_live_render():
+    hex_palette = palette().hex
+    row = {'id': 'a', 'title': 'Privacy'}
+    live = templates._background(SPEC, hex_palette)
+    draw = ImageDraw.Draw(live)
+    for layer in SPEC['layers']:
+        templates.LAYER_TYPES[layer['type']](layer, hex_palette)(live, draw, row)
+    baked = templates.render(templates.compile_template(SPEC, hex_palette), row)
+    assert baked.tobytes() == live.tobytes()
+
+def test_escaped_braces_are_static():
+    assert templates._is_static({'type': 'text', 'text': '{{literal}}'})
+    assert not templates._is_static({'type': 'rect', 'box': [0, 0, 1, 1], 'fill': '{accent}'})
+    assert not templates._is_static({'type': 'feature_list', 'field': 'features'})
+
+def test_single_item_csv_list_column(tmp_path):
+    path = tmp_path / 'rows.csv'
+    path.write_text('id,features\na,Only one\nb,One|Two\nc,\n', encoding='utf-8')
+    rows = templates.load_rows(str(path))
+    assert [templates._items(row['features']) for row in rows] == [['Only one'], ['One', 'Two'], []]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Themes
+Brand palettes, parsed once into RGB and RGBA tuples
+
+Renderers look colors up by role name in the active palette (rgb('electric_cyan'))
+instead of parsing hex strings in their drawing loops. Neon Protocol is the
+default; light and print re-map the same roles for light backgrounds and
+paper. A renderer decorated with @themed accepts theme=<name> and draws
+under that palette.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+
+# Role name -> hex color, per theme
+THEMES = {
+    # Neon Protocol: the site's dark terminal look
+    'neon': {
+        'void_black': '#0a0a0f',
+        'terminal_dark': '#12121a',
+        'matrix_gray': '#1e1e2e',
+        'syntax_slate': '#6b7280',
+        'electric_cyan': '#00ffff',
+        'neon_magenta': '#ff00ff',
+        'terminal_green': '#00ff41',
+        'pulse_blue': '#0080ff',
+        'hot_coral': '#ff3366',
+        'pure_white': '#ffffff',
+        'ghost_white': '#e5e5e5',
+    },
+    # Light: same roles on a pale background, accents darkened for contrast
+    'light': {
+        'void_black': '#f8fafc',
+        'terminal_dark': '#ffffff',
+        'matrix_gray': '#e2e8f0',
+        'syntax_slate': '#64748b',
+        'electric_cyan': '#0891b2',
+        'neon_magenta': '#c026d3',
+        'terminal_green': '#16a34a',
+        'pulse_blue': '#2563eb',
+        'hot_coral': '#e11d48',
+        'pure_white': '#0f172a',
+        'ghost_white': '#334155',
+    },
+    # Print: white paper, near-black text and muted inks that stay in gamut
+    'print': {
+        'void_black': '#ffffff',
+        'terminal_dark': '#f4f4f5',
+        'matrix_gray': '#e4e4e7',
+        'syntax_slate': '#52525b',
+        'electric_cyan': '#007c91',
+        'neon_magenta': '#9c1f8c',
+        'terminal_green': '#1b7f3b',
+        'pulse_blue': '#1f4fa3',
+        'hot_coral': '#c8102e',
+        'pure_white': '#000000',
+        'ghost_white': '#27272a',
+    },
+}
+
+DEFAULT_THEME = 'neon'
+
+def hex_to_rgb(hex_color):
+    """Convert hex color to RGB tuple."""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+class Palette:
+    """One theme's colors, parsed once."""
+
+    def __init__(self, name, colors):
+        self.name = name
+        self.hex = dict(colors)
+        self.rgb = {role: hex_to_rgb(value) for role, value in colors.items()}
+        self.rgba = {role: (*rgb, 255) for role, rgb in self.rgb.items()}
+        self._alpha = {}
+
+    def alpha(self, role, alpha):
+        """(r, g, b, alpha) for a role."""
+        key = (role, alpha)
+        if key not in self._alpha:
+            self._alpha[key] = (*self.rgb[role], alpha)
+        return self._alpha[key]
+
+PALETTES = {name: Palette(name, colors) for name, colors in THEMES.items()}
+
+_state = {'palette': PALETTES[DEFAULT_THEME]}
+
+def palette():
+    """The active palette."""
+    return _state['palette']
+
+def rgb(role):
+    """RGB tuple of a role in the active palette."""
+    return _state['palette'].rgb[role]
+
+def rgba(role, alpha=255):
+    """RGBA tuple of a role in the active palette."""
+    return _state['palette'].alpha(role, alpha)
+
+@contextmanager
+def use(name):
+    """Make a theme the active palette for the duration of the block."""
+    previous = _state['palette']
+    _state['palette'] = PALETTES[name]
+    try:
+        yield _state['palette']
+    finally:
+        _state['palette'] = previous
+
+def themed(func):
+    """Let a renderer take theme=<name>; without it the active palette is kept."""
+    @wraps(func)
+    def wrapper(*args, theme=None, **kwargs):
+        if theme is None:
+            return func(*args, **kwargs)
+        with use(theme):
+            return func(*args, **kwargs)
+    # Marks renderers the build may hand a theme, unlike other wrapped callables
+    wrapper.themed = True
+    return wrapper
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Background Tiles
+Grid and dot-pattern cells rendered once and tiled into canvases of any size
+"""
+
+from functools import lru_cache
+import numpy as np
+from PIL import Image, ImageDraw
+
+@lru_cache(maxsize=32)
+def grid_tile(spacing, line_color, background):
+    """One grid cell: a 1px line along the top row and the left column."""
+    mode = 'RGBA' if len(background) == 4 else 'RGB'
+    tile = Image.new(mode, (spacing, spacing), background)
+    draw = ImageDraw.Draw(tile)
+    fill = tuple(line_color[:len(mode)])
+    draw.line([(0, 0), (spacing - 1, 0)], fill=fill, width=1)
+    draw.line([(0, 0), (0, spacing - 1)], fill=fill, width=1)
+    return tile
+
+@lru_cache(maxsize=32)
+def dot_tile(spacing, dot_radius, color, background=(0, 0, 0, 0)):
+    """One dot-grid cell; the dot is wrapped across the corners so it tiles seamlessly."""
+    tile = Image.new('RGBA', (spacing, spacing), background)
+    draw = ImageDraw.Draw(tile)
+    for x in (0, spacing):
+        for y in (0, spacing):
+            draw.ellipse([x - dot_radius, y - dot_radius, x + dot_radius, y + dot_radius], fill=color)
+    return tile
+
+def _tile_array(tile, width, height, offset=(0, 0)):
+    cell = np.asarray(tile)
+    if any(offset):
+        cell = np.roll(cell, (-offset[1], -offset[0]), axis=(0, 1))
+    reps = (-(-height // tile.height), -(-width // tile.width), 1)
+    return np.tile(cell, reps)[:height, :width]
+
+def tiled(tile, width, height, offset=(0, 0)):
+    """New image of the given size filled by repeating tile from the top-left.
+
+    offset shifts the pattern as if the image were the window at offset of a
+    larger tiled canvas, so separately tiled strips line up.
+    """
+    return Image.fromarray(_tile_array(tile, width, height, offset))
+
+@lru_cache(maxsize=16)
+def _grid_image(width, height, spacing, line_color, background, offset):
+    return tiled(grid_tile(spacing, line_color, background), width, height, offset)
+
+def grid(width, height, spacing, line_color, background, offset=(0, 0)):
+    """Grid background of the given size; repeated sizes are a single memcpy."""
+    phase = (offset[0] % spacing, offset[1] % spacing)
+    if any(phase):
+        # Strips of a larger canvas vary in phase; caching them would only hold memory
+        return tiled(grid_tile(spacing, line_color, background), width, height, phase)
+    return _grid_image(width, height, spacing, line_color, background, phase).copy()
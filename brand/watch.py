@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Anonymize.dev Watch Mode
+Re-render only the assets a source edit affects, with a live preview page
+
+    python build.py marketing --watch
+    open http://127.0.0.1:8089/
+
+One long-running process polls brand/*.py, templates/ and fonts/ for
+changes. Edited modules are reloaded in place together with the brand
+modules that import from them; everything else (font objects, palettes,
+background tiles, halo masks) stays warm. Tasks are then re-fingerprinted
+with manifest.fingerprint, which already maps each renderer to the code,
+constants, helpers and files it reads, and only the stale ones run, inline
+in this process. The preview page long-polls for new versions and swaps in
+just the images that changed.
+"""
+
+import glob
+import html
+import importlib
+import json
+import linecache
+import os
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import build
+import encoders
+import fonts
+import glyphs
+import hashing
+import layout
+import manifest
+import shaping
+from taskgraph import run
+
+BRAND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Sources whose edits can change pixels, relative to brand/
+WATCHED = ('*.py', 'templates/*', 'fonts/*')
+POLL_INTERVAL = 0.2
+# Modules that drive the watch loop itself; edits need a restart
+NO_RELOAD = manifest.BUILD_MODULES | {'watch', 'demand', '__main__'}
+
+PREVIEW_TYPES = {'.png': 'image/png', '.webp': 'image/webp', '.avif': 'image/avif',
+                 '.svg': 'image/svg+xml', '.jpg': 'image/jpeg', '.gif': 'image/gif'}
+
+def _relative(path):
+    return os.path.relpath(path, BRAND_DIR)
+
+def snapshot(patterns=WATCHED):
+    """{path: mtime_ns} for every watched file."""
+    stamps = {}
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(BRAND_DIR, pattern)):
+            try:
+                stamps[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+    return stamps
+
+def changed_files(before, after):
+    """Paths added, removed or modified between two snapshots."""
+    return sorted(p for p in set(before) | set(after) if before.get(p) != after.get(p))
+
+def reload_modules(paths):
+    """Reload the brand modules defined in paths and every brand module using them.
+
+    Modules are reloaded in place, dependencies first, so `from x import f`
+    bindings elsewhere pick up the new definitions. Returns the reloaded names.
+    """
+    paths = {os.path.abspath(p) for p in paths}
+    # Keyed by __name__: __main__ also appears under aliases such as __mp_main__
+    loaded = {module.__name__: module for module in list(sys.modules.values())
+              if manifest.is_brand_module(module) and module.__name__ not in NO_RELOAD}
+    edited = {name for name, module in loaded.items() if os.path.abspath(module.__file__) in paths}
+    helpers = {name: manifest.helper_modules(module) for name, module in loaded.items()}
+    affected = [name for name in loaded if edited & set(helpers[name])]
+    # A module's helpers are a strict subset of each importer's helpers
+    for name in sorted(affected, key=lambda n: len(helpers[n])):
+        importlib.reload(loaded[name])
+    if any(os.path.dirname(p) == fonts.FONT_DIR for p in paths):
+        # Fonts are parsed once per process; drop them and every run rasterized from them
+        fonts.load_font.cache_clear()
+        glyphs.clear()
+        layout.text_length.cache_clear()
+        layout.text_bbox.cache_clear()
+        shaping.clear()
+    # Fingerprints read sources through linecache and digest files once
+    linecache.checkcache()
+    hashing.file_digest.cache_clear()
+    return sorted(affected)
+
+class Preview:
+    """Published build state that preview requests wait on."""
+
+    def __init__(self):
+        self.version = 0
+        self.outputs = {}
+        self.errors = {}
+        self.changed = {}
+        self.condition = threading.Condition()
+
+    def publish(self, outputs, changed, errors):
+        """Record a finished cycle: outputs is {task: [paths]}, changed the rewritten paths."""
+        with self.condition:
+            self.version += 1
+            layout = list(outputs) != list(self.outputs)
+            self.outputs, self.errors = outputs, errors
+            self.changed[self.version] = (set(changed), layout)
+            # Pages further behind than this just reload
+            self.changed.pop(self.version - 100, None)
+            self.condition.notify_all()
+
+    def wait(self, since, timeout=25):
+        """(version, changed paths, reload page?) once the version moves past since."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != since, timeout)
+            changed, layout = set(), since > self.version or since == 0
+            for version in range(since + 1, self.version + 1):
+                paths, relayout = self.changed.get(version, (set(), True))
+                changed |= paths
+                layout |= relayout
+            return self.version, sorted(changed), layout
+
+    def files(self):
+        """Servable output paths, relative to brand/."""
+        return {_relative(p) for paths in self.outputs.values() for p in paths}
+
+PAGE_SCRIPT = """
+let version = %d;
+async function poll() {
+  for (;;) {
+    try {
+      const response = await fetch('/version?since=' + version);
+      const state = await response.json();
+      if (state.reload) { location.reload(); return; }
+      version = state.version;
+      for (const path of state.changed) {
+        for (const img of document.querySelectorAll('img[data-path="' + path + '"]')) {
+          img.src = '/files/' + path + '?v=' + version;
+        }
+      }
+      document.getElementById('status').textContent = state.status;
+    } catch (error) {
+      await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+  }
+}
+poll();
+"""
+
+def status_line(preview):
+    if preview.errors:
+        return f"v{preview.version}: " + "; ".join(f"{name}: {error}" for name, error in preview.errors.items())
+    return f"v{preview.version}: up to date"
+
+def preview_page(preview):
+    """HTML listing every previewable output, grouped by task."""
+    sections = []
+    for name, paths in preview.outputs.items():
+        images = [_relative(p) for p in paths if os.path.splitext(p)[1] in PREVIEW_TYPES]
+        if not images:
+            continue
+        figures = ''.join(
+            f'<figure><img data-path="{html.escape(p)}" src="/files/{html.escape(p)}?v={preview.version}">'
+            f'<figcaption>{html.escape(os.path.basename(p))}</figcaption></figure>'
+            for p in images)
+        sections.append(f'<section><h2>{html.escape(name)}</h2>{figures}</section>')
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Brand preview</title>
+<style>
+body {{ background: #0a0a0f; color: #e5e5e5; font: 14px system-ui, sans-serif; margin: 24px; }}
+h2 {{ font-size: 14px; color: #00ffff; margin: 24px 0 8px; }}
+figure {{ display: inline-block; margin: 0 16px 16px 0; vertical-align: top; }}
+img {{ max-width: 640px; max-height: 400px; background: #1e1e2e; }}
+figcaption, #status {{ color: #6b7280; font-size: 12px; }}
+</style></head>
+<body><p id="status">{html.escape(status_line(preview))}</p>
+{''.join(sections)}
+<script>{PAGE_SCRIPT % preview.version}</script>
+</body></html>
+""".encode()
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    """GET /, /version?since=N and /files/<output path>."""
+
+    server_version = 'AnonymizePreview/1.0'
+    preview = None
+
+    def _send(self, status, body=b'', content_type='text/plain; charset=utf-8'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/':
+            return self._send(HTTPStatus.OK, preview_page(self.preview), 'text/html; charset=utf-8')
+        if url.path == '/version':
+            since = int(parse_qs(url.query).get('since', ['0'])[0])
+            version, changed, layout = self.preview.wait(since)
+            body = {'version': version, 'changed': changed, 'reload': layout,
+                    'status': status_line(self.preview)}
+            return self._send(HTTPStatus.OK, json.dumps(body).encode(), 'application/json')
+        if url.path.startswith('/files/'):
+            path = unquote(url.path[len('/files/'):])
+            if path in self.preview.files():
+                try:
+                    with open(os.path.join(BRAND_DIR, path), 'rb') as f:
+                        body = f.read()
+                except OSError:
+                    return self._send(HTTPStatus.NOT_FOUND, b'not rendered\n')
+                return self._send(HTTPStatus.OK, body, PREVIEW_TYPES.get(os.path.splitext(path)[1],
+                                                                         'application/octet-stream'))
+        self._send(HTTPStatus.NOT_FOUND, b'not found\n')
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(preview, host='127.0.0.1', port=8089):
+    """A ThreadingHTTPServer for the preview page, on a daemon thread."""
+    handler = type('Handler', (PreviewHandler,), {'preview': preview})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def rebuild(targets, themes, entries, preview, formats=None, widths=(), verbose=False):
+    """One incremental build inline; publishes the result. Returns the results."""
+    # Reloading encoders resets its configuration
+    encoders.configure(formats, list(widths))
+    tasks = build.collect_tasks(targets, themes=themes)
+    context = {'encoders': encoders.config()}
+    digests = {t.name: manifest.fingerprint(t, context) for t in tasks}
+    todo = manifest.stale_tasks(tasks, entries, digests)
+    up_to_date = {t.name for t in tasks} - {t.name for t in todo}
+    results = run(todo, 1, verbose, satisfied=up_to_date, after=encoders.flush)
+
+    by_name = {t.name: t for t in tasks}
+    errors, changed = {}, []
+    for r in results:
+        if r.error:
+            entries.pop(r.name, None)
+            errors[r.name] = r.error
+        else:
+            manifest.record(by_name[r.name], entries, digests[r.name], r.extra or ())
+            changed += [_relative(p) for p in entries[r.name]['outputs']]
+    manifest.save(entries)
+    preview.publish({t.name: list(t.outputs) for t in tasks}, changed, errors)
+    return results
+
+def watch(targets, themes=None, formats=None, widths=(), host='127.0.0.1', port=8089,
+          interval=POLL_INTERVAL, verbose=False):
+    """Build, serve the preview and rebuild on every source change until interrupted."""
+    fonts.warm()
+    entries = manifest.load()
+    preview = Preview()
+    server = make_server(preview, host, port)
+    print(f"Preview on http://{host}:{port}/ ; watching {', '.join(WATCHED)} (Ctrl-C to stop)")
+
+    rebuild(targets, themes, entries, preview, formats, widths, verbose)
+    seen = snapshot()
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot()
+            changed = changed_files(seen, current)
+            if not changed:
+                continue
+            seen = current
+            start = time.perf_counter()
+            print(f"Changed: {', '.join(_relative(p) for p in changed)}")
+            try:
+                reloaded = reload_modules(changed)
+                results = rebuild(targets, themes, entries, preview, formats, widths, verbose)
+            except Exception as exc:
+                # A half-edited file; keep serving the last good state
+                print(f"  {type(exc).__name__}: {exc}")
+                preview.publish(preview.outputs, [], {'reload': f'{type(exc).__name__}: {exc}'})
+                continue
+            print(f"Reloaded {len(reloaded)} module(s), re-rendered {len(results)} task(s) "
+                  f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0